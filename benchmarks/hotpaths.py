@@ -0,0 +1,218 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Hot path benchmarks: API requests (against the local fleet simulator, so no
+# network access is needed), profile save/load at 10/1k/10k profiles, bulk
+# profile validation and profile page rendering. Every case reports seconds
+# per operation (lower is better), using the best of several rounds. Results
+# are compared in units of a pure-Python calibration loop timed on the same
+# machine, so the checked-in baseline holds up across faster/slower hosts.
+#   $ python benchmarks/hotpaths.py            # print timings
+#   $ python benchmarks/hotpaths.py --quick    # skip the 10k profile cases
+#   $ python benchmarks/hotpaths.py --save     # update the checked-in baseline
+#   $ python benchmarks/hotpaths.py --check    # exit 1 on a regression
+
+import io
+import sys
+import json
+import argparse
+import contextlib
+from os import environ, path
+from statistics import quantiles
+from time import perf_counter
+from tempfile import TemporaryDirectory
+from concurrent.futures import ThreadPoolExecutor
+
+
+BENCH_DIR = path.dirname(path.abspath(__file__))
+SRC_DIR = path.join(path.dirname(BENCH_DIR), "src")
+BASELINE = path.join(BENCH_DIR, "hotpaths_baseline.json")
+SIZES = (10, 1_000, 10_000)  # profile counts
+SHORT_CASE = 10e-6  # cases faster than this (seconds) are noisier
+
+
+def best(func, rounds: int) -> float:
+    """Return the fastest of several timed calls of `func`."""
+    times = []
+    for _ in range(rounds):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def calibrate(rounds: int) -> float:
+    """Return the seconds taken by a fixed pure-Python workload."""
+    return best(lambda: sum(i * i for i in range(100_000)), rounds * 2)
+
+
+def bench_api(rounds: int, requests: int = 200,
+              workers: int = 16) -> dict[str, float]:
+    """Time `api.request()` against simulated devices."""
+    from axeprofiler import api
+    from axeprofiler.simulator import Simulator
+
+    simulator = Simulator(workers, base_port=4900, seed=1)
+    simulator.start()
+    try:
+        ips = simulator.addresses
+        api.request(ips[0], "info")  # open the pooled connection
+
+        latencies = []
+        for _ in range(requests):
+            start = perf_counter()
+            api.request(ips[0], "info")
+            latencies.append(perf_counter() - start)
+        p50, p95 = (quantiles(latencies, n=100)[i] for i in (49, 94))
+
+        def _concurrent() -> None:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for res in pool.map(lambda i: api.request(ips[i % workers],
+                                                          "dashboard"),
+                                    range(requests * 4)):
+                    res.json()
+
+        concurrent = best(_concurrent, rounds) / (requests * 4)
+    finally:
+        simulator.stop()
+        api.get_client().close()
+    return {"api_request_p50": p50, "api_request_p95": p95,
+            "api_request_concurrent": concurrent}
+
+
+def bench_profiles(size: int, rounds: int) -> dict[str, float]:
+    """Time profile save/load/validation/rendering with `size` profiles."""
+    from axeprofiler.cli import PAGE_SIZE, Cli
+    from axeprofiler.config import ROOT
+    from axeprofiler.profiles import Profile
+    from axeprofiler.store import DirectoryStore
+
+    assert ROOT == environ["AXEPROF_ROOT"]  # never touch the real profiles
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli = Cli()
+    cli.file = io.StringIO()  # render off-screen
+    store = cli.store
+    configs = [{"profile_name": f"bench-{i:05d}", "hostname": f"axe-{i}",
+                "frequency": 400 + i % 200, "coreVoltage": 1100 + i % 100,
+                "fanspeed": 50 + i % 50} for i in range(size)]
+
+    results = {}
+    start = perf_counter()
+    profiles = [Profile(**Profile.validate_profile_data(config))
+                for config in configs]
+    results[f"validate_{size}"] = (perf_counter() - start) / size
+
+    # NOTE: later rounds overwrite the profiles saved by the first
+    results[f"save_profile_{size}"] = best(
+        lambda: [store.save(profile) for profile in profiles], rounds) / size
+
+    # Cold: a fresh store has to parse every profile
+    def _cold() -> None:
+        cli._store = DirectoryStore(store.location)
+        for config in configs:
+            cli._load_profile(config["profile_name"])
+    results[f"load_profile_cold_{size}"] = best(_cold, rounds) / size
+
+    # Warm: profiles are cached until they change on disk
+    results[f"load_profile_warm_{size}"] = best(
+        lambda: [cli._load_profile(config["profile_name"])
+                 for config in configs], rounds) / size
+
+    pages = -(-size // PAGE_SIZE)
+    results[f"render_page_{size}"] = best(
+        lambda: [cli._render_profile_page(page, size)
+                 for page in (1, pages // 2 or 1, pages)], rounds) / 3
+
+    for profile in profiles:
+        store.delete(profile.name)
+    return results
+
+
+def bench(rounds: int, sizes: tuple[int, ...]) -> dict[str, float]:
+    """Return the seconds per operation for each case."""
+    results = bench_api(rounds)
+    for size in sizes:
+        results.update(bench_profiles(size, rounds))
+    return {name: round(seconds, 7) for name, seconds in results.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="AxeProfiler hot path benchmarks")
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="rounds per case; the best is kept (default=5)")
+    parser.add_argument("--quick", action="store_true",
+                        help="skip the 10k profile cases")
+    parser.add_argument("--save", action="store_true",
+                        help="save the results as the new baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if a case regresses past the tolerance")
+    parser.add_argument("--tolerance", type=float, default=2,
+                        help="allowed slowdown vs baseline (default=2x)")
+    parser.add_argument("--short-tolerance", type=float, default=5,
+                        help="allowed slowdown for cases under 10us "
+                             + "(default=5x)")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as root:
+        # NOTE: set before `axeprofiler` is imported, as `config.ROOT` is read
+        # at import time
+        environ["AXEPROF_ROOT"] = f"{root}/"
+        sys.path.insert(0, SRC_DIR)
+        calibration = calibrate(args.rounds)
+        results = bench(args.rounds, SIZES[:-1] if args.quick else SIZES)
+
+    baseline, base_calibration = {}, calibration
+    if path.exists(BASELINE):
+        with open(BASELINE, 'r') as f:
+            data = json.loads(f.read())
+        baseline = data.get("cases", {})
+        base_calibration = data.get("calibration") or calibration
+    # NOTE: baselines are scaled by how much slower/faster this machine is
+    scale = calibration / base_calibration
+
+    regressed = False
+    print(f"Calibration: {calibration * 1e3:.2f}ms "
+          + f"(baseline {base_calibration * 1e3:.2f}ms)")
+    print(f"{'case':<26}{'us/op':>10}{'baseline':>10}{'ratio':>8}")
+    for name, seconds in results.items():
+        base = baseline[name] * scale if name in baseline else None
+        ratio = seconds / base if base else None
+        tolerance = (args.short_tolerance if base and base < SHORT_CASE
+                     else args.tolerance)
+        flag = " !!" if ratio and ratio > tolerance else ''
+        regressed |= bool(flag)
+        print(f"{name:<26}{seconds * 1e6:>10.1f}"
+              + f"{f'{base * 1e6:.1f}' if base else '-':>10}"
+              + f"{f'{ratio:.2f}' if ratio else '-':>8}{flag}")
+
+    if args.save:
+        with open(BASELINE, 'w') as f:
+            f.write(json.dumps({"calibration": round(calibration, 7),
+                                "cases": {**{name: round(base * scale, 7)
+                                             for name, base
+                                             in baseline.items()},
+                                          **results}},
+                               indent=4) + "\n")
+        print(f"Saved baseline to {BASELINE}")
+    return 1 if args.check and regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Startup benchmark. Each case runs in a fresh interpreter (so imports are cold)
+# against a throwaway program root, and the median of several runs is reported.
+#   $ python benchmarks/startup.py            # print timings
+#   $ python benchmarks/startup.py --save     # update the checked-in baseline
+#   $ python benchmarks/startup.py --check    # exit 1 on a regression
+
+import sys
+import json
+import argparse
+import subprocess
+from os import environ, path
+from statistics import median
+from tempfile import TemporaryDirectory
+
+
+BENCH_DIR = path.dirname(path.abspath(__file__))
+SRC_DIR = path.join(path.dirname(BENCH_DIR), "src")
+BASELINE = path.join(BENCH_DIR, "startup_baseline.json")
+
+# Each snippet prints the seconds elapsed to the point being measured
+CASES = {
+    # `from axeprofiler.__main__ import main` (REPL usage)
+    "import_main": """
+from time import perf_counter
+start = perf_counter()
+from axeprofiler.__main__ import main
+print(perf_counter() - start)
+""",
+    # Headless `axeprof list` through to its JSON output
+    "headless_list": """
+import io, contextlib
+from time import perf_counter
+start = perf_counter()
+from axeprofiler.__main__ import main
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        main(["list"])
+    except SystemExit:
+        pass
+print(perf_counter() - start)
+""",
+    # Interactive start through to the first main menu prompt
+    "first_prompt": """
+import io, contextlib
+from time import perf_counter
+start = perf_counter()
+from axeprofiler.__main__ import main
+import rich.prompt
+
+class FirstPrompt(Exception):
+    pass
+
+def ask(*args, **kwargs):
+    raise FirstPrompt
+
+rich.prompt.Confirm.ask = lambda *args, **kwargs: True  # copyright notice
+rich.prompt.Prompt.ask = ask
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        main([])
+    except FirstPrompt:
+        pass
+print(perf_counter() - start)
+""",
+}
+
+
+def run_case(code: str, root: str) -> float:
+    """Run a benchmark snippet in a fresh interpreter and return its timing."""
+    env = {**environ, "AXEPROF_ROOT": root, "TERM": "dumb",
+           "PYTHONPATH": SRC_DIR + path.pathsep + environ.get("PYTHONPATH", '')}
+    out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                         capture_output=True, text=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def bench(runs: int) -> dict[str, float]:
+    """Return the median seconds for each startup case."""
+    with TemporaryDirectory() as root:
+        root = f"{root}/"
+        return {name: round(median(run_case(code, root) for _ in range(runs)),
+                            4)
+                for name, code in CASES.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="AxeProfiler startup benchmark")
+    parser.add_argument("--runs", type=int, default=7,
+                        help="runs per case (default=7)")
+    parser.add_argument("--save", action="store_true",
+                        help="save the results as the new baseline")
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if a case regresses past the tolerance")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="allowed slowdown vs baseline (default=1.5x)")
+    parser.add_argument("--slack", type=float, default=0.02,
+                        help="ignore slowdowns under this many seconds "
+                             + "(default=0.02)")
+    args = parser.parse_args()
+
+    results = bench(args.runs)
+    baseline = {}
+    if path.exists(BASELINE):
+        with open(BASELINE, 'r') as f:
+            baseline = json.loads(f.read())
+
+    regressed = False
+    print(f"{'case':<16}{'seconds':>10}{'baseline':>10}{'ratio':>8}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        ratio = seconds / base if base else None
+        flag = " !!" if (ratio and ratio > args.tolerance
+                         and seconds - base > args.slack) else ''
+        regressed |= bool(flag)
+        print(f"{name:<16}{seconds:>10.4f}{base or '-':>10}"
+              + f"{f'{ratio:.2f}' if ratio else '-':>8}{flag}")
+
+    if args.save:
+        with open(BASELINE, 'w') as f:
+            f.write(json.dumps(results, indent=4) + "\n")
+        print(f"Saved baseline to {BASELINE}")
+    return 1 if args.check and regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,16 +17,20 @@
 # You should have received a copy of the GNU General Public License along with
 # AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
 
+import sys
 from os import system
 
-from rich.panel import Panel
-from rich.prompt import Confirm
-from rich import print as rprint
+from axeprofiler import metrics, profiling
 
-from axeprofiler.cli import Cli
+# NOTE: rich and the Cli are imported when first needed, so headless commands
+# and `from axeprofiler.__main__ import main` start fast
 
 
 def show_notice() -> bool:
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+    from rich import print as rprint
+
     try:
         root = __file__.split('src')[0]
         notice = f"{root}.notice"
@@ -49,9 +53,23 @@ def show_notice() -> bool:
         return Confirm.ask("Do you want to start the program?", default='y')
 
 
-def main() -> None:  # NOTE Program entry point
+def main(argv: list[str] | None = None) -> None:  # NOTE Program entry point
+    """Start the interactive CLI, or run a headless subcommand if given.
+
+    Args:
+        argv: Command line arguments, else `sys.argv[1:]` (default=None).
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    metrics.enable_from_env()  # opt-in; see `./metrics.py`
+    profiling.enable_from_env()  # opt-in; see `./profiling.py`
+    if argv:  # headless mode - see `./commands.py`
+        from axeprofiler import commands
+        sys.exit(commands.run(argv))
+
     # TODO add title screen?
     if show_notice():
+        from axeprofiler.cli import Cli
+
         cli = Cli()
         cli.session()
 
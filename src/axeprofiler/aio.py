@@ -0,0 +1,252 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# An asyncio counterpart to `./api.py`. Requests are made over plain asyncio
+# streams (one connection per request) so no extra dependencies are needed, and
+# errors are raised as the same `requests` exceptions that `api.request()` uses.
+
+import json
+import asyncio
+from time import perf_counter
+
+import requests
+
+from axeprofiler import metrics, profiling
+from axeprofiler.api import API, ROUTES
+
+
+class AsyncResponse():
+    """
+    A minimal response object mirroring the parts of `requests.Response` used
+    by this program.
+
+    Args:
+        status_code: The HTTP status code.
+        headers: The response headers (lowercase keys).
+        content: The raw response body.
+    """
+    def __init__(self, status_code: int, headers: dict[str, str],
+                 content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def __repr__(self):
+        return f"<AsyncResponse [{self.status_code}]>"
+
+    @property
+    def text(self) -> str:
+        """Return the response body as text."""
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> dict:
+        """Return the response body parsed as JSON."""
+        return json.loads(self.content)
+
+
+def _split_host(ip: str) -> tuple[str, int]:
+    """Return the (host, port) for an IP addr with an optional `:port`."""
+    host, _, port = ip.partition(':')
+    return host, int(port) if port else 80
+
+
+async def _read_body(reader: asyncio.StreamReader,
+                     headers: dict[str, str]) -> bytes:
+    """Read a response body using chunked, sized or read-to-close framing."""
+    if "chunked" in headers.get("transfer-encoding", ''):
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip(), 16)
+            if size == 0:
+                await reader.readline()  # trailing CRLF
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    if (length := headers.get("content-length")) is not None:
+        return await reader.readexactly(int(length))
+    return await reader.read()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> AsyncResponse:
+    """Read and parse an HTTP/1.1 response from the stream."""
+    status_line = await reader.readline()
+    try:
+        status_code = int(status_line.split()[1])
+    except (IndexError, ValueError):
+        raise requests.ConnectionError(f"Bad status line: {status_line!r}")
+
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b''):
+        key, _, value = line.decode("latin-1").partition(':')
+        headers[key.strip().lower()] = value.strip()
+    return AsyncResponse(status_code, headers,
+                         await _read_body(reader, headers))
+
+
+class AsyncClient():
+    """
+    asyncio client for the AxeOS API.
+
+    Covers the same routes as `api.request()` with the same error semantics,
+    while allowing thousands of requests to be in flight on one event loop.
+    A semaphore caps the number of open connections at any given time.
+
+    Args:
+        limit: The max number of concurrent requests (default=256).
+        connect_timeout: Seconds to wait for a connection (default=3.05).
+        read_timeout: Seconds to wait for a response (default=5).
+
+    Methods:
+        request: Make and return the proper request for an IP and endpoint.
+        gather: Make the same request to many devices concurrently.
+    """
+    def __init__(self, limit: int = 256,
+                 connect_timeout: float = 3.05, read_timeout: float = 5):
+        self._limit = limit
+        self._timeout = (connect_timeout, read_timeout)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __repr__(self):
+        return ' '.join((
+            f"AsyncClient({self._limit},",
+            f"{self._timeout[0]},",
+            f"{self._timeout[1]})"
+        ))
+
+    @property
+    def limit(self) -> int:
+        """Return the max number of concurrent requests."""
+        return self._limit
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """Return the (connect, read) timeouts."""
+        return self._timeout
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency limiter for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._limit)
+            self._loop = loop
+        return self._semaphore
+
+    async def _send(self, ip: str, method: str, path: str,
+                    body: dict[str, str | int] | None) -> AsyncResponse:
+        """Open a connection, send a single request and return the response."""
+        host, port = _split_host(ip)
+        connect_timeout, read_timeout = self._timeout
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), connect_timeout)
+        except TimeoutError:
+            raise requests.ConnectTimeout(f"Connection to {ip} timed out")
+        except OSError as oe:
+            raise requests.ConnectionError(f"{oe} for {ip}")
+
+        try:
+            payload = json.dumps(body).encode() if body is not None else b''
+            head = [f"{method} {path} HTTP/1.1", f"Host: {ip}",
+                    "Accept: application/json", "Connection: close"]
+            if payload or method != "GET":
+                head += ["Content-Type: application/json",
+                         f"Content-Length: {len(payload)}"]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+            await writer.drain()
+            return await asyncio.wait_for(_read_response(reader),
+                                          read_timeout)
+        except TimeoutError:
+            raise requests.ReadTimeout(f"Read from {ip} timed out")
+        except (OSError, asyncio.IncompleteReadError) as e:
+            raise requests.ConnectionError(f"{e} for {ip}")
+        finally:
+            writer.close()
+
+    @profiling.traced("aio.request")
+    async def request(
+            self, ip: str, endpoint: str,
+            body: dict[str, str | int] | None = None) -> AsyncResponse:
+        """Make and return the proper request for the given IP and endpoint.
+
+        Args:
+            ip: The IP of the [axe] device.
+            endpoint: The desired AxeOS endpoint to hit.
+            body: The body data to send with PATCH/POST requests
+                (default=None).
+
+        Returns:
+            An `AsyncResponse` object.
+
+        Raises:
+            ValueError: if an invalid HTTP method is specified for the endpoint.
+            requests.HTTPError: if an invalid path for the API is requested.
+            requests.ConnectionError: if the request takes too long or fails.
+        """
+        method, path = API[endpoint]["type"], API[endpoint]["url"]
+        if endpoint not in ROUTES or ROUTES[endpoint] != method:
+            raise ValueError("Not a valid HTTP method for this API.")
+
+        async with self.semaphore:
+            start = perf_counter()
+            try:
+                res = await self._send(ip, method, path, body)
+            except requests.RequestException as e:
+                metrics.inc("axeprof_request_errors_total", endpoint=endpoint,
+                            host=ip, error=type(e).__name__)
+                raise
+        if metrics.enabled():
+            metrics.record_request(
+                endpoint, ip, perf_counter() - start, res.status_code,
+                len(json.dumps(body)) if body else 0, len(res.content))
+        if res.status_code != 200:
+            raise requests.HTTPError(f"Status code: {res.status_code}")
+        return res
+
+    async def gather(
+            self, ips: list[str], endpoint: str,
+            body: dict[str, str | int] | None = None
+            ) -> dict[str, AsyncResponse | Exception]:
+        """Make the same request to many devices concurrently.
+
+        Args:
+            ips: The IP addrs of the [axe] devices.
+            endpoint: The desired AxeOS endpoint to hit.
+            body: The body data to send with PATCH/POST requests
+                (default=None).
+
+        Returns:
+            A dict of IP -> response, or the exception raised for that device.
+        """
+        results = await asyncio.gather(
+            *(self.request(ip, endpoint, body) for ip in ips),
+            return_exceptions=True
+        )
+        return dict(zip(ips, results))
+
+
+def fetch_all(ips: list[str], endpoint: str,
+              body: dict[str, str | int] | None = None,
+              limit: int = 256) -> dict[str, AsyncResponse | Exception]:
+    """Blocking helper to make the same request to many devices at once.
+
+    See `AsyncClient.gather()` for details.
+    """
+    return asyncio.run(AsyncClient(limit=limit).gather(ips, endpoint, body))
@@ -20,7 +20,14 @@
 # The full API spec can be found at:
 # https://github.com/bitaxeorg/ESP-Miner/blob/master/main/http_server/openapi.yaml
 
+import random
+from threading import Lock
+from time import monotonic, perf_counter, sleep
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from axeprofiler import metrics, profiling
 
 HTTP = "http://"
 API = {
@@ -43,8 +50,7 @@ API = {
         "type": "GET",
         "url": "/api/system/statistics"
     },
-    # NOTE: Valid route, but not yet used by this program
-    "dashboard": {
+    "dashboard": {  # NOTE: lightweight statistics for frequent polling
         "type": "GET",
         "url": "/api/system/statistics/dashboard"
     },
@@ -67,6 +73,325 @@ API = {
         "url": "/api/system/OTAWWW"
     }
 }
+ROUTES = {  # routes supported by `request()` and their HTTP methods
+    "info": "GET",
+    "asic": "GET",
+    "statistics": "GET",
+    "dashboard": "GET",
+    "restart": "POST",
+    "system": "PATCH"
+}
+RETRY_METHODS = ("GET",)  # idempotent methods that are safe to retry
+
+
+class CircuitOpen(requests.ConnectionError):
+    """Raised instead of making a request to a host known to be down."""
+
+
+class CircuitBreaker():
+    """
+    Per-host circuit breaker that fast-fails requests to hosts that are down.
+
+    After `threshold` consecutive connection failures (timeouts, refused, etc.)
+    a host's circuit opens and requests to it fail immediately with
+    `CircuitOpen` for `cooldown` seconds. After that a single trial request is
+    let through (half open): success closes the circuit, failure re-opens it.
+
+    Args:
+        threshold: Consecutive failures before a circuit opens (default=5).
+        cooldown: Seconds a circuit stays open (default=30).
+
+    Methods:
+        allow: Return True if a request to a host may be made.
+        success: Record a successful request to a host.
+        failure: Record a failed request to a host.
+        release: End a half open trial without recording an outcome.
+        state: Return the circuit state of a host.
+        reset: Close the circuit of a host (or every host).
+    """
+    def __init__(self, threshold: int = 5, cooldown: float = 30):
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._failures: dict[str, int] = {}  # consecutive failures per host
+        self._opened: dict[str, float] = {}  # when each open circuit opened
+        self._trials: set[str] = set()  # hosts with a half open trial
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f"CircuitBreaker({self._threshold}, {self._cooldown})"
+
+    @property
+    def threshold(self) -> int:
+        """Return the consecutive failures before a circuit opens."""
+        return self._threshold
+
+    @property
+    def cooldown(self) -> float:
+        """Return the seconds a circuit stays open."""
+        return self._cooldown
+
+    @property
+    def states(self) -> dict[str, str]:
+        """Return the state of every host whose circuit isn't closed."""
+        with self._lock:
+            hosts = [*self._opened]
+        return {ip: self.state(ip) for ip in hosts}
+
+    def state(self, ip: str) -> str:
+        """Return the state (`closed`, `open` or `half_open`) of a host."""
+        opened = self._opened.get(ip)
+        if opened is None:
+            return "closed"
+        if ip in self._trials or monotonic() - opened >= self._cooldown:
+            return "half_open"
+        return "open"
+
+    def allow(self, ip: str) -> bool:
+        """Return True if a request to the host may be made.
+
+        Once the cooldown passes, only one (trial) request is allowed until
+        its outcome is recorded.
+        """
+        with self._lock:
+            if (opened := self._opened.get(ip)) is None:
+                return True
+            if ip in self._trials or monotonic() - opened < self._cooldown:
+                return False
+            self._trials.add(ip)
+            return True
+
+    def success(self, ip: str) -> None:
+        """Record a successful request to the host (closing its circuit)."""
+        with self._lock:
+            self._failures.pop(ip, None)
+            self._opened.pop(ip, None)
+            self._trials.discard(ip)
+
+    def failure(self, ip: str) -> None:
+        """Record a failed request to the host."""
+        with self._lock:
+            failures = self._failures[ip] = self._failures.get(ip, 0) + 1
+            if ip in self._trials or failures >= self._threshold:
+                self._opened[ip] = monotonic()
+            self._trials.discard(ip)
+
+    def release(self, ip: str) -> None:
+        """End a half open trial of the host without recording an outcome,
+        so the next request may be let through as the trial.
+        """
+        with self._lock:
+            self._trials.discard(ip)
+
+    def reset(self, ip: str | None = None) -> None:
+        """Close the circuit of a host, else every host."""
+        with self._lock:
+            if ip is None:
+                self._failures.clear()
+                self._opened.clear()
+                self._trials.clear()
+            else:
+                self._failures.pop(ip, None)
+                self._opened.pop(ip, None)
+                self._trials.discard(ip)
+
+
+class Client():
+    """
+    HTTP client for the AxeOS API with pooled keep-alive connections.
+
+    A `requests.Session` is kept per host so repeat calls to the same device
+    (e.g. info -> system -> restart) reuse an open connection rather than
+    paying for a new TCP handshake each time.
+
+    Idempotent (GET) requests that fail to connect, time out or get a 5xx
+    response are retried up to `retries` times with exponential backoff and
+    full jitter. Every host is guarded by a `CircuitBreaker`, so requests to a
+    host that keeps failing to connect fail fast with `CircuitOpen`.
+
+    Args:
+        pool_size: The max number of pooled connections per host (default=4).
+        connect_timeout: Seconds to wait for a connection (default=3.05).
+        read_timeout: Seconds to wait for a response (default=5).
+        retries: The max retries of a GET request (default=2).
+        backoff: Seconds before the first retry, doubled after each one
+            (default=0.25).
+        backoff_max: The max seconds between retries (default=4).
+        breaker: The circuit breaker to use, else a new `CircuitBreaker`
+            (default=None).
+
+    Methods:
+        session: Return the pooled session for a host.
+        request: Make and return the proper request for an IP and endpoint.
+        close: Close all pooled sessions.
+    """
+    def __init__(self, pool_size: int = 4,
+                 connect_timeout: float = 3.05, read_timeout: float = 5,
+                 retries: int = 2, backoff: float = 0.25,
+                 backoff_max: float = 4,
+                 breaker: CircuitBreaker | None = None):
+        self._pool_size = pool_size
+        self._timeout = (connect_timeout, read_timeout)
+        self._retries = retries
+        self._backoff = backoff
+        self._backoff_max = backoff_max
+        self._breaker = breaker if breaker is not None else CircuitBreaker()
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = Lock()
+
+    def __repr__(self):
+        return ' '.join((
+            f"Client({self._pool_size},",
+            f"{self._timeout[0]},",
+            f"{self._timeout[1]})"
+        ))
+
+    @property
+    def pool_size(self) -> int:
+        """Return the max number of pooled connections per host."""
+        return self._pool_size
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """Return the (connect, read) timeouts."""
+        return self._timeout
+
+    @property
+    def retries(self) -> int:
+        """Return the max retries of a GET request."""
+        return self._retries
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """Return the per-host circuit breaker."""
+        return self._breaker
+
+    def session(self, ip: str) -> requests.Session:
+        """Return the pooled session for the given host, creating it if needed.
+
+        Args:
+            ip: The IP of the [axe] device.
+        """
+        if (session := self._sessions.get(ip)) is None:
+            with self._lock:
+                if (session := self._sessions.get(ip)) is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1,
+                                          pool_maxsize=self._pool_size)
+                    session.mount(HTTP, adapter)
+                    self._sessions[ip] = session
+        return session
+
+    @profiling.traced("api.request")
+    def request(
+            self, ip: str, endpoint: str,
+            body: dict[str, str | int] | None = None) -> requests.Response:
+        """Make and return the proper request for the given IP and endpoint.
+
+        See `api.request()` for details.
+        """
+        method, url = API[endpoint]["type"], f"{HTTP}{ip}{API[endpoint]['url']}"
+        if endpoint not in ROUTES or ROUTES[endpoint] != method:
+            raise ValueError("Not a valid HTTP method for this API.")
+
+        retries = self._retries if method in RETRY_METHODS else 0
+        error: Exception | None = None  # last connection error
+        for attempt in range(retries + 1):
+            if attempt:
+                metrics.inc("axeprof_request_retries_total",
+                            endpoint=endpoint, host=ip)
+                sleep(random.uniform(0, min(
+                    self._backoff_max, self._backoff * 2 ** (attempt - 1))))
+            if not self._breaker.allow(ip):
+                metrics.inc("axeprof_request_errors_total", endpoint=endpoint,
+                            host=ip, error=CircuitOpen.__name__)
+                raise error or CircuitOpen(f"Circuit open for {ip}")
+            start = perf_counter()
+            try:
+                res = self.session(ip).request(method, url, json=body,
+                                               timeout=self._timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._breaker.failure(ip)
+                metrics.inc("axeprof_request_errors_total", endpoint=endpoint,
+                            host=ip, error=type(e).__name__)
+                if attempt == retries:
+                    raise
+                error = e
+                continue
+            except requests.RequestException as e:  # not worth retrying
+                self._breaker.failure(ip)
+                metrics.inc("axeprof_request_errors_total", endpoint=endpoint,
+                            host=ip, error=type(e).__name__)
+                raise
+            except BaseException:
+                # NOTE: e.g. an interrupt mid-request mustn't leave a half
+                # open trial in flight forever (rejecting every request)
+                self._breaker.release(ip)
+                raise
+
+            if metrics.enabled():
+                metrics.record_request(
+                    endpoint, ip, perf_counter() - start, res.status_code,
+                    len(res.request.body or b''), len(res.content))
+            self._breaker.success(ip)
+            if res.status_code == 200:
+                return res
+            if res.status_code < 500 or attempt == retries:
+                raise requests.HTTPError(f"Status code: {res.status_code}")
+
+    def close(self) -> None:
+        """Close all pooled sessions."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_client = Client()  # default client backing `request()`
+
+
+def get_client() -> Client:
+    """Return the default `Client` used by `request()`."""
+    return _client
+
+
+def configure(pool_size: int = 4,
+              connect_timeout: float = 3.05, read_timeout: float = 5,
+              retries: int = 2, backoff: float = 0.25,
+              backoff_max: float = 4, breaker_threshold: int = 5,
+              breaker_cooldown: float = 30) -> Client:
+    """Replace the default `Client` used by `request()` and return it.
+
+    Args:
+        pool_size: The max number of pooled connections per host (default=4).
+        connect_timeout: Seconds to wait for a connection (default=3.05).
+        read_timeout: Seconds to wait for a response (default=5).
+        retries: The max retries of a GET request (default=2).
+        backoff: Seconds before the first retry, doubled after each one
+            (default=0.25).
+        backoff_max: The max seconds between retries (default=4).
+        breaker_threshold: Consecutive failures before a host's circuit
+            opens (default=5).
+        breaker_cooldown: Seconds a host's circuit stays open (default=30).
+
+    Returns:
+        The new default `Client`.
+    """
+    global _client
+    old, _client = _client, Client(
+        pool_size=pool_size, connect_timeout=connect_timeout,
+        read_timeout=read_timeout, retries=retries, backoff=backoff,
+        backoff_max=backoff_max,
+        breaker=CircuitBreaker(breaker_threshold, breaker_cooldown))
+    old.close()
+    return _client
+
+
+def host_state(ip: str) -> str:
+    """Return the circuit state (`closed`, `open` or `half_open`) of a host.
+
+    Schedulers can use this to route around hosts that are known to be down.
+    """
+    return _client.breaker.state(ip)
 
 
 def request(
@@ -76,7 +401,8 @@ def request(
     """Make and return the proper request for the given IP addr and endpoint.
 
     See `./api.py` for the supported API routes and a link to the source
-    for the Bitaxe API.
+    for the Bitaxe API. Requests are made through the default `Client` (see
+    `configure()`), which reuses connections to each host.
 
     Args:
         ip: The IP of the [axe] device.
@@ -88,42 +414,22 @@ def request(
     Raises:
         ValueError: if an invalid HTTP method is specified for the endpoint.
         requests.HTTPError: if an invalid path for the API is requested.
-        requests.ConnectionError: if the request takes too long or fails.
+        requests.ConnectionError: if the request takes too long or fails
+            (after any retries), or `CircuitOpen` if the host is known to be
+            down.
         Exception: for any other request issues.
     """
-
     try:
-        method, url = API[endpoint]["type"], f"{HTTP}{ip}{API[endpoint]['url']}"
-
-        if method == "GET" and endpoint == "info":
-            res = requests.get(url, timeout=5)
-
-            if res.status_code != 200:
-                raise requests.HTTPError(f"Status code: {res.status_code}")
-            return res
-        elif method == "POST" and endpoint == "restart":
-            res = requests.post(url, timeout=5)
-
-            if res.status_code != 200:
-                raise requests.HTTPError(f"Status code: {res.status_code}")
-            return res
-        elif method == "PATCH" and endpoint == "system":
-            res = requests.patch(url, json=body, timeout=5)
-
-            if res.status_code != 200:
-                raise requests.HTTPError(f"Status code: {res.status_code}")
-            return res
-        else:
-            raise ValueError("Not a valid HTTP method for this API.")
+        return _client.request(ip, endpoint, body)
     except ValueError as ve:
-        # print(f"{ve} for {method} {url}")
+        # print(f"{ve} for {endpoint} @ {ip}")
         raise ve
     except requests.HTTPError as httpe:
-        # print(f"HTTP error: {httpe} for {method} {url}")
+        # print(f"HTTP error: {httpe} for {endpoint} @ {ip}")
         raise httpe
     except requests.ConnectTimeout as conne:
-        # print(f"Timeout Error: {conne} for {method} {url}")
+        # print(f"Timeout Error: {conne} for {endpoint} @ {ip}")
         raise conne
     except Exception as e:
-        # print(f"Request error: {e} for {method} {url}")
+        # print(f"Request error: {e} for {endpoint} @ {ip}")
         raise e
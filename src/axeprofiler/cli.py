@@ -19,9 +19,8 @@
 
 import json
 from time import sleep
-from time import sleep
-from typing import TypeAlias
-from os import system, path, mkdir, listdir, remove
+from typing import TYPE_CHECKING, Callable, TypeAlias
+from os import system
 
 from rich.rule import Rule
 from rich.text import Text
@@ -29,14 +28,23 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.columns import Columns
 from rich.console import Console
-from rich.progress import Progress
 from rich.prompt import Prompt, Confirm
-from requests.exceptions import ConnectTimeout
 
+from axeprofiler import infocache, metrics, profiling, registry
+from axeprofiler.config import ROOT, load_config
 from axeprofiler.profiles import Profile
+from axeprofiler.refresher import Refresher
+from axeprofiler.store import DirectoryStore, SQLiteStore, open_store
+
+# NOTE: the network modules (and `requests`) are imported by the actions that
+# use them to keep the time to the first prompt short
+if TYPE_CHECKING:
+    from axeprofiler.fleet import RESULT
 
 
 CONFIG: TypeAlias = dict[str, str | int]  # config obj format
+PAGE_SIZE = 4  # max profiles rendered per page (2x2)
+RECENT_DEVICES = 4  # recently used devices revalidated in the background
 DEFAULTS = {  # BitAxe and NerdQAxe model defaults
     "Supra": {"frequency": 490, "core_voltage": 1166, "fanspeed": 90},
     "Gamma": {"frequency": 525, "core_voltage": 1150, "fanspeed": 90},
@@ -62,63 +70,42 @@ class Cli(Console):
         run_profile: Apply the selected profile to a device.
         delete_profile: Delete the specified profile.
         show_profile: Display the details of the selected profile.
+        discover_devices: Find the AxeOS devices on a network.
         session: Start the CLI session loop.
     """
     def __init__(self) -> None:
         super().__init__()  # Inherit Console() ability to render/color
-        self.__root: str  = __file__.split("src")[0]  # program root
-        self.__config: str  = f"{self.__root}.config"  # program config
+        self.__root: str  = ROOT  # program root
         self._profile: Profile = None  # Currently selected Profile
 
-        # Start progress bar
-        with Progress() as progress:  # NOTE remove increments? - loads too fast
-            # Check for existing config or create one
-            config_task = progress.add_task("[blue]Validating config files...")
-            progress.update(config_task, advance=25)
-            if not path.exists(self.__config):
-                with open(self.__config, 'w') as f:
-                    f.write(json.dumps(
-                        {"profile_dir": f"{self.__root}.profiles/"},
-                        indent=4)
-                    )
-
-            # Read config
-            progress.update(config_task, advance=50)
-            with open(self.__config, 'r') as f:
-                config = json.loads(f.read())
-            progress.update(config_task, advance=25)
-
-            profile_task = progress.add_task("[blue]Validating profiles...")
-            try:
-                # Verify integrity of profile_dir
-                profile_dir = config.get("profile_dir")
-                progress.update(profile_task, advance=30)
-                if not profile_dir:
-                    # Add default profile_dir to config
-                    with open(self.__config, 'w') as f:
-                        config["profile_dir"] = f"{self.__root}.profiles/"
-                        f.write(json.dumps(config, indent=4))
-
-                    # Make default profile_dir and assign class attr
-                    mkdir(self.__profile_dir)
-                    self.__profile_dir = config["profile_dir"]
-                else:
-                    assert profile_dir
-                    assert isinstance(profile_dir, str)
-
-                    # Ensure existing profile_dir
-                    if not path.exists(profile_dir):
-                        mkdir(profile_dir)
+        try:
+            # Read config (creating defaults as needed) and verify profile_dir
+            config = load_config(self.__root)
+            self.__profile_dir = config["profile_dir"]  # assign class attr
+        except AssertionError:
+            msg = "[red]Invalid profile directory configuration"
+            self.print(msg)
+            raise AssertionError("**Program terminated**")  # Exit program
 
-                    self.__profile_dir = profile_dir  # assign class attr
-                progress.update(profile_task, advance=70)
-            except AssertionError:
-                msg = "[red]Invalid profile directory configuration"
-                self.print(msg)
-                raise AssertionError("**Program terminated**")  # Exit program
+        try:
+            # Open the configured profile store
+            self._store: DirectoryStore | SQLiteStore = open_store(config)
+        except ValueError as ve:
+            self.print(f"[red]{ve}")
+            raise AssertionError("**Program terminated**")  # Exit program
+
+        # Start from the last-known device info, if a snapshot is configured
+        if config.get("info_cache"):
+            infocache.configure(snapshot=config["info_cache"])
+
+        # Keep the profile index and the recently used device info warm in
+        # the background between prompts
+        self._refresher = Refresher()
+        self._refresher.add("profiles", self._store.refresh)
+        self._refresher.add("devices", lambda: infocache.get_cache().revalidate(
+            recent=RECENT_DEVICES))
 
         self.print("[blue]Starting program...")
-        sleep(0.5)  # Pause render before clearing
 
     def __repr__(self):
         return f"Cli()"
@@ -126,7 +113,7 @@ class Cli(Console):
     def __str__(self) -> str:
         return json.dumps(
             {
-                "num_profiles": len(listdir(self.__profile_dir)),
+                "num_profiles": self.num_profiles,
                 "active_profile": self._profile.name if self._profile else None
             }, indent=4)
 
@@ -138,12 +125,28 @@ class Cli(Console):
         """
         return self.__profile_dir
 
+    @property
+    def store(self) -> DirectoryStore | SQLiteStore:
+        """
+        Return the profile store - set by `store` in `.config`. The default
+        stores one JSON file per profile in `profile_dir`.
+        """
+        return self._store
+
+    @property
+    def refresher(self) -> Refresher:
+        """
+        Return the background `Refresher` run during a session. Additional
+        periodic tasks (e.g. device status) may be registered with it.
+        """
+        return self._refresher
+
     @property
     def num_profiles(self) -> int:
         """
         Return the number of existing profiles found.
         """
-        return len(listdir(self.profile_dir))
+        return len(self._store)
 
     @property
     def profile(self) -> Profile:
@@ -161,6 +164,7 @@ class Cli(Console):
             profile: The `Profile()` obj to set as active."""
         self._profile = profile if isinstance(profile, Profile) else None
 
+    @profiling.traced("Cli.main_menu")
     def main_menu(self) -> None:
         """
         Display the main menu with available options.
@@ -180,6 +184,7 @@ class Cli(Console):
         menu.add_row(f"[bold green]L[/] ({self.num_profiles} found)",
                      "List all of the available Profiles")
         menu.add_row("[bold green]N", "Create a new Profile")
+        menu.add_row("[bold green]F", "Find devices on the network")
         # Toggle selection indicators
         if self.profile:
             menu.add_row("[bold green]U", "Update the selected Profile")
@@ -202,6 +207,7 @@ class Cli(Console):
         # Render the main menu
         self.print(Panel(menu, title="[bold bright_cyan]Main Menu", width=80))
 
+    @profiling.traced("Cli._load_profile")
     def _load_profile(self, profile_name: str) -> Profile:
         """
         Load an existing profile.
@@ -216,89 +222,112 @@ class Cli(Console):
             FileNotFoundError: if no file is found for the given name.
         """
         try:
-            with open(f"{self.profile_dir}{profile_name}", 'r') as f:
-                return Profile.create_profile(json.loads(f.read()))
+            return self._store.load(profile_name)
 
         except FileNotFoundError:
             self.print(f"[red]Could not find a profile named: {profile_name} ⚠")
         except Exception as e:
             print(e)
 
-    def list_profiles(self, profiles: list[str] | None = None,
-                      num_rendered: int = 0, first_page: bool = False) -> None:
+    @profiling.traced("Cli._render_profile_page")
+    def _render_profile_page(self, page: int,
+                             total: int) -> dict[str, Profile]:
         """
-        List all existing profiles.
+        Load and render a single page of profiles.
+
+        Only the profiles on the requested page are loaded from the store.
 
         Args:
-            profiles: An array of profile names (default=None).
-            num_rendered: The number of profiles rendered so far (default=0).
-            first_page: Toggle Rule() on first page load (default=False).
-        """
-        # TODO next iteration, add filters
-        # TODO add full profile tracking for selection on any page
-        if first_page:
-            self.print(Rule("[bold cyan]Listing Profiles"), width=80)
-        else:
-            self.print("[blue]Loading profiles...⏳")
+            page: The page number to render (1-indexed).
+            total: The total number of profiles.
 
-        # Get current screen totals
-        _profiles = profiles or listdir(self.profile_dir)
-        if len(_profiles) >=4:
-            if num_rendered == 0:
-                current = "1-4"
-            else:
-                current = f"{num_rendered + 1}-{num_rendered + 4}"
-        elif num_rendered == 0:
-                current = f"1-{len(_profiles)}"
-        else:
-            current = f"{num_rendered + 1}-{num_rendered + len(_profiles)}"
-        total = self.num_profiles  # total profiles
+        Returns:
+            A dict of choice number -> `Profile` for the rendered page.
+        """
+        offset = (page - 1) * PAGE_SIZE
+        names = self._store.names(offset=offset, limit=PAGE_SIZE)
 
         # Turn each Profile() into a renderable Table()
         # NOTE: max 2x2 (4) per page (width=37)
-        _min, _max = [int(i) for i in current.split('-')]
-        choices = [*map(str, list(range(_min, _max+1)))]
-        tables: dict[str, Table] = {}
-        for num, _profile in zip(choices, _profiles[:4]):
-            profile: Profile = self._load_profile(_profile)
+        profiles: dict[str, Profile] = {}
+        tables: list[Table] = []
+        for num, name in enumerate(names, start=offset + 1):
+            if not (profile := self._load_profile(name)):
+                continue  # unreadable profiles are reported and skipped
             # Truncate text to match profile window size with room for options
             title = Text(profile.name)
             title.truncate(max_width=32, overflow="ellipsis")
-            tables[num] = {
-                "profile": profile,
-                "table": Table(profile.__str__(),
-                               title=f"[green][{num}] [bold magenta]{title}",
-                               width=37)
-            }
-        # self.print(tables)  # Testing
+            profiles[str(num)] = profile
+            tables.append(Table(profile.__str__(),
+                                title=f"[green][{num}] [bold magenta]{title}",
+                                width=37))
 
         # Render the profiles
         # NOTE We create rows by taking advantage of the display's built-in
         # wrapping to our set width of 80 char. This allows us to avoid
         # creating a Group() of Panel() of Columns()
-        self.print(Panel(Columns((tables[data]["table"] for data in tables)),
+        current = f"{offset + 1}-{offset + len(names)}" if names else "0"
+        self.print(Panel(Columns(tables),
                          title=f"[bold cyan]Profiles ({current}/{total})",
                          width=80))
+        return profiles
 
-        # Handle user choice and menu navigation
-        msg = "Enter a [green]number[/] to select the corresponding profile.\n"
-        msg += "Enter [red][Q][/] to quit to [cyan]Main Menu[/]"
-        if len(_profiles) > 4:  # Add pagination prompt
-            msg += " or [green][P][/] to see more profiles"
-            user_choice = Prompt.ask(msg,
-                                     choices=choices + ['P', 'Q'],
-                                     case_sensitive=False, default='P')
-        else:
-            user_choice = Prompt.ask(msg,
-                                     choices=choices + ['Q'],
-                                     case_sensitive=False, default='Q')
-        # Set the selected profile and return to main menu
-        if user_choice in choices:
-            self.profile = tables[user_choice]["profile"]
-        # Use recursion to paginate as needed (4 per page)
-        elif user_choice.lower() == 'p' and len(_profiles) > 4:
-            return self.list_profiles(profiles=_profiles[4:],
-                                      num_rendered=num_rendered+4)
+    def list_profiles(self, first_page: bool = False, page: int = 1) -> None:
+        """
+        List all existing profiles, one page at a time.
+
+        Pages are loaded lazily from the store as the user navigates, and the
+        user may move forward/back or jump directly to any page.
+
+        Args:
+            first_page: Toggle Rule() on first page load (default=False).
+            page: The page number to start on (default=1).
+        """
+        # TODO next iteration, add filters
+        if first_page:
+            self.print(Rule("[bold cyan]Listing Profiles"), width=80)
+
+        while True:
+            total = self.num_profiles  # total profiles
+            last_page = max(1, -(-total // PAGE_SIZE))  # ceil division
+            page = min(max(1, page), last_page)
+            profiles = self._render_profile_page(page, total)
+
+            # Handle user choice and menu navigation
+            choices = [*profiles]
+            msg = "Enter a [green]number[/] to select the corresponding "
+            msg += f"profile (page {page}/{last_page}).\n"
+            if page < last_page:
+                choices.append('P')
+                msg += "[green][P][/] next page, "
+            if page > 1:
+                choices.append('B')
+                msg += "[green][B][/] previous page, "
+            if last_page > 1:
+                choices.append('J')
+                msg += "[green][J][/] jump to page, "
+            msg += "[red][Q][/] to quit to [cyan]Main Menu[/]"
+            user_choice = Prompt.ask(
+                msg, choices=choices + ['Q'], case_sensitive=False,
+                default='P' if page < last_page else 'Q'
+            )
+
+            match user_choice.lower():
+                case 'p':
+                    page += 1
+                case 'b':
+                    page -= 1
+                case 'j':
+                    page = self._validate_int_prompt(
+                        f"Enter a [green]page[/] (1-{last_page})",
+                        default=page, flag='q') or page
+                case 'q':
+                    return
+                case _:
+                    # Set the selected profile and return to main menu
+                    self.profile = profiles[user_choice]
+                    return
+            self.print("[blue]Loading profiles...⏳")
 
     def _validate_int_prompt(self, prompt: str,
                              default: int, flag: str) -> int | bool:
@@ -306,7 +335,7 @@ class Cli(Console):
         Validate integer prompts while allowing for a string flag to interrupt.
 
         Prompts the user for an integer value, with support for a special flag
-        to cancel the process. Recursively re-prompts on invalid input.
+        to cancel the process. Re-prompts on invalid input.
 
         Args:
             prompt: The user prompt.
@@ -316,9 +345,11 @@ class Cli(Console):
         Returns:
             Returns an `int` if the user doesn't pass the `flag` else `False`
         """
-        try:
-            assert isinstance(default, int)  # Ensure to avoid recursion issues
+        if not isinstance(default, int):
+            self.print("[red]arg: `default` value is not of type int")
+            return False
 
+        while True:
             # Get user propmt and check for the escape flag
             # NOTE: str(default) is required to render here for some reason
             # NOTE: Rich will auto convert int values returned from ask()
@@ -326,16 +357,11 @@ class Cli(Console):
             if isinstance(user_choice, str) and user_choice.lower() == flag:
                 return False
 
-            # int() handles the default oddity mentioned above
-            return int(user_choice)
-
-        except ValueError:
-            self.print("[red]Please enter a valid integer number")
-            # NOTE: must include the return here, lest you like recursion bugs
-            return self._validate_int_prompt(prompt, default, flag)
-        except AssertionError:
-            self.print("[red]arg: `default` value is not of type int")
-            return False
+            try:
+                # int() handles the default oddity mentioned above
+                return int(user_choice)
+            except ValueError:
+                self.print("[red]Please enter a valid integer number")
 
     def _get_profile_config(self, retain_name: str = None) -> CONFIG:
         """
@@ -374,6 +400,7 @@ class Cli(Console):
                 "frequency": frequency, "coreVoltage": c_voltage,
                 "fanspeed": fanspeed}
 
+    @profiling.traced("Cli._render_defaults")
     def _render_defaults(self) -> None:
         """
         Display the default configuration values for all supported models.
@@ -397,127 +424,220 @@ class Cli(Console):
 
         Guides the user through the process of creating a new profile, with
         validation and the ability to cancel at any step. Displays model
-        defaults and confirms before saving.
+        defaults and confirms before saving, starting over if declined.
 
         Returns:
             A `Profile` obj containing axe config data else `None` if the user
             cancels mid process.
         """
-        self.print(Rule("[bold cyan]Creating Profile"), width=80)
-        try:
-            self._render_defaults()
-            # Prompt user and create a new Profile()
-            profile = Profile.create_profile(self._get_profile_config())
-        except AssertionError:  # _get_profile_config() will raise to escape
-            self.print("[blue]Canceling profile creation...⏳")
-            return
-
-        try:
-            # Render created profile
-            new_profile = Table(profile.__str__(),
-                                title=f"[bold magenta]{profile.name}", width=50)
-            print()
-            self.print(new_profile)
-            # Confirm before saving else create another profile
-            user_choice = Confirm.ask("[bold green]Create[/] this profile?")
-            if not user_choice:
-                return self.create_profile()
+        while True:
+            self.print(Rule("[bold cyan]Creating Profile"), width=80)
+            try:
+                self._render_defaults()
+                # Prompt user and create a new Profile()
+                profile = Profile.create_profile(self._get_profile_config())
+            except AssertionError:  # _get_profile_config() will raise to escape
+                self.print("[blue]Canceling profile creation...⏳")
+                return
 
-            profile.save_profile(profile_dir=self.profile_dir)
-            assert path.exists(f"{self.profile_dir}{profile.name}.json")
+            try:
+                # Render created profile
+                new_profile = Table(profile.__str__(),
+                                    title=f"[bold magenta]{profile.name}",
+                                    width=50)
+                print()
+                self.print(new_profile)
+                # Confirm before saving else create another profile
+                user_choice = Confirm.ask("[bold green]Create[/] this profile?")
+                if not user_choice:
+                    continue
+
+                self._store.save(profile)
+                assert self._store.exists(profile.name)
 
-            self.print(f"\n[bold]Profile [blue]{profile.name}[/] created! 🍞")
-            sleep(1)
-            return profile
-        except AssertionError:
-            self.print("[red]Error[/] verifying [magenta]profile[/] was saved")
+                self.print(
+                    f"\n[bold]Profile [blue]{profile.name}[/] created! 🍞")
+                sleep(1)
+                return profile
+            except AssertionError:
+                self.print(
+                    "[red]Error[/] verifying [magenta]profile[/] was saved")
+                return
 
     def update_profile(self, profile: Profile) -> None:
         """
         Update the configuration of an existing profile.
 
         Prompts the user to modify the configuration values of the selected
-        profile. Saves the updated profile if changes are confirmed.
+        profile. Saves the updated profile if changes are confirmed, else
+        starts the update over.
 
         Args:
             profile: The profile to update.
         """
-        self.print(Rule("[bold cyan]Updating Profile"), width=80)
+        while True:
+            self.print(Rule("[bold cyan]Updating Profile"), width=80)
+            try:
+                if not profile:
+                    raise ValueError
+
+                # Render the selected profile
+                self.print(Table(
+                    profile.__str__(),
+                    title=f"[bold magenta]{profile.name}[/] (current)",
+                    width=50)
+                )
+
+                # Create a new profile to override selected with
+                new_profile = Profile.create_profile(
+                    self._get_profile_config(retain_name=profile.name)
+                )
+
+            except ValueError:
+                self.print("No Profile is currently [green]selected")
+                sleep(0.25)
+                return
+            except AssertionError:  # _get_profile_config() will raise to escape
+                self.print("[blue]Canceling profile creation...⏳")
+                sleep(0.25)
+                return
+
+            try:
+                # Render current config vs selected profile # TODO breakout
+                print()
+                selected = Table(profile.__str__(),
+                                 title=f"[bold magenta]{profile.name}",
+                                 width=37)
+                updated = Table(new_profile.__str__(),
+                                title=f"[bold magenta]{new_profile.name}",
+                                width=37)
+                self.print(Columns([selected, "[bold green]->", updated]))
+
+                # Confirm before saving else re-rerun the update process
+                user_choice = Confirm.ask("[bold green]Update[/] this profile?")
+                if not user_choice:
+                    continue
+
+                # Set and save the updated profile
+                self.profile = new_profile
+                if self.profile.name != profile.name:
+                    self._store.save(self.profile, replace=profile.name)
+                else:
+                    self._store.save(self.profile)
+                assert self._store.exists(self.profile.name)
+
+                self.print(f"\n[bold]Profile [blue]{self.profile.name}[/] "
+                           + "updated! 👍")
+                sleep(1)
+            except AssertionError:
+                self.print(
+                    "[red]Error[/] verifying [magenta]profile[/] was saved")
+            return
+
+    @profiling.traced("Cli._render_fleet_results")
+    def _render_fleet_results(self, results: list["RESULT"]) -> None:
+        """
+        Display the per-device results of a fleet apply.
+
+        Args:
+            results: The results returned by `fleet.apply_profile()` or
+                `fleet.rolling_apply()`.
+        """
+        colors = {"success": "green", "unchanged": "blue",
+                  "timeout": "yellow", "skipped": "yellow"}
+        table = Table("IP", "Status", "Latency (s)", "Error",
+                      title="[bold cyan]Fleet Results", width=80)
+        for result in results:
+            color = colors.get(result["status"], "red")
+            table.add_row(result["ip"], f"[{color}]{result['status']}",
+                          str(result["latency"]), result["error"] or '')
+        self.print(table)
+
+        succeeded = sum(result["status"] in ("success", "unchanged")
+                        for result in results)
+        restarted = sum(bool(result["restarted"]) for result in results)
+        self.print(f"[bold]{succeeded}/{len(results)}[/] devices updated "
+                   + f"([bold]{restarted}[/] restarted)")
+
+    def _record_applied(self, profile_name: str,
+                        results: list["RESULT"]) -> None:
+        """Assign the profile to the registered devices it was applied to."""
         try:
-            if not profile:
-                raise ValueError
+            registry.get_registry().record_applied(profile_name, results)
+        except (ValueError, OSError) as e:
+            self.print(f"[red]Could not update the device registry[/]: {e}")
 
-            # Render the selected profile
-            self.print(Table(
-                self.profile.__str__(),
-                title=f"[bold magenta]{self.profile.name}[/] (current)",
-                width=50)
-            )
+    def _run_profile_fleet(self, profile: Profile, ips: list[str]) -> None:
+        """
+        Apply the selected profile to multiple devices at once.
 
-            # Create a new profile to override selected with
-            new_profile = Profile.create_profile(
-                self._get_profile_config(retain_name=profile.name)
-            )
+        Args:
+            profile: The profile to apply.
+            ips: The IP addresses of the target devices.
+        """
+        # Render selected profile and targets
+        print()
+        self.print(Table(profile.__str__(),
+                         title=f"[bold magenta]{profile.name}", width=37))
+        targets = Text(', '.join(ips))
+        targets.truncate(max_width=300, overflow="ellipsis")
+        self.print(Panel(targets, title=f"[bold cyan]Targets ({len(ips)})",
+                         width=80))
 
-        except ValueError:
-            self.print("No Profile is currently [green]selected")
-            sleep(0.25)
-            return
-        except AssertionError:  # _get_profile_config() will raise to escape
-            self.print("[blue]Canceling profile creation...⏳")
+        # Confirm before appplying
+        user_choice = Confirm.ask(
+            f"Apply [bold magenta]{profile.name}[/] to {len(ips)} devices?",
+            case_sensitive=False,
+            default=False)
+        if not user_choice:
+            self.print("[blue]Returning to main menu...⏳")
             sleep(0.25)
             return
 
-        try:
-            # Render current config vs selected profile # TODO breakout
-            print()
-            selected = Table(profile.__str__(),
-                             title=f"[bold magenta]{profile.name}", width=37)
-            updated = Table(new_profile.__str__(),
-                           title=f"[bold magenta]{new_profile.name}", width=37)
-            self.print(Columns([selected, "[bold green]->", updated]))
-
-            # Confirm before saving else re-rerun the update process
-            user_choice = Confirm.ask("[bold green]Update[/] this profile?")
-            if not user_choice:
-                return self.update_profile(self.profile)
-
-            # Set and save the updated profile
-            self.profile = new_profile
-            if self.profile.name != profile.name:
-                self.profile.save_profile(profile_dir=self.profile_dir,
-                                          replace=profile.name)
-            else:
-                self.profile.save_profile(profile_dir=self.profile_dir)
-            assert path.exists(f"{self.profile_dir}{self.profile.name}.json")
-
-            self.print(
-                f"\n[bold]Profile [blue]{self.profile.name}[/] updated! 👍")
-            sleep(1)
-        except AssertionError:
-            self.print("[red]Error[/] verifying [magenta]profile[/] was saved")
+        from rich.progress import Progress
+        from axeprofiler import fleet
+
+        # NOTE: restarts are rolled out a few devices at a time so the rest of
+        # the fleet keeps hashing (see `fleet.rolling_apply()`)
+        with Progress(console=self) as progress:
+            task = progress.add_task(f"[blue]Applying {profile.name}...",
+                                     total=len(ips))
+            results = fleet.rolling_apply(
+                profile, ips,
+                on_result=lambda _: progress.update(task, advance=1)
+            )
+        self._render_fleet_results(results)
+        self._record_applied(profile.name, results)
+        if any(result["status"] == "skipped" for result in results):
+            self.print("[red]Rollout aborted[/]: too many devices failed")
+        Prompt.ask("Press [green][Enter][/] to continue", default="Enter")
 
     def run_profile(self, profile: Profile) -> None:
         """
-        Apply the selected profile to a device.
+        Apply the selected profile to one or more devices.
 
-        Prompts the user for a device IP address, displays the current and
-        selected configurations, and applies the profile if confirmed.
+        Prompts the user for device IP address(es). For a single device, the
+        current and selected configurations are displayed before applying.
+        Lists, ranges and CIDR blocks (see `fleet.expand_targets()`) are applied
+        to all devices concurrently.
 
         Args:
             profile: The profile to apply.
 
         Raises:
             ValueError: If no profile is currently selected.
-            ConnectTimeout: If the device cannot be reached.
+            ConnectionError: If the device cannot be reached (after retries).
         """
+        from requests.exceptions import ConnectionError
+        from axeprofiler import fleet
+
         self.print(Rule("[bold cyan]Running Profile"), width=80)
         try:
             if not profile:
                 raise ValueError
 
-            # Get IP
-            ip = Prompt.ask("Enter target [green]IP address[/] or "
+            # Get IP(s)
+            ip = Prompt.ask("Enter target [green]IP address(es)[/] or "
                             + "[Q] to quit to [cyan]Main Menu",
                             case_sensitive=False,
                             default=['Q'])
@@ -528,9 +648,21 @@ class Cli(Console):
                 sleep(0.25)
                 return
 
-            # Render current config vs selected profile
+            try:
+                ips = fleet.expand_targets(ip)
+            except ValueError as ve:
+                self.print(f"[red]{ve}[/]. Returning to main menu...⏳")
+                sleep(1)
+                return
+            if len(ips) > 1:
+                return self._run_profile_fleet(profile, ips)
+            ip = ips[0]  # e.g. a group of one
+
+            # Render current config vs selected profile; last-known info is
+            # shown right away while it's re-fetched in the background
             print()
-            active_config = Profile.create_profile_from_active(ip)
+            active_config = Profile.create_profile_from_active(
+                ip, info=infocache.get_cache().get(ip, stale_ok=True))
             active = Table(active_config.__str__(),
                            title="[bold magenta]Active", width=37)
             selected = Table(profile.__str__(),
@@ -544,14 +676,20 @@ class Cli(Console):
                 default=False)
             if user_choice:
                 self.print(f"[blue]Applying {profile.name} to device...⏳")
-                self.profile.run_profile(ip)
-                self.print("Success! 🥳")
+                # NOTE: the active config is re-read (from the cache if still
+                # fresh) in case the displayed one was stale
+                if self.profile.run_profile(ip):
+                    self.print("Success! 🥳")
+                else:
+                    self.print("Device is already running this profile 👍")
+                self._record_applied(self.profile.name,
+                                     [{"ip": ip, "status": "success"}])
                 sleep(0.5)
             else:
                 self.print("[blue]Returning to main menu...⏳")
             sleep(0.25)
 
-        except ConnectTimeout:
+        except ConnectionError:
             self.print(f"[red]Error[/] connecting to [green]{ip}[/]. "
                        + "Returning to main menu...⏳")
             sleep(1)
@@ -589,7 +727,7 @@ class Cli(Console):
             )
             if user_choice:
                 # Delete the config file
-                remove(f"{self.profile_dir}{profile.name}.json")
+                self._store.delete(profile.name)
                 self.profile = None
                 self.print(f"[blue]{profile.name} has been deleted")
                 sleep(1)
@@ -602,6 +740,42 @@ class Cli(Console):
         except Exception as e:
             print(e)
 
+    def discover_devices(self) -> None:
+        """
+        Find the AxeOS devices on a network.
+
+        Prompts the user for a network (CIDR) to sweep and renders an inventory
+        of the devices found along with their current settings.
+        """
+        self.print(Rule("[bold cyan]Finding Devices"), width=80)
+        cidr = Prompt.ask("Enter a [green]network[/] to sweep (e.g. "
+                          + "192.168.1.0/24) or [Q] to quit to [cyan]Main Menu",
+                          default='Q')
+        if cidr.lower() == 'q':
+            self.print("[blue]Returning to main menu...⏳")
+            return
+
+        from axeprofiler import discovery
+
+        try:
+            with self.status(f"[blue]Sweeping {cidr}...⏳"):
+                devices = discovery.discover(cidr)
+        except ValueError:
+            self.print(f"[red]Invalid network: {cidr}")
+            sleep(1)
+            return
+
+        inventory = Table("IP", "Hostname", "Model", "Frequency",
+                          "coreVoltage", "Fanspeed",
+                          title=f"[bold cyan]Devices ({len(devices)} found)",
+                          width=80)
+        for device in devices:
+            inventory.add_row(*(str(device[key]) for key in (
+                "ip", "hostname", "model", "frequency", "coreVoltage",
+                "fanspeed")))
+        self.print(inventory)
+        Prompt.ask("Press [green][Enter][/] to continue", default="Enter")
+
     def show_profile(self, profile: Profile) -> None:
         """
         Display the details of the selected profile.
@@ -632,72 +806,65 @@ class Cli(Console):
             self.print("No Profile is currently [green]selected")
             sleep(0.25)
 
+    def _new_profile(self) -> None:
+        """Create a new profile and select it (if one was created)."""
+        self.profile = self.create_profile() or self.profile
+
     def session(self) -> None:
         """
         Start the CLI session loop.
 
         Handles user input for navigating the main menu and performing actions
         such as listing, creating, updating, running, deleting, and showing
-        profiles. Recursively calls itself to maintain the session until the
-        user quits.
-        """
-        # Handle user choice
-        self.main_menu()
-        user_choice = Prompt.ask(
-            "Enter an option ([italics]not case sensitive[/]):",
-            choices=['L', 'N', 'U', 'R', 'D', 'S', 'M', 'Q'],
-            default='M',
-            case_sensitive=False
-        )
-
-        # Run session loop via recursion
-        match user_choice.lower():
-            case 'l':
-                # List existing Profiles
-                self.print(f"[green][{user_choice}][/] >>> Listing profiles")
-                self.list_profiles(first_page=True)
-                self.session()
-            case 'n':
-                # Create a new Profile
-                self.print(f"[green][{user_choice}][/] >>> Creating profile")
-                self.profile = self.create_profile() or self.profile
-                sleep(0.5)
-                self.session()
-            case 'u':
-                # Update selected Profile
-                self.print(f"[green][{user_choice}][/] >>> Updating profile")
-                self.update_profile(self.profile)
-                sleep(0.5)
-                self.session()
-            case 'r':
-                # Run selected Profile
-                # # TODO apply to multiple devices
-                self.print(f"[green][{user_choice}][/] >>> Running profile")
-                self.run_profile(self.profile)
-                sleep(0.5)
-                self.session()
-            case 'd':
-                # Delete selected Profile
-                self.print(f"[green][{user_choice}][/] >>> Deleting profile")
-                self.delete_profile(self.profile)
-                sleep(0.5)
-                self.session()
-            case 's':
-                # Show selected Profile
-                self.print(f"[green][{user_choice}][/] >>> Showing profile")
-                self.show_profile(self.profile)
-                sleep(0.5)
-                self.session()
-            case 'm':
-                # Show the main menu
-                self.print(
-                    f"[bright_cyan][{user_choice}][/] >>> Returning to menu")
-                sleep(0.3)
-                self.session()
-            case 'q':
-                # Quit the program
-                self.print(f"[red][{user_choice}][/] >>> Session Terminated")
-                return
+        profiles. Runs as a flat event loop until the user quits, so a session
+        can stay open indefinitely, while the `refresher` keeps background data
+        (e.g. the profile index) fresh between prompts.
+        """
+        # option: (color, action label, handler, pause after)
+        actions: dict[str, tuple[str, str, Callable[[], None], float]] = {
+            'l': ("green", "Listing profiles",
+                  lambda: self.list_profiles(first_page=True), 0),
+            'n': ("green", "Creating profile", self._new_profile, 0.5),
+            'f': ("green", "Finding devices", self.discover_devices, 0.5),
+            'u': ("green", "Updating profile",
+                  lambda: self.update_profile(self.profile), 0.5),
+            # Run selected Profile on one or more devices
+            'r': ("green", "Running profile",
+                  lambda: self.run_profile(self.profile), 0.5),
+            'd': ("green", "Deleting profile",
+                  lambda: self.delete_profile(self.profile), 0.5),
+            's': ("green", "Showing profile",
+                  lambda: self.show_profile(self.profile), 0.5),
+            'm': ("bright_cyan", "Returning to menu", lambda: None, 0.3),
+        }
+
+        self._refresher.start()
+        try:
+            while True:
+                # Handle user choice
+                self.main_menu()
+                user_choice = Prompt.ask(
+                    "Enter an option ([italics]not case sensitive[/]):",
+                    choices=['L', 'N', 'F', 'U', 'R', 'D', 'S', 'M', 'Q'],
+                    default='M',
+                    case_sensitive=False
+                )
+                if user_choice.lower() == 'q':
+                    # Quit the program
+                    self.print(
+                        f"[red][{user_choice}][/] >>> Session Terminated")
+                    return
+
+                color, label, action, pause = actions[user_choice.lower()]
+                self.print(f"[{color}][{user_choice}][/] >>> {label}")
+                with (metrics.timer("axeprof_cli_action_seconds",
+                                    action=label),
+                      profiling.span(f"Cli.session: {label}")):
+                    action()
+                sleep(pause)
+        finally:
+            self._refresher.stop()
+            infocache.get_cache().save()
 
 
 if __name__ == "__main__":  # bypass notice if run from here
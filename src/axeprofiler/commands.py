@@ -0,0 +1,642 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Headless (non-interactive) subcommands for the `axeprof` entry point. Every
+# command prints a single JSON document to stdout and returns an exit code, so
+# the program can be driven from cron, Ansible, etc. e.g.
+#   $ axeprof list
+#   $ axeprof apply Eco 10.0.0.10-40 --workers 16
+#   $ axeprof snapshot 10.0.0.12 Gamma-601 --hostname gamma-601
+#   $ axeprof status 10.0.0.0/24
+#   $ axeprof poll 10.0.0.0/24 --interval 10
+#   $ axeprof tune 10.0.0.10-40 --freq 450:600:25 --volt 1100:1250:25 --save
+#   $ axeprof simulate 100 --base-port 4000
+#   $ axeprof export 10.0.0.0/24 --port 9900
+#   $ axeprof device add 10.0.0.10-40 --tag rack-3
+#   $ axeprof apply Eco @rack-3
+#   $ axeprof import profiles.csv
+
+import sys
+import json
+import argparse
+from typing import Callable
+
+from axeprofiler.config import load_config
+from axeprofiler.registry import SYNC_FIELDS, get_registry, open_registry
+from axeprofiler.store import open_store
+
+
+STATUS_KEYS = ("hostname", "ASICModel", "frequency", "coreVoltage", "fanspeed",
+               "hashRate", "temp", "power", "uptimeSeconds")
+
+
+def _at_least(minimum: int) -> Callable[[str], int]:
+    """Return an argparse type for integers no less than `minimum`."""
+    def integer(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}")
+        return number
+    return integer
+
+
+def _output(data: object, pretty: bool = False) -> None:
+    """Write the command output to stdout as JSON."""
+    sys.stdout.write(json.dumps(data, indent=4 if pretty else None) + "\n")
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    """List every saved profile."""
+    store = open_store(load_config())
+    profiles = []
+    for name in store.names():
+        try:
+            profiles.append(store.load(name).data)
+        except Exception as e:
+            profiles.append({"profile_name": name, "error": str(e)})
+    _output(profiles, args.pretty)
+    return 0
+
+
+def cmd_show(args: argparse.Namespace) -> int:
+    """Show a single saved profile."""
+    store = open_store(load_config())
+    try:
+        _output(store.load(args.profile).data, args.pretty)
+        return 0
+    except FileNotFoundError:
+        _output({"error": f"No profile named: {args.profile}"}, args.pretty)
+        return 1
+
+
+def cmd_apply(args: argparse.Namespace) -> int:
+    """Apply a saved profile to one or more devices."""
+    from axeprofiler import fleet
+
+    store = open_store(load_config())
+    try:
+        profile = store.load(args.profile)
+        ips = fleet.expand_targets(' '.join(args.targets))
+    except FileNotFoundError:
+        _output({"error": f"No profile named: {args.profile}"}, args.pretty)
+        return 1
+    except ValueError as ve:
+        _output({"error": str(ve)}, args.pretty)
+        return 1
+
+    if args.max_restarts:
+        results = fleet.rolling_apply(profile, ips,
+                                      max_restarts=args.max_restarts,
+                                      max_failure_rate=args.max_failure_rate,
+                                      force=args.force,
+                                      timeout=args.health_timeout)
+    else:
+        results = fleet.apply_profile(profile, ips, max_workers=args.workers,
+                                      force=args.force)
+    output = {"profile": profile.name, "results": results}
+    try:
+        get_registry().record_applied(profile.name, results)
+    except (ValueError, OSError) as e:
+        # NOTE: an unreadable/unwritable registry never fails an apply
+        output["registry_error"] = str(e)
+    _output(output, args.pretty)
+    return 0 if all(res["status"] in ("success", "unchanged")
+                    for res in results) else 1
+
+
+def cmd_snapshot(args: argparse.Namespace) -> int:
+    """Save the active config of a device as a new profile."""
+    from axeprofiler.profiles import Profile
+
+    store = open_store(load_config())
+    try:
+        active = Profile.create_profile_from_active(args.ip)
+    except Exception as e:
+        _output({"ip": args.ip, "error": str(e)}, args.pretty)
+        return 1
+
+    profile = Profile(args.name, args.hostname or active.hostname,
+                      active.frequency, active.coreVoltage, active.fanspeed)
+    if store.exists(profile.name) and not args.force:
+        _output({"error": f"Profile already exists: {profile.name}"},
+                args.pretty)
+        return 1
+    store.save(profile)
+    _output(profile.data, args.pretty)
+    return 0
+
+
+def cmd_status(args: argparse.Namespace) -> int:
+    """Show the live status of one or more devices."""
+    from axeprofiler import aio, fleet
+
+    try:
+        ips = fleet.expand_targets(' '.join(args.targets))
+    except ValueError as ve:
+        _output({"error": str(ve)}, args.pretty)
+        return 1
+
+    devices = []
+    for ip, res in aio.fetch_all(ips, "info", limit=args.workers).items():
+        if isinstance(res, Exception):
+            devices.append({"ip": ip, "error": str(res)})
+            continue
+        try:
+            data = res.json()
+        except ValueError as ve:
+            devices.append({"ip": ip, "error": f"Invalid response: {ve}"})
+            continue
+        if not isinstance(data, dict):
+            devices.append({"ip": ip, "error": "Invalid response"})
+            continue
+        devices.append({"ip": ip, **{key: data.get(key)
+                                     for key in STATUS_KEYS}})
+    _output(devices, args.pretty)
+    return 0 if all("error" not in device for device in devices) else 1
+
+
+def cmd_poll(args: argparse.Namespace) -> int:
+    """Stream device statistics as JSON lines until stopped."""
+    from time import sleep
+    from axeprofiler import fleet
+    from axeprofiler.telemetry import Poller
+    from axeprofiler.timeseries import SeriesStore
+
+    try:
+        ips = fleet.expand_targets(' '.join(args.targets))
+    except ValueError as ve:
+        _output({"error": str(ve)}, args.pretty)
+        return 1
+
+    def on_sample(ip: str, timestamp: float, sample: dict) -> None:
+        _output({"ip": ip, "timestamp": timestamp, **sample}, args.pretty)
+        sys.stdout.flush()
+
+    try:
+        store = SeriesStore.load(args.history) if args.history else None
+    except ValueError as ve:
+        _output({"error": str(ve)}, args.pretty)
+        return 1
+
+    poller = Poller(ips, interval=args.interval, max_sockets=args.workers,
+                    store=store, on_sample=on_sample)
+    poller.start()
+    try:
+        sleep(args.duration) if args.duration else poller.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        poller.stop()
+        if args.history:
+            poller.store.save(args.history)
+    _output({"stats": poller.stats, "errors": poller.errors}, args.pretty)
+    return 0
+
+
+def cmd_tune(args: argparse.Namespace) -> int:
+    """Search for the most efficient frequency/coreVoltage of each device."""
+    from axeprofiler import fleet, tuner
+
+    try:
+        ips = fleet.expand_targets(' '.join(args.targets))
+        frequencies = tuner.parse_range(args.freq)
+        voltages = tuner.parse_range(args.volt)
+    except ValueError as ve:
+        _output({"error": str(ve)}, args.pretty)
+        return 1
+
+    store = open_store(load_config()) if args.save else None
+    results = []
+    for ip, (profile, trials) in tuner.tune_fleet(
+            ips, max_workers=args.workers, frequencies=frequencies,
+            voltages=voltages, strategy=args.strategy, settle=args.settle,
+            samples=args.samples, max_temp=args.max_temp,
+            min_hashrate=args.min_hashrate).items():
+        if profile and store is not None:
+            store.save(profile)
+        results.append({"ip": ip, "best": profile.data if profile else None,
+                        "trials": trials})
+    _output(results, args.pretty)
+    return 0 if all(res["best"] for res in results) else 1
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Serve device statistics on a Prometheus `/metrics` endpoint."""
+    from axeprofiler import fleet
+    from axeprofiler.exporter import Exporter
+
+    try:
+        ips = fleet.expand_targets(' '.join(args.targets))
+        exporter = Exporter(ips, host=args.host, port=args.port,
+                            interval=args.interval,
+                            info_interval=args.info_interval,
+                            max_sockets=args.workers)
+        exporter.start()
+    except (ValueError, OSError) as e:
+        _output({"error": str(e)}, args.pretty)
+        return 1
+
+    _output({"url": exporter.url, "devices": len(ips)}, args.pretty)
+    sys.stdout.flush()
+    try:
+        exporter.join(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        exporter.stop()
+    _output({"stats": exporter.stats}, args.pretty)
+    return 0
+
+
+def _device_targets(args: argparse.Namespace) -> tuple:
+    """Return the registry and the devices targeted by a `device` command.
+
+    Raises:
+        ValueError: if the registry or targets are invalid.
+    """
+    from axeprofiler import fleet
+
+    registry = open_registry(load_config())
+    ips = fleet.expand_targets(' '.join(args.targets), registry=registry)
+    return registry, ips
+
+
+def cmd_device_add(args: argparse.Namespace) -> int:
+    """Register devices (or update registered devices)."""
+    try:
+        registry, ips = _device_targets(args)
+        for ip in ips:
+            registry.add(ip, hostname=args.hostname, model=args.model,
+                         tags=args.tag, profile=args.profile)
+    except ValueError as ve:
+        _output({"error": str(ve)}, args.pretty)
+        return 1
+
+    # NOTE: fields given on the command line aren't replaced by the device's
+    fields = [field for field in SYNC_FIELDS if getattr(args, field) is None]
+    errors = {} if args.offline else registry.sync(ips, fields=fields)
+    registry.save()
+    _output([{**registry.get(ip), "error": errors.get(ip)} for ip in ips],
+            args.pretty)
+    return 0 if not errors else 1
+
+
+def cmd_device_remove(args: argparse.Namespace) -> int:
+    """Unregister devices."""
+    try:
+        registry, ips = _device_targets(args)
+    except ValueError as ve:
+        _output({"error": str(ve)}, args.pretty)
+        return 1
+    removed = registry.remove(ips)
+    registry.save()
+    _output({"removed": removed}, args.pretty)
+    return 0
+
+
+def cmd_device_tag(args: argparse.Namespace) -> int:
+    """Add or remove tags on registered devices."""
+    try:
+        registry, ips = _device_targets(args)
+        if args.remove:
+            updated = registry.untag(ips, args.tag)
+        else:
+            updated = registry.tag(ips, args.tag)
+    except ValueError as ve:
+        _output({"error": str(ve)}, args.pretty)
+        return 1
+    registry.save()
+    _output({"updated": updated}, args.pretty)
+    return 0
+
+
+def cmd_device_list(args: argparse.Namespace) -> int:
+    """List registered devices (or the device groups)."""
+    try:
+        registry = open_registry(load_config())
+        if args.groups:
+            _output(registry.groups, args.pretty)
+            return 0
+        if args.targets:
+            from axeprofiler import fleet
+            ips = fleet.expand_targets(' '.join(args.targets),
+                                       registry=registry)
+            devices = [registry.get(ip) or {"ip": ip, "error": "Unregistered"}
+                       for ip in ips]
+        else:
+            devices = registry.devices
+    except ValueError as ve:
+        _output({"error": str(ve)}, args.pretty)
+        return 1
+    _output(devices, args.pretty)
+    return 0
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    """Import profiles in bulk from a CSV or JSONL file."""
+    from axeprofiler.importer import import_profiles
+
+    store = open_store(load_config())
+    try:
+        report = import_profiles(args.file, store, fmt=args.format,
+                                 batch_size=args.batch_size,
+                                 overwrite=args.overwrite, strict=args.strict,
+                                 dry_run=args.dry_run)
+    except (ValueError, OSError) as e:
+        _output({"error": str(e)}, args.pretty)
+        return 1
+    _output(report, args.pretty)
+    return 0 if not report["errors"] else 1
+
+
+def cmd_discover(args: argparse.Namespace) -> int:
+    """Sweep a network for AxeOS devices."""
+    from axeprofiler import discovery
+
+    try:
+        devices = discovery.discover(args.cidr, port=args.port)
+    except ValueError as ve:
+        _output({"error": str(ve)}, args.pretty)
+        return 1
+    _output(devices, args.pretty)
+    return 0
+
+
+def cmd_simulate(args: argparse.Namespace) -> int:
+    """Serve a fleet of virtual AxeOS devices until stopped."""
+    from time import sleep
+    from axeprofiler.simulator import Simulator
+
+    try:
+        simulator = Simulator(
+            args.count, host=args.host, base_port=args.base_port,
+            aliases=args.aliases, latency=args.latency, jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            restart_downtime=args.restart_downtime,
+            models=args.models and args.models.split(','), seed=args.seed)
+        simulator.start()
+    except (ValueError, OSError) as e:
+        _output({"error": str(e)}, args.pretty)
+        return 1
+
+    _output({"devices": simulator.addresses}, args.pretty)
+    sys.stdout.flush()
+    try:
+        sleep(args.duration) if args.duration else simulator.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+    _output({"stats": simulator.stats}, args.pretty)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the headless subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="axeprof",
+        description="Create/save/apply AxeOS miner configs. Run without a "
+                    + "command to start the interactive CLI.")
+    common = argparse.ArgumentParser(add_help=False)  # shared options
+    common.add_argument("--pretty", action="store_true",
+                        help="indent the JSON output")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    sub = commands.add_parser("list", parents=[common],
+                              help="list every saved profile")
+    sub.set_defaults(func=cmd_list)
+
+    sub = commands.add_parser("show", parents=[common],
+                              help="show a saved profile")
+    sub.add_argument("profile", help="the profile name")
+    sub.set_defaults(func=cmd_show)
+
+    sub = commands.add_parser("apply", parents=[common],
+                              help="apply a profile to devices")
+    sub.add_argument("profile", help="the profile name")
+    sub.add_argument("targets", nargs='+',
+                     help="IPs, ranges (10.0.0.5-20) or CIDR blocks")
+    sub.add_argument("--workers", type=_at_least(1), default=32,
+                     help="max devices to apply to at once with "
+                          + "--max-restarts 0 (default=32)")
+    sub.add_argument("--max-restarts", type=_at_least(0), default=4,
+                     help="max devices restarting at once; each waits to be "
+                          + "healthy before the next starts, 0 applies to "
+                          + "all at once (default=4)")
+    sub.add_argument("--max-failure-rate", type=float, default=0.1,
+                     help="abort the rollout once this fraction of devices "
+                          + "fail (default=0.1)")
+    sub.add_argument("--health-timeout", type=float, default=300,
+                     help="seconds for a restarted device to recover "
+                          + "(default=300)")
+    sub.add_argument("--force", action="store_true",
+                     help="send every setting and restart, even if unchanged")
+    sub.set_defaults(func=cmd_apply)
+
+    sub = commands.add_parser(
+        "snapshot", parents=[common],
+        help="save a device's active config as a profile")
+    sub.add_argument("ip", help="the device IP")
+    sub.add_argument("name", help="the new profile name")
+    sub.add_argument("--hostname", help="override the profile hostname")
+    sub.add_argument("--force", action="store_true",
+                     help="overwrite an existing profile")
+    sub.set_defaults(func=cmd_snapshot)
+
+    sub = commands.add_parser("status", parents=[common],
+                              help="show live device status")
+    sub.add_argument("targets", nargs='+',
+                     help="IPs, ranges (10.0.0.5-20) or CIDR blocks")
+    sub.add_argument("--workers", type=_at_least(1), default=256,
+                     help="max requests in flight (default=256)")
+    sub.set_defaults(func=cmd_status)
+
+    # NOTE: no `--pretty`; indented output would break the JSON lines stream
+    sub = commands.add_parser("poll",
+                              help="stream device statistics as JSON lines")
+    sub.add_argument("targets", nargs='+',
+                     help="IPs, ranges (10.0.0.5-20) or CIDR blocks")
+    sub.add_argument("--interval", type=float, default=10,
+                     help="seconds between polls of each device (default=10)")
+    sub.add_argument("--duration", type=float,
+                     help="seconds to poll for, else until interrupted")
+    sub.add_argument("--workers", type=_at_least(1), default=64,
+                     help="max requests in flight (default=64)")
+    sub.add_argument("--history",
+                     help="series file to resume from and save to on exit")
+    sub.set_defaults(func=cmd_poll, pretty=False)
+
+    sub = commands.add_parser(
+        "tune", parents=[common],
+        help="search for the most efficient frequency/coreVoltage")
+    sub.add_argument("targets", nargs='+',
+                     help="IPs, ranges (10.0.0.5-20) or CIDR blocks")
+    sub.add_argument("--freq", required=True,
+                     help="frequencies as start:stop:step or a,b,c")
+    sub.add_argument("--volt", required=True,
+                     help="coreVoltages as start:stop:step or a,b,c")
+    sub.add_argument("--strategy", choices=("grid", "hill"), default="grid",
+                     help="search every pair or hill-climb (default=grid)")
+    sub.add_argument("--settle", type=float, default=120,
+                     help="seconds to wait after each change (default=120)")
+    sub.add_argument("--samples", type=_at_least(1), default=3,
+                     help="samples averaged per trial (default=3)")
+    sub.add_argument("--max-temp", type=float, default=65,
+                     help="max ASIC temp allowed (default=65)")
+    sub.add_argument("--min-hashrate", type=float, default=0,
+                     help="min hashrate (GH/s) allowed (default=0)")
+    sub.add_argument("--workers", type=_at_least(1), default=16,
+                     help="max devices tuned at once (default=16)")
+    sub.add_argument("--save", action="store_true",
+                     help="save each best config as `{hostname}-autotune`")
+    sub.set_defaults(func=cmd_tune)
+
+    sub = commands.add_parser(
+        "simulate", parents=[common],
+        help="serve virtual AxeOS devices for testing")
+    sub.add_argument("count", type=int, help="the number of devices")
+    sub.add_argument("--host", default="127.0.0.1",
+                     help="the address to listen on (default=127.0.0.1)")
+    sub.add_argument("--base-port", type=int, default=4000,
+                     help="the port of the first device (default=4000)")
+    sub.add_argument("--aliases", action="store_true",
+                     help="give each device its own loopback address on "
+                          + "--base-port rather than its own port")
+    sub.add_argument("--latency", type=float, default=0,
+                     help="mean seconds before each response (default=0)")
+    sub.add_argument("--jitter", type=float, default=0,
+                     help="max seconds the latency varies by (default=0)")
+    sub.add_argument("--failure-rate", type=float, default=0,
+                     help="fraction of requests dropped (default=0)")
+    sub.add_argument("--restart-downtime", type=float, default=5,
+                     help="seconds a device is down after a restart "
+                          + "(default=5)")
+    sub.add_argument("--models",
+                     help="comma separated models assigned round-robin "
+                          + "(default=Supra,Gamma,NerdQ++)")
+    sub.add_argument("--seed", type=int, help="seed for repeatable runs")
+    sub.add_argument("--duration", type=float,
+                     help="seconds to serve for, else until interrupted")
+    sub.set_defaults(func=cmd_simulate)
+
+    sub = commands.add_parser(
+        "export", parents=[common],
+        help="serve device statistics for Prometheus")
+    sub.add_argument("targets", nargs='+',
+                     help="IPs, ranges (10.0.0.5-20) or CIDR blocks")
+    sub.add_argument("--host", default="127.0.0.1",
+                     help="the address to listen on (default=127.0.0.1)")
+    sub.add_argument("--port", type=int, default=9900,
+                     help="the port to listen on (default=9900)")
+    sub.add_argument("--interval", type=float, default=10,
+                     help="seconds between polls of each device (default=10)")
+    sub.add_argument("--info-interval", type=float, default=60,
+                     help="seconds between `info` fetches per device "
+                          + "(default=60)")
+    sub.add_argument("--workers", type=_at_least(1), default=64,
+                     help="max requests in flight (default=64)")
+    sub.add_argument("--duration", type=float,
+                     help="seconds to serve for, else until interrupted")
+    sub.set_defaults(func=cmd_export)
+
+    sub = commands.add_parser(
+        "device", help="manage the device registry (see `@group` targets)")
+    actions = sub.add_subparsers(dest="action", metavar="action",
+                                 required=True)
+    sub = actions.add_parser("add", parents=[common],
+                             help="register devices or update them")
+    sub.add_argument("targets", nargs='+',
+                     help="IPs, ranges, CIDR blocks or @groups")
+    sub.add_argument("--tag", action="append", default=[],
+                     help="a tag (group) to add; may be repeated")
+    sub.add_argument("--hostname", help="set the hostname")
+    sub.add_argument("--model", help="set the model")
+    sub.add_argument("--profile", help="set the assigned profile")
+    sub.add_argument("--offline", action="store_true",
+                     help="don't fetch hostnames/models from the devices")
+    sub.set_defaults(func=cmd_device_add)
+
+    sub = actions.add_parser("rm", parents=[common],
+                             help="unregister devices")
+    sub.add_argument("targets", nargs='+',
+                     help="IPs, ranges, CIDR blocks or @groups")
+    sub.set_defaults(func=cmd_device_remove)
+
+    sub = actions.add_parser("tag", parents=[common],
+                             help="add (or remove) tags on devices")
+    sub.add_argument("targets", nargs='+',
+                     help="IPs, ranges, CIDR blocks or @groups")
+    sub.add_argument("--tag", action="append", required=True,
+                     help="the tag (group); may be repeated")
+    sub.add_argument("--remove", action="store_true",
+                     help="remove the tags instead")
+    sub.set_defaults(func=cmd_device_tag)
+
+    sub = actions.add_parser("list", parents=[common],
+                             help="list registered devices")
+    sub.add_argument("targets", nargs='*',
+                     help="IPs, ranges, CIDR blocks or @groups, else all")
+    sub.add_argument("--groups", action="store_true",
+                     help="list the tags and their device counts instead")
+    sub.set_defaults(func=cmd_device_list)
+
+    sub = commands.add_parser(
+        "import", parents=[common],
+        help="import profiles in bulk from a CSV or JSONL file")
+    sub.add_argument("file", help="the file to import")
+    sub.add_argument("--format", choices=("csv", "jsonl"),
+                     help="the file format, else chosen by its extension")
+    sub.add_argument("--batch-size", type=_at_least(1), default=1000,
+                     help="rows validated at a time (default=1000)")
+    sub.add_argument("--overwrite", action="store_true",
+                     help="replace saved profiles with the same name")
+    sub.add_argument("--strict", action="store_true",
+                     help="import nothing if any row is invalid")
+    sub.add_argument("--dry-run", action="store_true",
+                     help="validate only; import nothing")
+    sub.set_defaults(func=cmd_import)
+
+    sub = commands.add_parser("discover", parents=[common],
+                              help="sweep a network for AxeOS devices")
+    sub.add_argument("cidr", help="the network to sweep (e.g. 10.0.0.0/22)")
+    sub.add_argument("--port", type=int, default=80,
+                     help="the device HTTP port (default=80)")
+    sub.set_defaults(func=cmd_discover)
+    return parser
+
+
+def run(argv: list[str]) -> int:
+    """Run a headless subcommand and return its exit code.
+
+    Args:
+        argv: The command line arguments (excluding the program name).
+    """
+    args = build_parser().parse_args(argv)
+    if not args.command:
+        build_parser().print_help()
+        return 2
+    try:
+        return args.func(args)
+    except AssertionError:
+        _output({"error": "Invalid profile directory configuration"},
+                args.pretty)
+        return 1
@@ -0,0 +1,63 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+
+import json
+from os import environ, path, mkdir
+
+
+# program root; `AXEPROF_ROOT` may point the config/profiles elsewhere
+ROOT = environ.get("AXEPROF_ROOT") or __file__.split("src")[0]
+
+
+def load_config(root: str = ROOT) -> dict[str, str]:
+    """Read and return the program config, creating any missing defaults.
+
+    The config is read from `{root}.config`. If the file or its `profile_dir`
+    is missing, the default (`{root}.profiles/`) is written and the directory
+    is created.
+
+    Args:
+        root: The program root directory (default=ROOT).
+
+    Returns:
+        The program config.
+
+    Raises:
+        AssertionError: if the configured `profile_dir` is invalid.
+    """
+    config_path = f"{root}.config"
+    if path.exists(config_path):
+        with open(config_path, 'r') as f:
+            config = json.loads(f.read())
+    else:
+        config = {}
+
+    if not config.get("profile_dir"):
+        # Add default profile_dir to config
+        config["profile_dir"] = f"{root}.profiles/"
+        with open(config_path, 'w') as f:
+            f.write(json.dumps(config, indent=4))
+
+    profile_dir = config["profile_dir"]
+    assert isinstance(profile_dir, str)
+
+    # Ensure existing profile_dir
+    if not path.exists(profile_dir):
+        mkdir(profile_dir)
+    return config
@@ -0,0 +1,117 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+import ipaddress
+from typing import TypeAlias
+
+from axeprofiler.aio import AsyncClient
+from axeprofiler.fleet import MAX_TARGETS
+
+
+DEVICE: TypeAlias = dict[str, str | int | None]  # inventory entry format
+INVENTORY_KEYS = ("hostname", "frequency", "coreVoltage", "fanspeed")
+
+
+async def _port_open(host: str, port: int, timeout: float) -> bool:
+    """Return True if a TCP connection to the host/port succeeds in time."""
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout)
+    except (OSError, TimeoutError):
+        return False
+    writer.close()
+    return True
+
+
+async def _probe(client: AsyncClient, ip: str, port: int,
+                 probe_timeout: float) -> DEVICE | None:
+    """Return an inventory entry if the IP is running AxeOS else `None`."""
+    if not await _port_open(ip, port, probe_timeout):
+        return None
+    try:
+        target = ip if port == 80 else f"{ip}:{port}"
+        data = (await client.request(target, "info")).json()
+    except Exception:
+        return None
+    if not isinstance(data, dict) or not data.keys() >= {"hostname",
+                                                          "frequency"}:
+        return None  # Something is listening, but it isn't AxeOS
+
+    device: DEVICE = {"ip": ip}
+    device["model"] = data.get("deviceModel") or data.get("ASICModel")
+    device.update({key: data.get(key) for key in INVENTORY_KEYS})
+    return device
+
+
+async def discover_async(cidr: str, port: int = 80, concurrency: int = 512,
+                         probe_timeout: float = 0.3,
+                         info_timeout: float = 2,
+                         max_hosts: int = MAX_TARGETS) -> list[DEVICE]:
+    """Sweep an IPv4 network for AxeOS devices and return an inventory.
+
+    Every host in the network is first checked with a quick TCP connect to
+    the HTTP port; only hosts that answer are then confirmed by hitting the
+    `info` route. Hosts are handed out to `concurrency` workers as they go,
+    so memory use doesn't grow with the size of the network.
+
+    Args:
+        cidr: The network to sweep (e.g. `192.168.1.0/22`).
+        port: The HTTP port of the devices (default=80).
+        concurrency: The max number of probes in flight (default=512).
+        probe_timeout: Seconds to wait for the TCP pre-check (default=0.3).
+        info_timeout: Seconds to wait for the `info` route (default=2).
+        max_hosts: The max number of addrs the network may hold
+            (default=MAX_TARGETS).
+
+    Returns:
+        A list of inventory entries sorted by IP.
+
+    Raises:
+        ValueError: if `cidr` is not a valid IPv4 network, it's larger than
+            `max_hosts` or `concurrency` is less than 1.
+    """
+    network = ipaddress.ip_network(cidr, strict=False)
+    if network.version != 4:
+        raise ValueError(f"Not an IPv4 network: {cidr}")
+    if network.num_addresses > max_hosts:
+        raise ValueError(f"Network too large: {cidr} (max {max_hosts} addrs)")
+    if concurrency < 1:
+        raise ValueError("`concurrency` must be at least 1")
+
+    hosts = iter(network.hosts() if network.num_addresses > 2 else network)
+    client = AsyncClient(limit=concurrency, connect_timeout=probe_timeout,
+                         read_timeout=info_timeout)
+    devices: list[DEVICE] = []
+
+    async def _worker() -> None:
+        # NOTE: workers share the one iterator, so each host is probed once
+        for ip in hosts:
+            if device := await _probe(client, str(ip), port, probe_timeout):
+                devices.append(device)
+
+    await asyncio.gather(*(_worker() for _ in range(
+        min(concurrency, network.num_addresses))))
+    return sorted(devices,
+                  key=lambda device: ipaddress.ip_address(device["ip"]))
+
+
+def discover(cidr: str, **kwargs) -> list[DEVICE]:
+    """Blocking wrapper for `discover_async()`."""
+    return asyncio.run(discover_async(cidr, **kwargs))
@@ -0,0 +1,342 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Prometheus/OpenMetrics exporter for a fleet of AxeOS devices. A `Poller`
+# samples the `statistics` (and periodically `info`) route of every device in
+# the background, and a render thread turns the latest readings into response
+# bodies (Prometheus text and OpenMetrics, plain and gzipped) whenever they
+# change. Scrapes of `/metrics` only ever copy out the last rendered body, so
+# they never touch the devices and cost the same whether the fleet is 10 or
+# 1,000 miners (apart from the size of the body itself).
+#   $ axeprof export 10.0.0.0/24 --port 9900
+
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import TypeAlias
+
+from axeprofiler.telemetry import Poller
+from axeprofiler.timeseries import ALIASES, SAMPLE, SeriesStore
+
+
+# (name, type, help, [(label set, value)]) of a metric family
+FAMILY: TypeAlias = tuple[str, str, str, list[tuple[str, float]]]
+PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+SAMPLE_METRICS = {  # `statistics` column: (metric, type, help)
+    "hashrate": ("axeos_hashrate_ghs", "gauge", "Hashrate (GH/s)"),
+    "asicTemp": ("axeos_asic_temp_celsius", "gauge", "ASIC temperature (C)"),
+    "vrTemp": ("axeos_vr_temp_celsius", "gauge",
+               "Voltage regulator temperature (C)"),
+    "power": ("axeos_power_watts", "gauge", "Power draw (W)"),
+    "voltage": ("axeos_input_voltage_millivolts", "gauge",
+                "Input voltage (mV)"),
+    "fanrpm": ("axeos_fan_rpm", "gauge", "Fan speed (RPM)")
+}
+INFO_METRICS = {  # `info` key: (metric, type, help)
+    "frequency": ("axeos_frequency_mhz", "gauge", "ASIC frequency (MHz)"),
+    "coreVoltage": ("axeos_core_voltage_millivolts", "gauge",
+                    "Configured ASIC core voltage (mV)"),
+    "coreVoltageActual": ("axeos_core_voltage_actual_millivolts", "gauge",
+                          "Measured ASIC core voltage (mV)"),
+    "fanspeed": ("axeos_fanspeed_percent", "gauge", "Fan speed setting (%)"),
+    "expectedHashrate": ("axeos_expected_hashrate_ghs", "gauge",
+                         "Expected hashrate at the frequency (GH/s)"),
+    "uptimeSeconds": ("axeos_uptime_seconds", "gauge",
+                      "Seconds since the device booted"),
+    "sharesAccepted": ("axeos_shares_accepted", "counter",
+                       "Shares accepted by the pool since boot"),
+    "sharesRejected": ("axeos_shares_rejected", "counter",
+                       "Shares rejected by the pool since boot")
+}
+INFO_LABELS = {  # `info` key: label on `axeos_device_info`
+    "hostname": "hostname",
+    "deviceModel": "model",
+    "ASICModel": "asic_model",
+    "version": "version"
+}
+INDEX = b"<html><body><a href=\"/metrics\">/metrics</a></body></html>\n"
+
+
+def _labels(**labels: str) -> str:
+    """Return a label set, e.g. `{ip="10.0.0.5"}`."""
+    return '{' + ','.join(
+        '{}="{}"'.format(label, str(value).replace('\\', r'\\')
+                         .replace('"', r'\"').replace('\n', r'\n'))
+        for label, value in labels.items()) + '}'
+
+
+def _format(families: list[FAMILY], openmetrics: bool = False) -> bytes:
+    """Return metric families in the Prometheus text or OpenMetrics format.
+
+    Counter samples are suffixed with `_total`; the Prometheus format names
+    the family the same as its samples, while OpenMetrics drops the suffix
+    and ends the exposition with `# EOF`.
+    """
+    lines = []
+    for name, kind, description, samples in families:
+        sample_name = f"{name}_total" if kind == "counter" else name
+        family = name if openmetrics else sample_name
+        lines += [f"# HELP {family} {description}", f"# TYPE {family} {kind}"]
+        lines += [f"{sample_name}{labels} {float(value)!r}"
+                  for labels, value in samples]
+    if openmetrics:
+        lines.append("# EOF")
+    return ('\n'.join(lines) + '\n').encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve the last rendered response of `server.exporter`."""
+    protocol_version = "HTTP/1.1"  # keep-alive for repeat scrapes
+    disable_nagle_algorithm = True  # headers and body are written separately
+
+    def do_GET(self) -> None:
+        route = self.path.split('?')[0]
+        headers = {}
+        if route == "/metrics":
+            status = 200
+            content_type, body, compressed = self.server.exporter.response(
+                "application/openmetrics-text" in self.headers.get("Accept",
+                                                                   ''),
+                "gzip" in self.headers.get("Accept-Encoding", ''))
+            if compressed:
+                headers["Content-Encoding"] = "gzip"
+        elif route == '/':
+            status, content_type, body = 200, "text/html", INDEX
+        else:
+            status, content_type, body = 404, "text/plain", b"Not Found\n"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass  # NOTE: scrapes are too frequent to log
+
+
+class Exporter():
+    """
+    Serve the statistics of many devices on a `/metrics` HTTP endpoint.
+
+    Args:
+        ips: The IP addrs of the devices to export.
+        host: The address to listen on (default="127.0.0.1").
+        port: The port to listen on, 0 for any free port (default=9900).
+        interval: Seconds between polls of each device (default=10).
+        info_interval: Seconds between `info` fetches per device
+            (default=60).
+        max_sockets: The max number of device requests in flight
+            (default=64).
+        render_interval: Seconds between re-renders of the response (only
+            if a reading changed) (default=1).
+
+    Methods:
+        render: Render the response bodies from the latest readings.
+        response: Return the last rendered response for a scrape.
+        start: Start polling and serving on background threads.
+        join: Block until the exporter stops.
+        stop: Stop serving and polling.
+    """
+    def __init__(self, ips: list[str], host: str = "127.0.0.1",
+                 port: int = 9900, interval: float = 10,
+                 info_interval: float = 60, max_sockets: int = 64,
+                 render_interval: float = 1):
+        self._ips = [*ips]
+        self._host = host
+        self._port = port
+        self._render_interval = render_interval
+        self._changed = Event()
+        self._stopped = Event()
+        # ip: (timestamp, sample) of the latest poll
+        self._samples: dict[str, tuple[float, SAMPLE]] = {}
+        # NOTE: only the latest sample of each device is needed, so the
+        # poller's own store is kept to a single (float32) row per device
+        self._poller = Poller(self._ips, interval=interval,
+                              max_sockets=max_sockets, endpoint="statistics",
+                              info_interval=info_interval,
+                              store=SeriesStore(tiers={"raw": (1, 0)}),
+                              on_sample=self._on_sample,
+                              on_info=lambda *_: self._changed.set(),
+                              on_error=lambda *_: self._changed.set())
+        # (openmetrics, gzip): (content type, body)
+        self._responses: dict[tuple[bool, bool], tuple[str, bytes]] = {}
+        self._render_seconds = 0.0
+        self._scrapes = 0
+        self._lock = Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._threads: list[Thread] = []
+
+    def __repr__(self):
+        return f"Exporter({len(self._ips)} devices, {self._host}:{self._port})"
+
+    @property
+    def poller(self) -> Poller:
+        """Return the device poller."""
+        return self._poller
+
+    @property
+    def url(self) -> str:
+        """Return the URL of the metrics endpoint."""
+        host, port = (self._server.server_address[:2] if self._server
+                      else (self._host, self._port))
+        return f"http://{host}:{port}/metrics"
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        """Return the poller stats, scrapes served and last render seconds."""
+        return {**self._poller.stats, "scrapes": self._scrapes,
+                "render_seconds": round(self._render_seconds, 6)}
+
+    def _on_sample(self, ip: str, timestamp: float, sample: SAMPLE) -> None:
+        """Keep the latest sample of a device and flag a re-render."""
+        self._samples[ip] = (timestamp, {ALIASES.get(key, key): value
+                                         for key, value in sample.items()})
+        self._changed.set()
+
+    def _families(self) -> list[FAMILY]:
+        """Return the metric families for the latest readings."""
+        errors = self._poller.errors
+        up, info, timestamps = [], [], []
+        samples = {column: [] for column in SAMPLE_METRICS}
+        details = {key: [] for key in INFO_METRICS}
+
+        for ip in self._ips:
+            labels = _labels(ip=ip)
+            latest = None if ip in errors else self._samples.get(ip)
+            up.append((labels, 1 if latest else 0))
+            if (document := self._poller.info(ip)) is not None:
+                info.append((_labels(ip=ip, **{
+                    label: document.get(key, '')
+                    for key, label in INFO_LABELS.items()}), 1))
+            if not latest:
+                continue
+
+            timestamp, sample = latest
+            timestamps.append((labels, timestamp))
+            for column, series in samples.items():
+                if (value := sample.get(column)) is not None:
+                    series.append((labels, value))
+            for key, series in details.items():
+                value = (document or {}).get(key)
+                if isinstance(value, (int, float)):
+                    series.append((labels, value))
+
+        stats = self._poller.stats
+        return [
+            ("axeos_up", "gauge", "1 if the last poll succeeded", up),
+            ("axeos_device_info", "gauge", "Device details", info),
+            ("axeos_last_sample_timestamp_seconds", "gauge",
+             "Unix time of the latest sample", timestamps),
+            *((*SAMPLE_METRICS[column], series)
+              for column, series in samples.items()),
+            *((*INFO_METRICS[key], series) for key, series in details.items()),
+            ("axeprof_exporter_devices", "gauge", "Devices exported",
+             [('', len(self._ips))]),
+            ("axeprof_exporter_polls", "counter", "Device polls made",
+             [('', stats["polls"])]),
+            ("axeprof_exporter_poll_errors", "counter", "Device polls failed",
+             [('', stats["errors"])]),
+            ("axeprof_exporter_polls_skipped", "counter",
+             "Device polls skipped (in flight or over budget)",
+             [('', stats["skipped"])]),
+            ("axeprof_exporter_received_bytes", "counter",
+             "Response bytes received from devices", [('', stats["bytes"])]),
+            ("axeprof_exporter_render_seconds", "gauge",
+             "Seconds the previous render took",
+             [('', self._render_seconds)])
+        ]
+
+    def render(self) -> None:
+        """Render the response bodies from the latest readings."""
+        start = perf_counter()
+        families = self._families()
+        responses = {}
+        for openmetrics, content_type in ((False, PROMETHEUS),
+                                          (True, OPENMETRICS)):
+            body = _format(families, openmetrics)
+            responses[openmetrics, False] = (content_type, body)
+            responses[openmetrics, True] = (content_type,
+                                            gzip.compress(body, 1))
+        self._responses = responses  # NOTE: swapped whole; no lock needed
+        self._render_seconds = perf_counter() - start
+
+    def response(self, openmetrics: bool = False,
+                 compressed: bool = False) -> tuple[str, bytes, bool]:
+        """Return the last rendered response.
+
+        Args:
+            openmetrics: Return the OpenMetrics format, else the Prometheus
+                text format (default=False).
+            compressed: Return the gzipped body (default=False).
+
+        Returns:
+            The content type, body and whether the body is gzipped.
+        """
+        with self._lock:
+            self._scrapes += 1
+        content_type, body = self._responses[openmetrics, compressed]
+        return content_type, body, compressed
+
+    def _render_loop(self) -> None:
+        """Re-render every `render_interval` while readings change."""
+        while not self._stopped.wait(self._render_interval):
+            if self._changed.is_set():
+                self._changed.clear()
+                self.render()
+
+    def start(self) -> None:
+        """Start polling, rendering and serving on background threads.
+
+        Raises:
+            OSError: if the address can't be bound.
+        """
+        self._server = ThreadingHTTPServer((self._host, self._port), _Handler)
+        self._server.daemon_threads = True
+        self._server.exporter = self
+        self.render()  # serve every device as down until its first poll
+        self._stopped.clear()
+        self._poller.start()
+        self._threads = [
+            Thread(target=self._render_loop, name="axeprof-render",
+                   daemon=True),
+            Thread(target=self._server.serve_forever, name="axeprof-export",
+                   daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Block until the exporter stops (or the timeout passes)."""
+        self._stopped.wait(timeout)
+
+    def stop(self) -> None:
+        """Stop serving, rendering and polling."""
+        self._stopped.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join(5)
+        self._threads = []
+        self._poller.stop()
@@ -0,0 +1,299 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+
+import ipaddress
+from threading import Event, Lock
+from time import monotonic, perf_counter, sleep
+from typing import Callable, TypeAlias
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from requests import ConnectionError, HTTPError, Timeout
+
+from axeprofiler import metrics, profiling
+from axeprofiler.api import get_client, host_state, request
+from axeprofiler.profiles import RESTART_SETTINGS, Profile
+from axeprofiler.registry import DeviceRegistry, get_registry
+
+
+RESULT: TypeAlias = dict[str, str | float | bool | None]  # per-device result
+MAX_WORKERS = 32  # default size of the worker pool
+MAX_RESTARTS = 4  # default max devices restarting at once in a rollout
+HEALTH_TIMEOUT = 300  # default seconds for a restarted device to recover
+MAX_TARGETS = 65536  # default max addrs a range/CIDR block may expand to
+
+
+def _ipv4(addr: str) -> ipaddress.IPv4Address | None:
+    """Return the addr as an `IPv4Address`, else None."""
+    try:
+        return ipaddress.IPv4Address(addr)
+    except ValueError:
+        return None
+
+
+def expand_targets(targets: str, registry: DeviceRegistry | None = None,
+                   max_targets: int = MAX_TARGETS) -> list[str]:
+    """Expand a string of target devices into a list of unique IP addrs.
+
+    Targets are comma (or whitespace) separated and may be given as a single
+    IP (`10.0.0.5`), a last-octet range (`10.0.0.5-20`), a full range
+    (`10.0.0.5-10.0.0.40`), a CIDR block (`10.0.0.0/24`) or a group of
+    registered devices (`@rack-3`, `@model=Gamma`; see
+    `DeviceRegistry.resolve()`). Anything that isn't an IPv4 addr or range
+    (e.g. `bitaxe-01.local`) is passed through as-is.
+
+    Args:
+        targets: The string of targets to expand.
+        registry: The registry groups are resolved from, else the default
+            registry (default=None).
+        max_targets: The max addrs a single range or CIDR block may expand
+            to (default=MAX_TARGETS).
+
+    Returns:
+        A list of target addrs in the order they were given.
+
+    Raises:
+        ValueError: if a range, CIDR block or group is malformed or too
+            large, or a group has no devices.
+    """
+    ips: dict[str, None] = {}  # dict retains order while removing dupes
+
+    for target in targets.replace(',', ' ').split():
+        if target.startswith('@'):
+            if registry is None:
+                registry = get_registry()
+            ips.update((ip, None) for ip in registry.resolve(target))
+        elif '/' in target:
+            network = ipaddress.ip_network(target, strict=False)
+            if network.num_addresses > max_targets:
+                raise ValueError(f"CIDR block too large: {target} "
+                                 + f"(max {max_targets} addrs)")
+            hosts = network.hosts() if network.num_addresses > 2 else network
+            ips.update((str(ip), None) for ip in hosts)
+        elif '-' in target and (first := _ipv4(target.split('-', 1)[0])):
+            start, end = target.split('-', 1)
+            if '.' not in end:  # last-octet shorthand
+                end = f"{start.rsplit('.', 1)[0]}.{end}"
+            last = ipaddress.IPv4Address(end)
+            if last < first:
+                raise ValueError(f"Invalid IP range: {target}")
+            if int(last) - int(first) + 1 > max_targets:
+                raise ValueError(f"IP range too large: {target} "
+                                 + f"(max {max_targets} addrs)")
+            ips.update(
+                (str(ipaddress.IPv4Address(ip)), None)
+                for ip in range(int(first), int(last) + 1)
+            )
+        else:
+            ips[target] = None
+    return [*ips]
+
+
+@profiling.traced("fleet.apply_device")
+def _apply(profile: Profile, ip: str, force: bool = False) -> RESULT:
+    """Apply the profile to a single device and return the result.
+
+    Errors are caught and reported in the result rather than raised so that a
+    single bad device can't interrupt the rest of the fleet. Devices already
+    running the profile are reported as `unchanged` (see
+    `Profile.run_profile()`).
+    """
+    result: RESULT = {"ip": ip, "status": "success", "error": None,
+                      "restarted": False}
+    start = perf_counter()
+    try:
+        changes = profile.run_profile(ip, force=force)
+        result["restarted"] = bool(changes.keys() & RESTART_SETTINGS)
+        if not changes:
+            result["status"] = "unchanged"
+    except Timeout as te:
+        result.update({"status": "timeout", "error": str(te)})
+    except HTTPError as httpe:
+        result.update({"status": "http_error", "error": str(httpe)})
+    except ConnectionError as conne:
+        result.update({"status": "connection_error", "error": str(conne)})
+    except Exception as e:
+        result.update({"status": "error", "error": str(e)})
+    result["latency"] = round(perf_counter() - start, 3)
+    return result
+
+
+def apply_profile(profile: Profile, ips: list[str],
+                  max_workers: int = MAX_WORKERS,
+                  on_result: Callable[[RESULT], None] | None = None,
+                  force: bool = False) -> list[RESULT]:
+    """Apply a profile to many devices concurrently.
+
+    The GET + PATCH + restart calls for each device are fanned out across a
+    bounded pool of worker threads, so a slow or dead device only occupies its
+    own worker until it times out.
+
+    Args:
+        profile: The `Profile` to apply.
+        ips: The IP addrs of the devices to apply the profile to.
+        max_workers: The max number of devices to apply to at once
+            (default=32).
+        on_result: Optional callback for each result as it completes
+            (default=None).
+        force: Send every setting and restart, even to devices already
+            running the profile (default=False).
+
+    Returns:
+        A list of per-device results in the same order as `ips`.
+    """
+    results: dict[str, RESULT] = {}
+    if not ips:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ips))) as pool:
+        futures = [pool.submit(_apply, profile, ip, force) for ip in ips]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["ip"]] = result
+            if on_result:
+                on_result(result)
+    return [results[ip] for ip in ips]
+
+
+@profiling.traced("fleet.wait_healthy")
+def wait_healthy(ip: str, since: float, timeout: float = HEALTH_TIMEOUT,
+                 interval: float = 5, min_hashrate: float = 1,
+                 hashrate_ratio: float = 0.5) -> str | None:
+    """Wait for a restarted device to come back and hash at a sane rate.
+
+    A device is healthy once its `info` route responds, its uptime shows it
+    actually restarted (at or after `since`), and its hashrate is at least
+    `hashrate_ratio` of the expected hashrate reported by the firmware (or
+    `min_hashrate` if it doesn't report one). The device is expected to be
+    down for a while, so its circuit (see `api.CircuitBreaker`) is reset
+    before each check rather than left to open.
+
+    Args:
+        ip: The IP of the device.
+        since: When the device was restarted (`time.monotonic()`).
+        timeout: Seconds to wait for the device (default=300).
+        interval: Seconds between checks (default=5).
+        min_hashrate: The min hashrate (GH/s) allowed (default=1).
+        hashrate_ratio: The min fraction of `expectedHashrate` allowed
+            (default=0.5).
+
+    Returns:
+        None if the device is healthy, else the reason it isn't.
+    """
+    deadline = since + timeout
+    while True:
+        sleep(interval)
+        get_client().breaker.reset(ip)
+        try:
+            info = request(ip, "info").json()
+        except Exception as e:
+            reason = f"unreachable ({str(e) or type(e).__name__})"
+        else:
+            uptime = info.get("uptimeSeconds")
+            hashrate = info.get("hashRate") or 0
+            expected = info.get("expectedHashrate")
+            floor = expected * hashrate_ratio if expected else min_hashrate
+            if uptime is not None and uptime > monotonic() - since + interval:
+                reason = "device did not restart"
+            elif hashrate < floor:
+                reason = f"hashrate {hashrate:.1f} < {floor:.1f} GH/s"
+            else:
+                metrics.observe("axeprof_restart_recovery_seconds",
+                                monotonic() - since)
+                return None
+        if monotonic() >= deadline:
+            return f"Unhealthy after {timeout}s: {reason}"
+
+
+def rolling_apply(profile: Profile, ips: list[str],
+                  max_restarts: int = MAX_RESTARTS,
+                  max_failure_rate: float = 0.1,
+                  on_result: Callable[[RESULT], None] | None = None,
+                  force: bool = False, **health) -> list[RESULT]:
+    """Apply a profile to many devices without restarting them all at once.
+
+    At most `max_restarts` devices are worked on at a time. Each device that
+    restarts keeps its slot until it's back and healthy (see
+    `wait_healthy()`), so the rest of the fleet keeps hashing. Devices that
+    are already compliant (or only had their fan speed changed) free their
+    slot right away.
+
+    Once more than `max_failure_rate` of the devices have failed (including
+    unhealthy restarts), the rollout is aborted: devices not yet started are
+    reported as `skipped`. Devices already known to be down (their circuit is
+    open, see `api.CircuitBreaker`) are routed around and reported as
+    `circuit_open` without counting as failures.
+
+    Args:
+        profile: The `Profile` to apply.
+        ips: The IP addrs of the devices to apply the profile to.
+        max_restarts: The max number of devices in flight (default=4).
+        max_failure_rate: The fraction of devices allowed to fail before the
+            rollout is aborted (default=0.1).
+        on_result: Optional callback for each result as it completes
+            (default=None).
+        force: Send every setting and restart, even to devices already
+            running the profile (default=False).
+        **health: Passed to `wait_healthy()`.
+
+    Returns:
+        A list of per-device results in the same order as `ips`.
+
+    Raises:
+        ValueError: if `max_restarts` is less than 1.
+    """
+    if max_restarts < 1:
+        raise ValueError("`max_restarts` must be at least 1")
+    aborted = Event()
+    lock = Lock()
+    failures = [0]
+    max_failures = max_failure_rate * len(ips)
+
+    def _roll(ip: str) -> RESULT:
+        if aborted.is_set():
+            return {"ip": ip, "status": "skipped", "error": "Rollout aborted",
+                    "restarted": False, "latency": 0}
+        if host_state(ip) == "open":
+            return {"ip": ip, "status": "circuit_open",
+                    "error": "Device is known to be down",
+                    "restarted": False, "latency": 0}
+        since = monotonic()
+        result = _apply(profile, ip, force)
+        if result["restarted"] and (
+                error := wait_healthy(ip, since, **health)):
+            result.update({"status": "unhealthy", "error": error})
+        result["latency"] = round(monotonic() - since, 3)
+        if result["status"] not in ("success", "unchanged", "circuit_open"):
+            with lock:
+                failures[0] += 1
+                if failures[0] > max_failures:
+                    aborted.set()
+        return result
+
+    results: dict[str, RESULT] = {}
+    if not ips:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_restarts, len(ips))) as pool:
+        futures = [pool.submit(_roll, ip) for ip in ips]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["ip"]] = result
+            if on_result:
+                on_result(result)
+    return [results[ip] for ip in ips]
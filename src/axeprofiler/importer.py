@@ -0,0 +1,195 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Bulk profile import from CSV or JSONL files. Rows are streamed from the file
+# and validated a batch at a time; every problem with a row is reported (not
+# just the first), and the valid profiles are written to the store with a
+# single `save_many()` at the end. e.g. a spreadsheet exported as CSV:
+#   profile_name,hostname,frequency,coreVoltage,fanspeed
+#   rack3-01,bitaxe-01,525,1150,60
+#   $ axeprof import profiles.csv
+
+import csv
+import json
+from itertools import islice
+from typing import Iterator, TypeAlias
+
+from axeprofiler.profiles import SETTINGS, Profile
+from axeprofiler.store import DirectoryStore, SQLiteStore
+
+
+ROW: TypeAlias = tuple[int, dict | None, str | None]  # line, data, parse error
+ROW_ERROR: TypeAlias = dict[str, int | str | list[str] | None]  # report entry
+FORMATS = ("csv", "jsonl")
+BATCH_SIZE = 1000  # default rows validated per batch
+
+
+def read_rows(filepath: str, fmt: str | None = None) -> Iterator[ROW]:
+    """Stream the rows of a CSV (with a header row) or JSONL file.
+
+    Args:
+        filepath: The file to read.
+        fmt: `csv` or `jsonl`, else chosen by the file extension
+            (default=None).
+
+    Yields:
+        (line number, row data or None, parse error or None) for each
+        non-blank row.
+
+    Raises:
+        ValueError: if the format is unknown.
+    """
+    fmt = fmt or filepath.rsplit('.', 1)[-1].lower()
+    fmt = "jsonl" if fmt in ("json", "ndjson") else fmt
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+    # NOTE: `utf-8-sig` drops the BOM that spreadsheet CSV exports often start
+    # with (which would otherwise end up in the first header)
+    encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+    with open(filepath, 'r', newline='', encoding=encoding) as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                # NOTE: blank cells are treated as missing fields
+                yield reader.line_num, {key.strip(): value for key, value
+                                        in row.items() if key and value}, None
+            return
+
+        for line_num, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError as ve:
+                yield line_num, None, f"Invalid JSON: {ve}"
+                continue
+            if isinstance(data, dict):
+                yield line_num, data, None
+            else:
+                yield line_num, None, "Row is not a JSON object"
+
+
+def validate_row(data: dict) -> tuple[dict | None, list[str]]:
+    """Validate a single row, collecting every problem with it.
+
+    The rules are those of `Profile.check_profile_data()`, except text is
+    stripped of surrounding whitespace, settings may be given as integer
+    strings (as in CSV files) and profile names may not contain `/`.
+
+    Args:
+        data: The row data.
+
+    Returns:
+        The validated profile data (else None) and a list of errors.
+    """
+    row = {key: value.strip() if isinstance(value, str) else value
+           for key, value in data.items()}
+    for field in SETTINGS:
+        if isinstance(value := row.get(field), str):
+            try:
+                row[field] = int(value)
+            except ValueError:
+                pass  # NOTE: left for the type check to report
+    profile_data, errors = Profile.check_profile_data(row)
+    if '/' in profile_data.get("profile_name", ''):
+        errors.append("`profile_name` may not contain `/`")
+    return (None, errors) if errors else (profile_data, [])
+
+
+def validate_batch(
+        rows: list[ROW], seen: set[str],
+        saved: set[str]) -> tuple[list[Profile], list[ROW_ERROR]]:
+    """Validate a batch of rows.
+
+    Args:
+        rows: The rows to validate (see `read_rows()`).
+        seen: The names of the valid rows so far; updated with this batch.
+        saved: The names that may not be imported (already saved).
+
+    Returns:
+        The valid profiles and an error entry for each invalid row.
+    """
+    profiles, errors = [], []
+    for line_num, data, parse_error in rows:
+        if parse_error:
+            errors.append({"line": line_num, "profile_name": None,
+                           "errors": [parse_error]})
+            continue
+
+        profile_data, problems = validate_row(data)
+        name = profile_data["profile_name"] if profile_data else None
+        if name in saved:
+            problems.append(f"Profile already exists: {name}")
+        elif name in seen:
+            problems.append(f"Duplicate `profile_name` in file: {name}")
+        if problems:
+            errors.append({"line": line_num,
+                           "profile_name": data.get("profile_name"),
+                           "errors": problems})
+            continue
+        seen.add(name)
+        profiles.append(Profile(**profile_data))
+    return profiles, errors
+
+
+def import_profiles(filepath: str, store: DirectoryStore | SQLiteStore,
+                    fmt: str | None = None,
+                    batch_size: int = BATCH_SIZE, overwrite: bool = False,
+                    strict: bool = False, dry_run: bool = False) -> dict:
+    """Import the profiles in a CSV or JSONL file into a profile store.
+
+    Args:
+        filepath: The file to import.
+        store: The profile store (see `store.open_store()`).
+        fmt: `csv` or `jsonl`, else chosen by the file extension
+            (default=None).
+        batch_size: The number of rows validated at a time (default=1000).
+        overwrite: Replace saved profiles with the same name (default=False).
+        strict: Import nothing if any row is invalid (default=False).
+        dry_run: Validate only; import nothing (default=False).
+
+    Returns:
+        A report of the `rows` read, profiles `imported` and `errors`.
+
+    Raises:
+        ValueError: if the format is unknown or `batch_size` is less than 1.
+        OSError: if the file can't be read.
+    """
+    if batch_size < 1:
+        raise ValueError("`batch_size` must be at least 1")
+    # NOTE: saved names are read once up front rather than checked per row
+    saved = set() if overwrite else set(store.names())
+    seen: set[str] = set()
+    valid: list[Profile] = []
+    errors: list[ROW_ERROR] = []
+    count = 0
+
+    rows = read_rows(filepath, fmt)
+    while batch := [*islice(rows, batch_size)]:
+        count += len(batch)
+        profiles, batch_errors = validate_batch(batch, seen, saved)
+        valid += profiles
+        errors += batch_errors
+
+    imported = 0
+    if valid and not dry_run and not (strict and errors):
+        imported = store.save_many(valid)
+    return {"rows": count, "valid": len(valid), "imported": imported,
+            "errors": errors}
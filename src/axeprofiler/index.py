@@ -0,0 +1,187 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+
+import json
+from os import scandir, stat
+from threading import Lock
+
+from axeprofiler.profiles import Profile
+
+
+class ProfileIndex():
+    """
+    In-memory index of the profiles saved in a profile directory.
+
+    The directory is scanned for `.json` files and each parsed `Profile` is
+    cached along with the (mtime, size) of its file. Later lookups only re-read
+    a file if its mtime or size has changed, so rendering menus and pages
+    doesn't re-parse every profile on disk. The directory itself is only
+    re-scanned when its mtime changes (i.e. a profile is added, removed or
+    renamed), and the sorted listing is cached between scans, so counting and
+    paging profiles doesn't touch every file either.
+
+    Args:
+        profile_dir: The directory where profiles are saved.
+
+    Methods:
+        refresh: Sync the index with the files in the profile directory.
+        page: Return a slice of the sorted profile filenames.
+        get: Return the `Profile` for a profile file.
+        warm: Parse any new or changed profiles ahead of use.
+        invalidate: Drop cached profiles so they are re-read on next use.
+    """
+    def __init__(self, profile_dir: str):
+        self._profile_dir = profile_dir
+        self._stats: dict[str, tuple[int, int]] = {}  # filename: (mtime, size)
+        self._profiles: dict[str, tuple[tuple[int, int], Profile]] = {}
+        self._dir_mtime: int | None = None  # directory mtime at last scan
+        self._sorted: list[str] | None = None  # cached sorted filenames
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f"ProfileIndex({self._profile_dir})"
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._stats)
+
+    def __contains__(self, filename: str) -> bool:
+        self.refresh()
+        return filename in self._stats
+
+    @property
+    def profile_dir(self) -> str:
+        """Return the directory being indexed."""
+        return self._profile_dir
+
+    @property
+    def names(self) -> list[str]:
+        """Return a sorted list of the indexed profile filenames."""
+        return self.page()
+
+    def page(self, offset: int = 0, limit: int | None = None) -> list[str]:
+        """Return a slice of the sorted profile filenames.
+
+        Args:
+            offset: The number of filenames to skip (default=0).
+            limit: The max number of filenames to return, else all
+                (default=None).
+        """
+        self.refresh()
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(self._stats)
+            stop = None if limit is None else offset + limit
+            return self._sorted[offset:stop]
+
+    def refresh(self, force: bool = False) -> None:
+        """Sync the index with the files in the profile directory.
+
+        The directory is only scanned if its mtime changed since the last
+        scan. Only file metadata is read here; cached profiles for removed
+        files are dropped and changed files are lazily re-parsed by `get()`.
+
+        Args:
+            force: Scan even if the directory looks unchanged
+                (default=False).
+        """
+        dir_mtime = stat(self._profile_dir).st_mtime_ns
+        # NOTE: a change made within the mtime granularity of the last scan
+        # can't be seen here; `warm()` (run by the Refresher) always rescans
+        if not force and dir_mtime == self._dir_mtime:
+            return
+
+        stats = {}
+        with scandir(self._profile_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    st = entry.stat()
+                    stats[entry.name] = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            if stats.keys() != self._stats.keys():
+                self._sorted = None
+            self._stats = stats
+            self._dir_mtime = dir_mtime
+            for filename in self._profiles.keys() - stats.keys():
+                del self._profiles[filename]
+
+    def get(self, filename: str) -> Profile:
+        """Return the `Profile` for the given profile file.
+
+        Args:
+            filename: The profile filename (e.g. `Default.json`).
+
+        Returns:
+            The cached `Profile` if the file is unchanged else a freshly
+            parsed one.
+
+        Raises:
+            FileNotFoundError: if no file is found for the given name.
+            AttributeError: if the file does not contain a valid profile.
+        """
+        st = stat(f"{self._profile_dir}{filename}")
+        stat_key = (st.st_mtime_ns, st.st_size)
+
+        cached = self._profiles.get(filename)
+        if cached and cached[0] == stat_key:
+            return cached[1]
+
+        with open(f"{self._profile_dir}{filename}", 'r') as f:
+            profile = Profile.create_profile(json.loads(f.read()))
+        with self._lock:
+            if filename not in self._stats:
+                self._sorted = None
+            self._stats[filename] = stat_key
+            self._profiles[filename] = (stat_key, profile)
+        return profile
+
+    def warm(self) -> None:
+        """Parse any new or changed profiles ahead of use.
+
+        Unreadable or invalid profiles are skipped and left for `get()` to
+        report when they are actually requested. The directory is always
+        re-scanned here, so in-place edits to profile files (which don't move
+        the directory mtime) are picked up by the background refresh.
+        """
+        self.refresh(force=True)
+        for filename, stat_key in [*self._stats.items()]:
+            cached = self._profiles.get(filename)
+            if cached and cached[0] == stat_key:
+                continue
+            try:
+                self.get(filename)
+            except Exception:
+                continue
+
+    def invalidate(self, filename: str | None = None) -> None:
+        """Drop cached profiles so they are re-read on next use.
+
+        The directory is re-scanned on next use as well, so profiles saved
+        or deleted through the store are picked up right away.
+
+        Args:
+            filename: The profile file to drop, else all (default=None).
+        """
+        with self._lock:
+            self._dir_mtime = None
+            if filename:
+                self._profiles.pop(filename, None)
+            else:
+                self._profiles.clear()
@@ -0,0 +1,280 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Cache of device `info` documents keyed by IP. Entries are fresh for `ttl`
+# seconds, the least recently used entries are evicted past `max_size`, and the
+# cache can be snapshotted to disk so a new process starts with the last-known
+# state of every device (served stale while it's revalidated).
+
+import json
+from os import path, replace
+from itertools import islice
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Thread
+from time import time
+
+# NOTE: `axeprofiler.api` (and `requests`) is imported when first needed
+
+
+class InfoCache():
+    """
+    Thread-safe TTL/LRU cache of device `info` documents.
+
+    Args:
+        ttl: Seconds an entry is fresh for (default=10).
+        max_size: The max number of devices cached (default=1024).
+        snapshot: A file to load the cache from and `save()` it to
+            (default=None).
+
+    Methods:
+        get: Return the info of a device, fetching it if stale.
+        peek: Return the last-known info of a device without fetching.
+        age: Return the seconds since the info of a device was fetched.
+        put: Cache the info of a device.
+        invalidate: Drop the info of a device (or every device).
+        revalidate: Re-fetch every stale entry.
+        save: Write the cache to the snapshot file.
+        load: Read the cache from the snapshot file.
+    """
+    def __init__(self, ttl: float = 10, max_size: int = 1024,
+                 snapshot: str | None = None):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._snapshot = snapshot
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._pending: set[str] = set()  # devices revalidating in background
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f"InfoCache({self._ttl}, {len(self._entries)} devices)"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ip: str) -> bool:
+        return ip in self._entries
+
+    @property
+    def ttl(self) -> float:
+        """Return the seconds an entry is fresh for."""
+        return self._ttl
+
+    @property
+    def snapshot(self) -> str | None:
+        """Return the snapshot file, if any."""
+        return self._snapshot
+
+    def _fetch(self, ip: str) -> dict:
+        """Fetch, cache and return the info of a device."""
+        from axeprofiler.api import request
+
+        info = request(ip, "info").json()
+        self.put(ip, info)
+        return info
+
+    def _background(self, ip: str) -> None:
+        """Re-fetch the info of a device on a background thread."""
+        with self._lock:
+            if ip in self._pending:
+                return
+            self._pending.add(ip)
+
+        def _run() -> None:
+            try:
+                self._fetch(ip)
+            except Exception:
+                pass  # keep serving the last-known info
+            finally:
+                with self._lock:
+                    self._pending.discard(ip)
+
+        Thread(target=_run, name="axeprof-info", daemon=True).start()
+
+    def get(self, ip: str, max_age: float | None = None,
+            stale_ok: bool = False) -> dict:
+        """Return the info of a device, fetching it if stale.
+
+        Args:
+            ip: The IP of the device.
+            max_age: The max age (seconds) accepted, else the `ttl`
+                (default=None).
+            stale_ok: Return stale info (if any) right away and re-fetch it in
+                the background instead (default=False).
+
+        Returns:
+            The `info` document of the device.
+
+        Raises:
+            requests.RequestException: if the info must be fetched and fails.
+        """
+        with self._lock:
+            entry = self._entries.get(ip)
+            if entry:
+                self._entries.move_to_end(ip)
+        if entry is None:
+            return self._fetch(ip)
+
+        fetched, info = entry
+        if time() - fetched <= (self._ttl if max_age is None else max_age):
+            return info
+        if stale_ok:
+            self._background(ip)
+            return info
+        return self._fetch(ip)
+
+    def peek(self, ip: str) -> dict | None:
+        """Return the last-known info of a device (of any age) or None."""
+        with self._lock:
+            entry = self._entries.get(ip)
+        return entry[1] if entry else None
+
+    def age(self, ip: str) -> float | None:
+        """Return the seconds since the info of a device was fetched."""
+        with self._lock:
+            entry = self._entries.get(ip)
+        return time() - entry[0] if entry else None
+
+    def put(self, ip: str, info: dict, fetched: float | None = None) -> None:
+        """Cache the info of a device.
+
+        Args:
+            ip: The IP of the device.
+            info: The `info` document of the device.
+            fetched: When the info was fetched (unix), else now (default=None).
+        """
+        with self._lock:
+            self._entries[ip] = (time() if fetched is None else fetched, info)
+            self._entries.move_to_end(ip)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, ip: str | None = None) -> None:
+        """Drop the info of a device, else every device."""
+        with self._lock:
+            if ip is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(ip, None)
+
+    def revalidate(self, max_workers: int = 16,
+                   recent: int | None = None) -> int:
+        """Re-fetch stale entries and return the number refreshed.
+
+        Devices that fail to respond keep their last-known info.
+
+        Args:
+            max_workers: The max number of devices fetched at once
+                (default=16).
+            recent: Only check the `recent` most recently used entries, else
+                every entry (default=None).
+        """
+        now = time()
+        with self._lock:
+            entries = reversed(self._entries.items())
+            stale = [ip for ip, (fetched, _) in islice(entries, recent)
+                     if now - fetched > self._ttl]
+        if not stale:
+            return 0
+
+        def _refresh(ip: str) -> bool:
+            try:
+                self._fetch(ip)
+                return True
+            except Exception:
+                return False
+
+        with ThreadPoolExecutor(max_workers=min(max_workers,
+                                                len(stale))) as pool:
+            return sum(pool.map(_refresh, stale))
+
+    def save(self, filepath: str | None = None) -> None:
+        """Write the cache to a file (atomically).
+
+        Args:
+            filepath: The file to write, else the snapshot (default=None).
+        """
+        if not (filepath := filepath or self._snapshot):
+            return
+        with self._lock:
+            data = {ip: [fetched, info]
+                    for ip, (fetched, info) in self._entries.items()}
+        with open(f"{filepath}.tmp", 'w') as f:
+            f.write(json.dumps(data))
+        replace(f"{filepath}.tmp", filepath)
+
+    def load(self, filepath: str | None = None) -> int:
+        """Read the cache from a file written by `save()`.
+
+        Entries keep the age they had when saved, so they're served as stale
+        until revalidated. A missing or corrupt file is ignored, as are any
+        malformed entries.
+
+        Args:
+            filepath: The file to read, else the snapshot (default=None).
+
+        Returns:
+            The number of devices loaded.
+        """
+        filepath = filepath or self._snapshot
+        if not filepath or not path.exists(filepath):
+            return 0
+        try:
+            with open(filepath, 'r') as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(data, dict):
+            return 0
+
+        count = 0
+        for ip, entry in data.items():
+            if (isinstance(entry, list) and len(entry) == 2
+                    and isinstance(entry[0], (int, float))
+                    and isinstance(entry[1], dict)):
+                self.put(ip, entry[1], entry[0])
+                count += 1
+        return count
+
+
+_cache = InfoCache()  # default cache used by `Profile`
+
+
+def get_cache() -> InfoCache:
+    """Return the default `InfoCache`."""
+    return _cache
+
+
+def configure(ttl: float = 10, max_size: int = 1024,
+              snapshot: str | None = None) -> InfoCache:
+    """Replace the default `InfoCache` and return it.
+
+    Args:
+        ttl: Seconds an entry is fresh for (default=10).
+        max_size: The max number of devices cached (default=1024).
+        snapshot: A file to load the cache from (now) and `save()` it to
+            (default=None).
+
+    Returns:
+        The new default `InfoCache`.
+    """
+    global _cache
+    _cache = InfoCache(ttl=ttl, max_size=max_size, snapshot=snapshot)
+    _cache.load()
+    return _cache
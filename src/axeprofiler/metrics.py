@@ -0,0 +1,253 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Opt-in instrumentation. The API layer, profile I/O, applies and CLI actions
+# record counters and latency histograms here, which can be exported as
+# Prometheus text or JSON. Recording is disabled by default and every call
+# returns immediately until `enable()` is called, e.g. by setting
+# `AXEPROF_METRICS=<file>.prom` (or `.json`) to write the metrics on exit.
+
+import json
+import atexit
+from os import environ, replace
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from contextlib import nullcontext
+from typing import TypeAlias
+
+
+LABELS: TypeAlias = tuple[tuple[str, str], ...]  # sorted (label, value) pairs
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60,
+           120, 300)  # default histogram buckets (seconds)
+METRICS = {  # name: (type, help)
+    "axeprof_request_seconds": (
+        "histogram", "API request latency by endpoint and host"),
+    "axeprof_responses_total": (
+        "counter", "API responses by endpoint and status code"),
+    "axeprof_request_errors_total": (
+        "counter", "API request errors by endpoint, host and exception type"),
+    "axeprof_request_retries_total": (
+        "counter", "API request retries by endpoint and host"),
+    "axeprof_response_bytes_total": (
+        "counter", "API response bytes received by endpoint and host"),
+    "axeprof_request_bytes_total": (
+        "counter", "API request bytes sent by endpoint and host"),
+    "axeprof_apply_seconds": (
+        "histogram", "Profile apply duration by phase (patch, restart)"),
+    "axeprof_restart_recovery_seconds": (
+        "histogram", "Seconds for a restarted device to become healthy"),
+    "axeprof_profile_io_seconds": (
+        "histogram", "Profile store latency by backend and operation"),
+    "axeprof_cli_action_seconds": (
+        "histogram", "Interactive CLI action duration by action"),
+}
+
+_enabled = False
+_lock = Lock()
+_counters: dict[str, dict[LABELS, float]] = {}
+# name: labels: [bucket counts, sum, count]
+_histograms: dict[str, dict[LABELS, list]] = {}
+
+
+class _Timer():
+    """Context manager that observes its elapsed seconds into a histogram."""
+    __slots__ = ("_name", "_labels", "_start")
+
+    def __init__(self, name: str, labels: dict[str, str]):
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        observe(self._name, perf_counter() - self._start, **self._labels)
+
+
+_NOOP = nullcontext()  # returned by `timer()` while disabled
+
+
+def enabled() -> bool:
+    """Return True if metrics are being recorded."""
+    return _enabled
+
+
+def enable() -> None:
+    """Start recording metrics."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording metrics (recorded values are kept)."""
+    global _enabled
+    _enabled = False
+
+
+def reset() -> None:
+    """Drop every recorded value."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def inc(name: str, amount: float = 1, **labels: str) -> None:
+    """Add to a counter.
+
+    Args:
+        name: The metric name.
+        amount: The amount to add (default=1).
+        **labels: The label values of the series.
+    """
+    if not _enabled:
+        return
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    """Record a value (e.g. seconds) in a histogram.
+
+    Args:
+        name: The metric name.
+        value: The value observed.
+        **labels: The label values of the series.
+    """
+    if not _enabled:
+        return
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        if (histogram := series.get(key)) is None:
+            histogram = series[key] = [[0] * len(BUCKETS), 0.0, 0]
+        i = bisect_left(BUCKETS, value)
+        if i < len(BUCKETS):
+            histogram[0][i] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+
+def timer(name: str, **labels: str) -> _Timer | nullcontext:
+    """Return a context manager that records its duration in a histogram.
+
+    Args:
+        name: The metric name.
+        **labels: The label values of the series.
+    """
+    return _Timer(name, labels) if _enabled else _NOOP
+
+
+def record_request(endpoint: str, ip: str, seconds: float, status: int,
+                   sent: int, received: int) -> None:
+    """Record the latency, status and bytes of a completed API request."""
+    if not _enabled:
+        return
+    observe("axeprof_request_seconds", seconds, endpoint=endpoint, host=ip)
+    inc("axeprof_responses_total", endpoint=endpoint, status=str(status))
+    inc("axeprof_request_bytes_total", sent, endpoint=endpoint, host=ip)
+    inc("axeprof_response_bytes_total", received, endpoint=endpoint, host=ip)
+
+
+def snapshot() -> dict[str, list[dict]]:
+    """Return every recorded series (JSON compatible).
+
+    Histogram buckets are cumulative, as in the Prometheus format.
+    """
+    with _lock:
+        data: dict[str, list[dict]] = {}
+        for name, series in sorted(_counters.items()):
+            data[name] = [{"labels": dict(key), "value": value}
+                          for key, value in series.items()]
+        for name, series in sorted(_histograms.items()):
+            data[name] = []
+            for key, (counts, total, count) in series.items():
+                cumulative, buckets = 0, {}
+                for bound, n in zip(BUCKETS, counts):
+                    cumulative += n
+                    buckets[str(bound)] = cumulative
+                data[name].append({"labels": dict(key), "buckets": buckets,
+                                   "sum": total, "count": count})
+    return data
+
+
+def _labels(labels: dict[str, str], **extra: str) -> str:
+    """Return the Prometheus label set for a series."""
+    pairs = {**labels, **extra}
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"')
+               for value in pairs.values())
+    return '{' + ','.join(f'{label}="{value}"'
+                          for label, value in zip(pairs, escaped)) + '}'
+
+
+def to_prometheus() -> str:
+    """Return every recorded series in the Prometheus text format."""
+    lines = []
+    for name, series in snapshot().items():
+        kind, description = METRICS.get(name, ("untyped", name))
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+        for entry in series:
+            labels = entry["labels"]
+            if "buckets" not in entry:
+                lines.append(f"{name}{_labels(labels)} {entry['value']}")
+                continue
+            for bound, count in entry["buckets"].items():
+                lines.append(
+                    f"{name}_bucket{_labels(labels, le=bound)} {count}")
+            lines += [
+                f"{name}_bucket{_labels(labels, le='+Inf')} {entry['count']}",
+                f"{name}_sum{_labels(labels)} {entry['sum']}",
+                f"{name}_count{_labels(labels)} {entry['count']}"
+            ]
+    return '\n'.join(lines) + '\n'
+
+
+def write(filepath: str) -> None:
+    """Write every recorded series to a file (atomically).
+
+    Files ending in `.json` are written as JSON, anything else in the
+    Prometheus text format (e.g. for the node_exporter textfile collector).
+
+    Args:
+        filepath: The file to write.
+    """
+    if filepath.endswith(".json"):
+        content = json.dumps(snapshot(), indent=4)
+    else:
+        content = to_prometheus()
+    with open(f"{filepath}.tmp", 'w') as f:
+        f.write(content)
+    replace(f"{filepath}.tmp", filepath)
+
+
+def enable_from_env() -> str | None:
+    """Enable metrics if `AXEPROF_METRICS` is set, writing them on exit.
+
+    Returns:
+        The file the metrics will be written to, if any.
+    """
+    if filepath := environ.get("AXEPROF_METRICS"):
+        enable()
+        atexit.register(write, filepath)
+    return filepath
@@ -21,7 +21,15 @@ import json
 from typing import Self
 from os import path, rename
 
-from axeprofiler.api import request
+from axeprofiler import metrics, profiling
+
+# NOTE: `axeprofiler.api` (and `requests`) is imported when first needed, so
+# working with saved profiles doesn't pay for the HTTP stack
+
+TEXT_FIELDS = ("profile_name", "hostname")  # profile text fields
+SETTINGS = ("frequency", "coreVoltage", "fanspeed")  # device settings
+RESTART_SETTINGS = ("frequency", "coreVoltage")  # only applied on restart
+AUTO_FANSPEED = 100  # fanspeed recorded for devices on auto fan (or at 0%)
 
 
 def validate_profile(profile_dir: str, profile_name: str) -> bool:
@@ -29,6 +37,24 @@ def validate_profile(profile_dir: str, profile_name: str) -> bool:
     return path.exists(f"{profile_dir}{profile_name}.json")
 
 
+def active_settings(info: dict) -> dict[str, int]:
+    """Return the settings of a device from its `info` document.
+
+    Numeric settings are rounded to ints, and a device on auto fan (or with
+    its fan at 0%) is given `AUTO_FANSPEED`, so the result is always valid
+    `Profile` data. Settings the device doesn't report are left out.
+
+    Args:
+        info: The `info` document of the device.
+    """
+    settings = {key: round(value) for key in SETTINGS
+                if isinstance(value := info.get(key), (int, float))
+                and not isinstance(value, bool)}
+    if info.get("autofanspeed") or not settings.get("fanspeed", 1):
+        settings["fanspeed"] = AUTO_FANSPEED
+    return settings
+
+
 class Profile():
     """
     Representation of a device config used by a miner running AxeOS.
@@ -41,10 +67,12 @@ class Profile():
         fanspeed: The fan speed setting for the device.
 
     Methods:
+        check_profile_data: Check config data, collecting every error.
         validate_profile_data: Validate config data before init.
         create_profile(): Create a new `Profile()` obj.
         create_profile_from_active: Create a `Profile()` from an active config.
         save_profile: Save the profile data to a file.
+        diff: Return the settings that differ from another profile.
         run_profile: Apply the profile settings to a device.
     """
     def __init__(self,
@@ -104,6 +132,38 @@ class Profile():
             "fanspeed": self._fanspeed
         }
 
+    @classmethod
+    def check_profile_data(
+            cls, config: dict[str, str | int]
+            ) -> tuple[dict[str, str | int], list[str]]:
+        """Check a config dict for CREATING Profiles, collecting every error.
+
+        These are the rules behind `validate_profile_data()`, which stops at
+        the first error; bulk validation (e.g. `importer`) reports them all.
+
+        Args:
+            config: A dict of config data to create the Profile from.
+
+        Returns:
+            A dict of the valid `Profile` data and a list of errors.
+        """
+        profile_data, errors = {}, []
+        for key in TEXT_FIELDS:
+            if config.get(key) and isinstance(config[key], str):
+                profile_data[key] = config[key]
+            else:
+                errors.append(f"Missing or incorrect type for `{key}`")
+
+        for key in SETTINGS:
+            # NOTE: `bool` is a subclass of `int`, but never a valid setting
+            value = config.get(key)
+            if (value and isinstance(value, int)
+                    and not isinstance(value, bool)):
+                profile_data[key] = value
+            else:
+                errors.append(f"Missing or incorrect type for `{key}`")
+        return profile_data, errors
+
     @classmethod
     def validate_profile_data(
             cls, config: dict[str, str | int]) -> dict[str, str | int]:
@@ -117,36 +177,13 @@ class Profile():
 
         Returns:
             A dict of data validated for use in `Profile` creation.
-        """
-        profile_data = {}  # container for validated data
-
-        if (config.get("profile_name")
-                and isinstance(config["profile_name"], str)):
-            profile_data["profile_name"] = config["profile_name"]
-        else:
-            raise ValueError("Missing or incorrect type for `profile_name`")
-
-        if (config.get("hostname") and isinstance(config["hostname"], str)):
-            profile_data["hostname"] = config["hostname"]
-        else:
-            raise ValueError("Missing or incorrect type for `hostname`")
-
-        if (config.get("frequency") and isinstance(config["frequency"], int)):
-            profile_data["frequency"] = config["frequency"]
-        else:
-            raise ValueError("Missing or incorrect type for `frequency`")
-
-        if (config.get("coreVoltage")
-                and isinstance(config["coreVoltage"], int)):
-            profile_data["coreVoltage"] = config["coreVoltage"]
-        else:
-            raise ValueError("Missing or incorrect type for `coreVoltage`")
-
-        if (config.get("fanspeed") and isinstance(config["fanspeed"], int)):
-            profile_data["fanspeed"] = config["fanspeed"]
-        else:
-            raise ValueError("Missing or incorrect type for `fanspeed`")
 
+        Raises:
+            ValueError: for the first field that fails validation.
+        """
+        profile_data, errors = cls.check_profile_data(config)
+        if errors:
+            raise ValueError(errors[0])
         return profile_data
 
     @classmethod
@@ -172,23 +209,33 @@ class Profile():
             raise AttributeError("Profile could not be created 😭")
 
     @classmethod
-    def create_profile_from_active(cls, ip: str) -> Self:
+    def create_profile_from_active(cls, ip: str, info: dict | None = None,
+                                   max_age: float | None = None) -> Self:
         """
         Create a Profile instance from an active configuration.
 
+        The `info` document is read through the device info cache (see
+        `infocache.get_cache()`), so repeat calls within its TTL don't hit the
+        device again.
+
         Args:
             ip: The IP address to fetch the active configuration from.
+            info: An already fetched `info` document for the device (e.g. from
+                `telemetry.Poller.info()`) to use instead (default=None).
+            max_age: The max age (seconds) of cached info accepted, else the
+                cache TTL (default=None).
 
         Returns:
-            A new Profile object initialized with the active configuration.
+            A new Profile object initialized with the active configuration
+            (see `active_settings()`).
         """
-        data = request(ip, "info").json()
-        profile_data = {"profile_name": "Active"}
-        profile_data.update({
-            key: data[key] for key in data.keys() & (
-                "hostname", "frequency", "coreVoltage", "fanspeed"
-            )
-        })
+        if info is None:
+            from axeprofiler.infocache import get_cache
+
+            info = get_cache().get(ip, max_age=max_age)
+        profile_data = {"profile_name": "Active",
+                        "hostname": info.get("hostname")}
+        profile_data.update(active_settings(info))
         return cls.create_profile(profile_data)
 
     # NOTE: Currently not needed due to handling in the CLI
@@ -250,6 +297,7 @@ class Profile():
     #     except Exception as e:
     #         raise e
 
+    @profiling.traced("Profile.save_profile")
     def save_profile(self, profile_dir: str,
                      replace: str | None = None) -> None:
         """
@@ -277,22 +325,65 @@ class Profile():
         except Exception as e:
             raise e
 
-    def run_profile(self, ip: str) -> None:
+    def diff(self, other: Self) -> dict[str, int]:
+        """Return the settings of this profile that differ from another.
+
+        Args:
+            other: The profile to compare against (e.g. the active config).
+
+        Returns:
+            A dict of setting -> value (of this profile) for each difference.
+        """
+        return {key: self.data[key] for key in SETTINGS
+                if self.data[key] != other.data[key]}
+
+    @profiling.traced("Profile.run_profile")
+    def run_profile(self, ip: str, active: Self | None = None,
+                    force: bool = False) -> dict[str, int]:
         """Apply profile settings to the device.
 
-        Sends the profile configuration and restarts the device.
+        Only the settings that differ from the active config are sent, and the
+        device is only restarted if a setting in `RESTART_SETTINGS` changed. A
+        device already running the profile is left untouched. The active
+        config is always fetched fresh rather than read from the device info
+        cache, and the cached info is invalidated again once anything is sent.
 
         Args:
             ip: The IP address of the device to apply the profile to.
+            active: The active config of the device, else it's fetched
+                (default=None).
+            force: Send every setting and restart regardless (default=False).
+
+        Returns:
+            The settings sent to the device (empty if nothing changed).
 
         Raises:
             requests.HTTPError: If there is an error in the API requests.
         """
-        # try:
-        push_data = {
-                k:self.data[k] for k in self.data
-                if k not in ("profile_name", "hostname")
-            }
-        # print(push_data)
-        request(ip=ip, endpoint="system", body=push_data)
-        request(ip=ip, endpoint="restart")
+        from axeprofiler.api import request
+        from axeprofiler.infocache import get_cache
+
+        if force:
+            push_data = {key: self.data[key] for key in SETTINGS}
+        elif active is None:
+            # NOTE: always diffed against fresh info, as a device changed
+            # within the cache TTL would otherwise be reported unchanged
+            cache = get_cache()
+            cache.invalidate(ip)
+            settings = active_settings(cache.get(ip, max_age=0))
+            push_data = {key: self.data[key] for key in SETTINGS
+                         if settings.get(key) != self.data[key]}
+        else:
+            push_data = self.diff(active)
+
+        try:
+            if push_data:
+                with metrics.timer("axeprof_apply_seconds", phase="patch"):
+                    request(ip=ip, endpoint="system", body=push_data)
+            if force or push_data.keys() & RESTART_SETTINGS:
+                with metrics.timer("axeprof_apply_seconds", phase="restart"):
+                    request(ip=ip, endpoint="restart")
+        finally:
+            if push_data:
+                get_cache().invalidate(ip)
+        return push_data
@@ -0,0 +1,266 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Opt-in profiling for bug reports. Hot paths (API requests, profile
+# save/load, rendering, health checks) are wrapped in named wall-clock spans,
+# which are aggregated across every thread, and cProfile can optionally record
+# the calling thread. Spans cost a single flag check until enabled, e.g. with
+# `AXEPROF_PROFILE=<file>`, which writes a report to `<file>` (and the raw
+# cProfile stats to `<file>.pstats`) on exit:
+#   $ AXEPROF_PROFILE=apply.txt axeprof apply Eco 10.0.0.0/24
+#   $ python -m pstats apply.txt.pstats  # re-sort/browse the cProfile stats
+# Or programmatically:
+#   with profiling.profile("session.txt"):
+#       Cli().session()
+
+import io
+import atexit
+import pstats
+import cProfile
+from os import environ
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from contextlib import contextmanager, nullcontext
+from inspect import iscoroutinefunction
+from typing import Callable, Iterator
+
+
+SORT_KEYS = ("total", "calls", "mean", "max", "name")  # span report sorts
+
+_enabled = False
+_lock = Lock()
+_spans: dict[str, list[float]] = {}  # name: [calls, total, min, max]
+_profiler: cProfile.Profile | None = None
+
+
+class _Span():
+    """Context manager that records its wall-clock duration as a span."""
+    __slots__ = ("_name", "_start")
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __enter__(self) -> "_Span":
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        record(self._name, perf_counter() - self._start)
+
+
+_NOOP = nullcontext()  # returned by `span()` while disabled
+
+
+def enabled() -> bool:
+    """Return True if spans are being recorded."""
+    return _enabled
+
+
+def enable(cprofile: bool = False) -> None:
+    """Start recording spans (and optionally cProfile the calling thread).
+
+    NOTE: cProfile only sees the thread that enabled it; work done on
+    worker threads (e.g. fleet applies) is only covered by the spans.
+
+    Args:
+        cprofile: Also run cProfile (default=False).
+    """
+    global _enabled, _profiler
+    _enabled = True
+    if cprofile and _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def disable() -> None:
+    """Stop recording spans and cProfile (recorded values are kept)."""
+    global _enabled
+    _enabled = False
+    if _profiler:
+        _profiler.disable()
+
+
+def reset() -> None:
+    """Drop every recorded span and the cProfile stats."""
+    global _profiler
+    with _lock:
+        _spans.clear()
+    if _profiler:
+        _profiler.disable()
+        _profiler = None
+
+
+def record(name: str, seconds: float) -> None:
+    """Record a single span.
+
+    Args:
+        name: The span name.
+        seconds: The wall-clock duration of the span.
+    """
+    if not _enabled:
+        return
+    with _lock:
+        if (stats := _spans.get(name)) is None:
+            _spans[name] = [1, seconds, seconds, seconds]
+            return
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = min(stats[2], seconds)
+        stats[3] = max(stats[3], seconds)
+
+
+def span(name: str) -> _Span | nullcontext:
+    """Return a context manager that records its duration as a span.
+
+    Args:
+        name: The span name.
+    """
+    return _Span(name) if _enabled else _NOOP
+
+
+def traced(name: str) -> Callable[[Callable], Callable]:
+    """Return a decorator that records every call of a function as a span.
+
+    Coroutine functions are timed until they return, including any time
+    spent awaiting.
+
+    Args:
+        name: The span name.
+    """
+    def decorator(func: Callable) -> Callable:
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await func(*args, **kwargs)
+                with _Span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def spans() -> dict[str, dict[str, float]]:
+    """Return the calls, total, mean, min and max seconds of every span."""
+    with _lock:
+        return {name: {"calls": calls, "total": total, "mean": total / calls,
+                       "min": low, "max": high}
+                for name, (calls, total, low, high) in _spans.items()}
+
+
+def report(sort: str = "total", cprofile_sort: str = "cumulative",
+           limit: int = 40) -> str:
+    """Return a text report of the spans and cProfile stats (if any).
+
+    NOTE: collecting the cProfile stats stops cProfile.
+
+    Args:
+        sort: The span column to sort by, see `SORT_KEYS` (default="total").
+        cprofile_sort: The `pstats` sort key for the cProfile stats
+            (default="cumulative").
+        limit: The max number of cProfile entries listed (default=40).
+
+    Raises:
+        ValueError: if a sort key is invalid.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Invalid sort key: {sort}")
+    rows = sorted(spans().items(), reverse=sort != "name",
+                  key=lambda item: item[0] if sort == "name"
+                  else item[1][sort])
+    lines = [f"{'span':<32}{'calls':>8}{'total s':>11}{'mean ms':>10}"
+             + f"{'min ms':>10}{'max ms':>10}"]
+    for name, stats in rows:
+        lines.append(f"{name:<32}{stats['calls']:>8}{stats['total']:>11.3f}"
+                     + ''.join(f"{stats[key] * 1e3:>10.2f}"
+                               for key in ("mean", "min", "max")))
+
+    if _profiler:
+        stream = io.StringIO()
+        stats = pstats.Stats(_profiler, stream=stream)
+        stats.sort_stats(cprofile_sort).print_stats(limit)
+        lines += ['', f"cProfile (sorted by {cprofile_sort}):",
+                  stream.getvalue()]
+    return '\n'.join(lines) + '\n'
+
+
+def write(filepath: str, sort: str = "total",
+          cprofile_sort: str = "cumulative") -> None:
+    """Write the report to a file, and the raw cProfile stats (if any) to
+    `<filepath>.pstats`.
+
+    Args:
+        filepath: The file to write.
+        sort: The span column to sort by, see `SORT_KEYS` (default="total").
+        cprofile_sort: The `pstats` sort key for the cProfile stats
+            (default="cumulative").
+    """
+    if _profiler:
+        _profiler.disable()
+    content = report(sort, cprofile_sort)
+    with open(filepath, 'w') as f:
+        f.write(content)
+    if _profiler:
+        _profiler.dump_stats(f"{filepath}.pstats")
+
+
+@contextmanager
+def profile(filepath: str | None = None, cprofile: bool = True,
+            sort: str = "total") -> Iterator[None]:
+    """Profile a block of code, writing the report to a file when it exits.
+
+    Args:
+        filepath: The file to write the report to, else keep the results for
+            `report()`/`spans()` (default=None).
+        cprofile: Also run cProfile on this thread (default=True).
+        sort: The span column to sort by, see `SORT_KEYS` (default="total").
+    """
+    reset()
+    enable(cprofile)
+    try:
+        yield
+    finally:
+        disable()
+        if filepath:
+            write(filepath, sort)
+
+
+def enable_from_env() -> str | None:
+    """Enable profiling if `AXEPROF_PROFILE` is set, writing it on exit.
+
+    `AXEPROF_PROFILE_SORT` sets the span sort (see `SORT_KEYS`) and
+    `AXEPROF_CPROFILE=0` records the spans only.
+
+    Returns:
+        The file the report will be written to, if any.
+    """
+    if filepath := environ.get("AXEPROF_PROFILE"):
+        enable(cprofile=environ.get("AXEPROF_CPROFILE", "1") != "0")
+        sort = environ.get("AXEPROF_PROFILE_SORT", "total")
+        atexit.register(write, filepath,
+                        sort if sort in SORT_KEYS else "total")
+    return filepath
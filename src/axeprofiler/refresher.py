@@ -0,0 +1,124 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+
+from time import monotonic
+from typing import Callable
+from threading import Event, Lock, Thread
+
+
+class Refresher():
+    """
+    Run periodic background tasks (e.g. syncing the profile index or device
+    status) on a daemon thread while the CLI waits on user input.
+
+    Args:
+        interval: The default seconds between runs of each task (default=30).
+
+    Methods:
+        add: Register a task to run periodically.
+        remove: Unregister a task.
+        start: Start the background thread.
+        stop: Stop the background thread.
+    """
+    def __init__(self, interval: float = 30):
+        self._interval = interval
+        self._tasks: dict[str, tuple[Callable[[], None], float]] = {}
+        self._due: dict[str, float] = {}  # task name: next run (monotonic)
+        self._errors: dict[str, Exception] = {}  # last error per task
+        self._lock = Lock()
+        self._stop = Event()
+        self._wake = Event()  # interrupts the wait when tasks change
+        self._thread: Thread | None = None
+
+    def __repr__(self):
+        return f"Refresher({self._interval})"
+
+    @property
+    def running(self) -> bool:
+        """Return True if the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def errors(self) -> dict[str, Exception]:
+        """Return the last error raised by each failing task."""
+        return dict(self._errors)
+
+    def add(self, name: str, task: Callable[[], None],
+            interval: float | None = None) -> None:
+        """Register a task to run periodically.
+
+        Args:
+            name: A unique name for the task.
+            task: The callable to run.
+            interval: Seconds between runs, else the default (default=None).
+        """
+        with self._lock:
+            self._tasks[name] = (task, interval or self._interval)
+            self._due[name] = monotonic()
+        self._wake.set()
+
+    def remove(self, name: str) -> None:
+        """Unregister a task."""
+        with self._lock:
+            self._tasks.pop(name, None)
+            self._due.pop(name, None)
+            self._errors.pop(name, None)
+
+    def _run(self) -> None:
+        """Run each task as it comes due until stopped."""
+        while not self._stop.is_set():
+            now = monotonic()
+            with self._lock:
+                due = [(name, *self._tasks[name]) for name, when
+                       in self._due.items() if when <= now]
+            for name, task, interval in due:
+                try:
+                    task()
+                    self._errors.pop(name, None)
+                except Exception as e:  # keep the other tasks running
+                    self._errors[name] = e
+                with self._lock:
+                    if name in self._due:
+                        self._due[name] = monotonic() + interval
+
+            with self._lock:
+                wait = min(self._due.values(), default=now + self._interval)
+            self._wake.wait(max(0.05, wait - monotonic()))
+            self._wake.clear()
+
+    def start(self) -> None:
+        """Start the background thread (if not already running)."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="axeprof-refresher",
+                              daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 1) -> None:
+        """Stop the background thread.
+
+        Args:
+            timeout: Seconds to wait for a running task to finish (default=1).
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,414 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Persistent device inventory. Each device (keyed by IP) has a hostname, model,
+# tags (e.g. `rack-3`, `room-a`) and the profile last applied to it. Every
+# field is indexed (value -> IPs), so resolving a group to its devices costs
+# the size of the group rather than the size of the fleet. Groups can be used
+# anywhere targets are accepted (see `fleet.expand_targets()`):
+#   $ axeprof apply Eco @rack-3
+#   $ axeprof status @model=Gamma
+# The registry is saved as JSON to `<root>.devices.json` (or `registry` in the
+# program config).
+
+import json
+import ipaddress
+from os import path, replace
+from threading import Lock
+from typing import Callable, Iterable, TypeAlias
+
+from axeprofiler.config import ROOT, load_config
+
+
+DEVICE: TypeAlias = dict[str, str | list[str] | None]  # device record format
+FIELDS = ("hostname", "model", "profile", "tag")  # indexed selector fields
+APPLIED = ("success", "unchanged")  # fleet statuses that assign a profile
+SYNC_FIELDS = ("hostname", "model")  # fields read from each device's `info`
+
+
+def _check_tags(tags: Iterable[str]) -> list[str]:
+    """Return the tags as a list.
+
+    Raises:
+        ValueError: if a tag is empty or contains `=`, `+` or whitespace.
+    """
+    tags = [*tags]
+    for tag in tags:
+        if (not tag or '=' in tag or '+' in tag
+                or any(c.isspace() for c in tag)):
+            raise ValueError(f"Invalid tag: {tag!r}")
+    return tags
+
+
+def _sort_key(ip: str) -> tuple:
+    """Return a key that sorts IPv4 addrs (and `ip:port`) numerically."""
+    host, _, port = ip.partition(':')
+    try:
+        return (0, int(ipaddress.IPv4Address(host)),
+                int(port) if port.isdigit() else 0)
+    except ValueError:
+        return (1, ip)
+
+
+class DeviceRegistry():
+    """
+    Indexed inventory of devices, persisted as JSON.
+
+    Lookups by IP, hostname, model, assigned profile or tag are dict/set
+    lookups, and results are returned sorted by IP.
+
+    Args:
+        filepath: The file to load the registry from and `save()` it to
+            (default=None).
+
+    Methods:
+        get: Return the record of a device.
+        add: Add a device or update its record.
+        remove: Remove devices.
+        tag: Add tags to devices.
+        untag: Remove tags from devices.
+        assign: Set the assigned profile of devices.
+        record_applied: Assign a profile to the devices it was applied to.
+        find: Return the devices matching every given field.
+        resolve: Return the devices matching an `@` selector.
+        sync: Fill in hostnames/models from the devices themselves.
+        save: Write the registry to its file.
+        load: Read the registry from its file.
+    """
+    def __init__(self, filepath: str | None = None):
+        self._filepath = filepath
+        self._devices: dict[str, DEVICE] = {}
+        # field: value: IPs
+        self._index: dict[str, dict[str, set[str]]] = {
+            field: {} for field in FIELDS}
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f"DeviceRegistry({len(self._devices)} devices)"
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __contains__(self, ip: str) -> bool:
+        return ip in self._devices
+
+    @property
+    def filepath(self) -> str | None:
+        """Return the registry file, if any."""
+        return self._filepath
+
+    @property
+    def devices(self) -> list[DEVICE]:
+        """Return every device record, sorted by IP."""
+        with self._lock:
+            return [self._copy(self._devices[ip])
+                    for ip in sorted(self._devices, key=_sort_key)]
+
+    @property
+    def groups(self) -> dict[str, int]:
+        """Return the number of devices with each tag."""
+        with self._lock:
+            return {tag: len(ips) for tag, ips in
+                    sorted(self._index["tag"].items())}
+
+    @staticmethod
+    def _copy(device: DEVICE) -> DEVICE:
+        """Return a copy of a record that's safe to hand out."""
+        return {**device, "tags": [*device["tags"]]}
+
+    def _values(self, device: DEVICE) -> Iterable[tuple[str, str]]:
+        """Yield the indexed (field, value) pairs of a record."""
+        for field in ("hostname", "model", "profile"):
+            if device[field]:
+                yield field, device[field]
+        for tag in device["tags"]:
+            yield "tag", tag
+
+    def _unindex(self, device: DEVICE) -> None:
+        """Drop a record from the indexes."""
+        for field, value in self._values(device):
+            ips = self._index[field][value]
+            ips.discard(device["ip"])
+            if not ips:
+                del self._index[field][value]
+
+    def _reindex(self, device: DEVICE) -> None:
+        """Add a record to the indexes."""
+        for field, value in self._values(device):
+            self._index[field].setdefault(value, set()).add(device["ip"])
+
+    def get(self, ip: str) -> DEVICE | None:
+        """Return the record of a device, else None."""
+        with self._lock:
+            device = self._devices.get(ip)
+            return self._copy(device) if device else None
+
+    def add(self, ip: str, hostname: str | None = None,
+            model: str | None = None, tags: Iterable[str] = (),
+            profile: str | None = None) -> DEVICE:
+        """Add a device, or update the record of a known device.
+
+        Fields that aren't given are left as they are, and tags are added to
+        any existing tags.
+
+        Args:
+            ip: The IP of the device.
+            hostname: The hostname of the device (default=None).
+            model: The model of the device (default=None).
+            tags: Tags (groups) to add to the device (default=()).
+            profile: The profile assigned to the device (default=None).
+
+        Returns:
+            The updated record.
+
+        Raises:
+            ValueError: if a tag is invalid.
+        """
+        tags = _check_tags(tags)
+        with self._lock:
+            device = self._devices.get(ip)
+            if device is None:
+                device = self._devices[ip] = {
+                    "ip": ip, "hostname": None, "model": None, "tags": [],
+                    "profile": None}
+            else:
+                self._unindex(device)
+            for field, value in (("hostname", hostname), ("model", model),
+                                 ("profile", profile)):
+                if value is not None:
+                    device[field] = value
+            device["tags"] += [tag for tag in dict.fromkeys(tags)
+                               if tag not in device["tags"]]
+            self._reindex(device)
+            return self._copy(device)
+
+    def remove(self, ips: Iterable[str]) -> int:
+        """Remove devices and return the number removed."""
+        removed = 0
+        with self._lock:
+            for ip in ips:
+                if (device := self._devices.pop(ip, None)) is not None:
+                    self._unindex(device)
+                    removed += 1
+        return removed
+
+    def _update(self, ips: Iterable[str],
+                func: Callable[[DEVICE], None]) -> int:
+        """Apply `func` to the records of known devices, keeping the indexes
+        in sync, and return the number of devices updated.
+        """
+        updated = 0
+        with self._lock:
+            for ip in ips:
+                if (device := self._devices.get(ip)) is None:
+                    continue
+                self._unindex(device)
+                func(device)
+                self._reindex(device)
+                updated += 1
+        return updated
+
+    def tag(self, ips: Iterable[str], tags: Iterable[str]) -> int:
+        """Add tags to known devices and return the number updated.
+
+        Raises:
+            ValueError: if a tag is invalid.
+        """
+        tags = _check_tags(tags)
+        return self._update(ips, lambda device: device["tags"].extend(
+            tag for tag in dict.fromkeys(tags) if tag not in device["tags"]))
+
+    def untag(self, ips: Iterable[str], tags: Iterable[str]) -> int:
+        """Remove tags from known devices and return the number updated."""
+        tags = set(tags)
+        return self._update(ips, lambda device: device.update(
+            tags=[tag for tag in device["tags"] if tag not in tags]))
+
+    def assign(self, ips: Iterable[str], profile: str | None) -> int:
+        """Set the assigned profile of known devices.
+
+        Returns:
+            The number of devices updated.
+        """
+        return self._update(ips, lambda device: device.update(profile=profile))
+
+    def record_applied(self, profile: str, results: list[dict]) -> int:
+        """Assign a profile to the known devices it was applied to.
+
+        Args:
+            profile: The name of the profile applied.
+            results: The per-device results (see `fleet.RESULT`).
+
+        Returns:
+            The number of devices updated (the registry is saved if any).
+        """
+        updated = self.assign([result["ip"] for result in results
+                               if result["status"] in APPLIED], profile)
+        if updated:
+            self.save()
+        return updated
+
+    def find(self, *terms: tuple[str, str], **fields: str) -> list[str]:
+        """Return the devices matching every given field, sorted by IP.
+
+        e.g. `find(tag="rack-3", model="Gamma")` or, to match several tags,
+        `find(("tag", "rack-3"), ("tag", "room-a"))`
+
+        Args:
+            *terms: (field, value) pairs.
+            **fields: Values of `hostname`, `model`, `profile` or `tag`.
+
+        Raises:
+            ValueError: if a field isn't indexed.
+        """
+        terms = [*terms, *fields.items()]
+        if unknown := {field for field, _ in terms} - set(FIELDS):
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+        with self._lock:
+            if not terms:
+                matches = set(self._devices)
+            else:
+                # Intersect from the smallest set
+                sets = sorted((self._index[field].get(value, set())
+                               for field, value in terms), key=len)
+                matches = sets[0].intersection(*sets[1:])
+        return sorted(matches, key=_sort_key)
+
+    def resolve(self, selector: str) -> list[str]:
+        """Return the devices matching an `@` selector, sorted by IP.
+
+        Selectors are `@<tag>`, `@<field>=<value>` (see `FIELDS`), several
+        of those joined by `+` (devices matching all of them), or `@all`.
+        e.g. `@rack-3`, `@model=Gamma`, `@rack-3+room-a+model=Gamma`
+
+        Raises:
+            ValueError: if the selector is malformed or matches nothing.
+        """
+        if not selector.startswith('@') or len(selector) < 2:
+            raise ValueError(f"Invalid device selector: {selector}")
+        terms = []
+        if selector != "@all":
+            for term in selector[1:].split('+'):
+                field, _, value = term.rpartition('=')
+                if not value:
+                    raise ValueError(f"Invalid device selector: {selector}")
+                terms.append((field or "tag", value))
+        if not (ips := self.find(*terms)):
+            raise ValueError(f"No registered devices match: {selector}")
+        return ips
+
+    def sync(self, ips: Iterable[str] | None = None, limit: int = 256,
+             fields: Iterable[str] = SYNC_FIELDS) -> dict[str, str]:
+        """Fill in hostnames/models from each device's `info`.
+
+        Args:
+            ips: The devices to sync, else every device (default=None).
+            limit: The max number of requests in flight (default=256).
+            fields: The fields to update, see `SYNC_FIELDS`
+                (default=SYNC_FIELDS).
+
+        Returns:
+            A dict of IP -> error for the devices that couldn't be reached.
+        """
+        from axeprofiler import aio
+
+        ips = [*self._devices] if ips is None else [*ips]
+        errors = {}
+        for ip, res in aio.fetch_all(ips, "info", limit=limit).items():
+            if isinstance(res, Exception):
+                errors[ip] = str(res) or type(res).__name__
+                continue
+            try:
+                info = res.json()
+            except ValueError as ve:
+                errors[ip] = f"Invalid response: {ve}"
+                continue
+            if not isinstance(info, dict):
+                errors[ip] = "Invalid response"
+                continue
+            values = {"hostname": info.get("hostname"),
+                      "model": info.get("deviceModel") or info.get("ASICModel")}
+            self.add(ip, **{field: values[field] for field in fields})
+        return errors
+
+    def save(self, filepath: str | None = None) -> None:
+        """Write the registry to a file (atomically).
+
+        Args:
+            filepath: The file to write, else the registry file (default=None).
+        """
+        if not (filepath := filepath or self._filepath):
+            return
+        data = {device.pop("ip"): device for device in self.devices}
+        with open(f"{filepath}.tmp", 'w') as f:
+            f.write(json.dumps(data, indent=4))
+        replace(f"{filepath}.tmp", filepath)
+
+    def load(self, filepath: str | None = None) -> int:
+        """Read the registry from a file written by `save()`.
+
+        A missing file is ignored.
+
+        Args:
+            filepath: The file to read, else the registry file (default=None).
+
+        Returns:
+            The number of devices loaded.
+
+        Raises:
+            ValueError: if the file isn't a valid registry.
+        """
+        filepath = filepath or self._filepath
+        if not filepath or not path.exists(filepath):
+            return 0
+        with open(filepath, 'r') as f:
+            data = json.loads(f.read())
+        try:
+            for ip, device in data.items():
+                self.add(ip, hostname=device.get("hostname"),
+                         model=device.get("model"),
+                         tags=device.get("tags", ()),
+                         profile=device.get("profile"))
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid registry file: {filepath}") from e
+        return len(data)
+
+
+_registry: DeviceRegistry | None = None  # default registry, loaded lazily
+
+
+def open_registry(config: dict, root: str = ROOT) -> DeviceRegistry:
+    """Return the registry for the program config, loaded from its file.
+
+    Args:
+        config: The program config (see `config.load_config()`).
+        root: The program root directory (default=ROOT).
+    """
+    registry = DeviceRegistry(config.get("registry")
+                              or f"{root}.devices.json")
+    registry.load()
+    return registry
+
+
+def get_registry() -> DeviceRegistry:
+    """Return the default registry (loaded on first use)."""
+    global _registry
+    if _registry is None:
+        _registry = open_registry(load_config())
+    return _registry
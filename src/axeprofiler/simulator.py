@@ -0,0 +1,444 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Local AxeOS fleet simulator for load/latency testing without hardware. Each
+# virtual device serves the routes in `api.ROUTES` from its own listener,
+# either on consecutive localhost ports (127.0.0.1:4000, :4001, ...) or on
+# loopback aliases sharing one port (127.0.1.1, 127.0.1.2, ...; Linux routes
+# all of 127.0.0.0/8 to loopback). e.g.
+#   $ axeprof simulate 1000 --base-port 4000 --latency 0.05 --failure-rate 0.01
+# NOTE: every device holds a listening socket, so large fleets may need a
+# higher open file limit (`ulimit -n`).
+
+import json
+import random
+import asyncio
+import ipaddress
+from threading import Thread
+from time import monotonic, time
+from typing import TypeAlias
+
+
+MODEL: TypeAlias = dict[str, str | float | int]  # per-model behavior
+MODELS = {
+    # ghs_per_mhz: hashrate per MHz, watts_coeff: W per (MHz * V^2),
+    # thermal: C per W at 100% fan, vmin: stable mV at the default frequency
+    "Supra": {"ASICModel": "BM1368", "frequency": 490, "coreVoltage": 1166,
+              "ghs_per_mhz": 1.33, "watts_coeff": 0.0195, "thermal": 1.5,
+              "vmin": 1120},
+    "Gamma": {"ASICModel": "BM1370", "frequency": 525, "coreVoltage": 1150,
+              "ghs_per_mhz": 2.28, "watts_coeff": 0.0259, "thermal": 1.5,
+              "vmin": 1100},
+    "NerdQ++": {"ASICModel": "BM1370", "frequency": 600, "coreVoltage": 1150,
+                "ghs_per_mhz": 8.0, "watts_coeff": 0.0907, "thermal": 0.45,
+                "vmin": 1100},
+}
+AMBIENT = 25  # ambient temp (C)
+STATISTICS = ("hashrate", "asicTemp", "vrTemp", "power", "voltage",
+              "fanspeed")  # `statistics` route columns
+DASHBOARD = ("hashrate", "asicTemp", "power")  # `dashboard` route columns
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class VirtualDevice():
+    """
+    A simulated AxeOS device.
+
+    Hashrate scales with frequency (and drops off when coreVoltage is too low
+    for it), power with frequency x coreVoltage^2, and temp with power and fan
+    speed. After a restart, hashrate ramps up over `ramp` seconds.
+
+    Args:
+        index: The device number (used for its hostname/MAC).
+        model: The device model (see `MODELS`).
+        ramp: Seconds for hashrate to ramp up after a restart (default=10).
+        rng: The random generator for reading noise, else a new unseeded one
+            (default=None).
+
+    Methods:
+        info: Return the `info` document.
+        statistics: Return a `statistics` document.
+        asic: Return the `asic` document.
+        patch: Apply system settings.
+        restart: Reset the uptime (and hashrate ramp).
+    """
+    def __init__(self, index: int, model: str, ramp: float = 10,
+                 rng: random.Random | None = None):
+        self._model: MODEL = MODELS[model]
+        self.model = model
+        self.hostname = f"{model.lower().replace('+', 'p')}-{index:04d}"
+        self.mac = ':'.join(("02:00:00", f"{index >> 16 & 255:02x}",
+                             f"{index >> 8 & 255:02x}", f"{index & 255:02x}"))
+        self.frequency = int(self._model["frequency"])
+        self.coreVoltage = int(self._model["coreVoltage"])
+        self.fanspeed = 90
+        self.ramp = ramp
+        self.booted = monotonic()
+        self._random = rng or random.Random()
+
+    def __repr__(self):
+        return f"VirtualDevice({self.hostname}, {self.model})"
+
+    @property
+    def uptime(self) -> float:
+        """Return the seconds since the last restart."""
+        return monotonic() - self.booted
+
+    @property
+    def expected_hashrate(self) -> float:
+        """Return the hashrate (GH/s) expected at the current frequency."""
+        return self.frequency * self._model["ghs_per_mhz"]
+
+    def _readings(self) -> dict[str, float]:
+        """Return a noisy sample of the device readings."""
+        model = self._model
+        # Voltage needed for stability rises ~0.5mV per MHz over the default
+        required = model["vmin"] + (self.frequency - model["frequency"]) / 2
+        stability = max(0.0, min(1.0, 1 - (required - self.coreVoltage) / 100))
+        ramp = min(1.0, self.uptime / self.ramp) if self.ramp else 1.0
+        volts = self.coreVoltage / 1000
+        power = model["watts_coeff"] * self.frequency * volts ** 2
+        fan = max(self.fanspeed, 10) / 100
+        temp = AMBIENT + power * model["thermal"] / fan ** 0.5
+        noise = self._random.uniform(0.99, 1.01)
+        return {
+            "hashrate": self.expected_hashrate * stability * ramp * noise,
+            "asicTemp": temp * noise,
+            "vrTemp": (AMBIENT + (temp - AMBIENT) * 1.2) * noise,
+            "power": (power * (0.5 + 0.5 * ramp) + 2) * noise,  # +2W board
+            "voltage": 5000.0,
+            "fanspeed": float(self.fanspeed)
+        }
+
+    def info(self) -> dict:
+        """Return the `info` document."""
+        readings = self._readings()
+        return {
+            "hostname": self.hostname,
+            "macAddr": self.mac,
+            "deviceModel": self.model,
+            "ASICModel": self._model["ASICModel"],
+            "frequency": self.frequency,
+            "coreVoltage": self.coreVoltage,
+            "coreVoltageActual": self.coreVoltage - 10,
+            "fanspeed": self.fanspeed,
+            "autofanspeed": 0,
+            "hashRate": round(readings["hashrate"], 2),
+            "expectedHashrate": round(self.expected_hashrate, 2),
+            "power": round(readings["power"], 2),
+            "voltage": readings["voltage"],
+            "temp": round(readings["asicTemp"], 1),
+            "vrTemp": round(readings["vrTemp"], 1),
+            "fanrpm": self.fanspeed * 60,
+            "uptimeSeconds": int(self.uptime),
+            "version": "v2.9.0-sim"
+        }
+
+    def statistics(self, columns: tuple[str, ...] = STATISTICS,
+                   rows: int = 1, labels: bool = True) -> dict:
+        """Return a `statistics` document with the given columns.
+
+        Like the firmware, the `dashboard` route leaves out the `labels`
+        (`labels=False`).
+        """
+        now = int(time() * 1000)
+        document = {
+            "currentTimestamp": now,
+            "statistics": [
+                [round(readings[column], 2) for column in columns]
+                + [now - (rows - 1 - i) * 5000]
+                for i, readings in enumerate(
+                    self._readings() for _ in range(rows))
+            ]
+        }
+        if labels:
+            document["labels"] = [*columns, "timestamp"]
+        return document
+
+    def asic(self) -> dict:
+        """Return the `asic` document."""
+        return {
+            "ASICModel": self._model["ASICModel"],
+            "deviceModel": self.model,
+            "defaultFrequency": self._model["frequency"],
+            "defaultVoltage": self._model["coreVoltage"]
+        }
+
+    def patch(self, settings: dict) -> None:
+        """Apply system settings (frequency/coreVoltage apply on restart).
+
+        Raises:
+            ValueError: if a setting has an invalid type.
+        """
+        # NOTE: the real firmware only applies frequency/coreVoltage on boot;
+        # they're applied immediately here so readings reflect them
+        types = {"frequency": int, "coreVoltage": int, "fanspeed": int,
+                 "hostname": str}
+        for key, value in settings.items():
+            if key in types and not isinstance(value, types[key]):
+                raise ValueError(f"Invalid type for `{key}`")
+        for key in types.keys() & settings.keys():
+            setattr(self, key, settings[key])
+
+    def restart(self) -> None:
+        """Reset the uptime (and hashrate ramp)."""
+        self.booted = monotonic()
+
+
+class Simulator():
+    """
+    Serve a fleet of virtual AxeOS devices over HTTP on the local machine.
+
+    Args:
+        count: The number of devices to simulate.
+        host: The address to listen on (default="127.0.0.1").
+        base_port: The port of the first device; the rest use consecutive
+            ports unless `aliases` is set (default=4000).
+        aliases: Give each device its own loopback address (counting up from
+            `host`) on `base_port` instead of its own port (default=False).
+        latency: Mean seconds before each response (default=0).
+        jitter: Max seconds the latency varies by (default=0).
+        failure_rate: Fraction of requests dropped without a response
+            (default=0).
+        restart_downtime: Seconds a device is unreachable after a restart
+            (default=5).
+        ramp: Seconds for hashrate to ramp up after a restart (default=10).
+        models: The device models, assigned round-robin (default=all of
+            `MODELS`).
+        seed: Seed for the random latency/failures/readings (default=None).
+
+    Methods:
+        serve: Serve every device on the running event loop until stopped.
+        start: Serve on a background thread.
+        join: Block until the background thread exits.
+        stop: Stop serving.
+    """
+    def __init__(self, count: int, host: str = "127.0.0.1",
+                 base_port: int = 4000, aliases: bool = False,
+                 latency: float = 0, jitter: float = 0,
+                 failure_rate: float = 0, restart_downtime: float = 5,
+                 ramp: float = 10, models: list[str] | None = None,
+                 seed: int | None = None):
+        models = models or [*MODELS]
+        for model in models:
+            if model not in MODELS:
+                raise ValueError(f"Unknown model: {model}")
+        # NOTE: a private generator, so seeding doesn't touch the global one
+        self._random = random.Random(seed)
+
+        self._latency = latency
+        self._jitter = jitter
+        self._failure_rate = failure_rate
+        self._restart_downtime = restart_downtime
+        self._stats = {"requests": 0, "dropped": 0, "restarts": 0}
+        self._devices: dict[tuple[str, int], VirtualDevice] = {}
+        first = ipaddress.IPv4Address(host)
+        for i in range(count):
+            address = ((str(first + i), base_port) if aliases
+                       else (host, base_port + i))
+            self._devices[address] = VirtualDevice(
+                i + 1, models[i % len(models)], ramp, self._random)
+        self._servers: dict[tuple[str, int], asyncio.Server] = {}
+        self._connections: dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._restarts: set[asyncio.Task] = set()
+        self._stopped: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: Thread | None = None
+
+    def __repr__(self):
+        return f"Simulator({len(self._devices)} devices)"
+
+    @property
+    def addresses(self) -> list[str]:
+        """Return the `host:port` addr of every device (as used by `api`)."""
+        return [host if port == 80 else f"{host}:{port}"
+                for host, port in self._devices]
+
+    @property
+    def devices(self) -> dict[str, VirtualDevice]:
+        """Return the virtual devices by addr."""
+        return dict(zip(self.addresses, self._devices.values()))
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return counts of requests served, dropped and restarts."""
+        return dict(self._stats)
+
+    def _route(self, device: VirtualDevice, method: str, path: str,
+               body: bytes) -> tuple[int, dict | None]:
+        """Return the (status code, JSON body) for a request."""
+        path = path.split('?', 1)[0].rstrip('/')
+        routes = {
+            ("GET", "/api/system/info"): lambda: device.info(),
+            ("GET", "/api/system/asic"): lambda: device.asic(),
+            ("GET", "/api/system/statistics"):
+                lambda: device.statistics(rows=12),
+            ("GET", "/api/system/statistics/dashboard"):
+                lambda: device.statistics(DASHBOARD, labels=False),
+        }
+        if (method, path) in routes:
+            return 200, routes[(method, path)]()
+        if (method, path) == ("PATCH", "/api/system"):
+            try:
+                device.patch(json.loads(body or b"{}"))
+            except (ValueError, AttributeError) as e:
+                return 400, {"error": str(e)}
+            return 200, None
+        if (method, path) == ("POST", "/api/system/restart"):
+            return 200, {"message": "System will restart shortly."}
+        if path in {route for _, route in routes} | {"/api/system",
+                                                      "/api/system/restart"}:
+            return 405, None
+        return 404, None
+
+    async def _handle(self, address: tuple[str, int],
+                      reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on a single connection."""
+        device = self._devices[address]
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = lines[0].split(' ', 2)
+                headers = {key.strip().lower(): value.strip()
+                           for key, _, value in (line.partition(':')
+                                                 for line in lines[1:] if line)}
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b''
+                if address not in self._servers:
+                    return  # restarting; drop open (keep-alive) connections
+
+                self._stats["requests"] += 1
+                if self._latency or self._jitter:
+                    await asyncio.sleep(max(
+                        0, self._latency + self._random.uniform(
+                            -self._jitter, self._jitter)))
+                if self._random.random() < self._failure_rate:
+                    self._stats["dropped"] += 1
+                    return  # drop the connection without a response
+
+                try:
+                    status, data = self._route(device, method, path, body)
+                except Exception as e:
+                    status, data = 500, {"error": str(e)}
+                content = json.dumps(data).encode() if data is not None else b''
+                close = headers.get("connection", '').lower() == "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n".encode()
+                    + b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(content)}\r\n".encode()
+                    + (b"Connection: close\r\n" if close else b'')
+                    + b"\r\n" + content)
+                await writer.drain()
+
+                if path.startswith("/api/system/restart") and status == 200:
+                    restart = asyncio.create_task(self._restart(address))
+                    self._restarts.add(restart)
+                    restart.add_done_callback(self._restarts.discard)
+                    return
+                if close:
+                    return
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _listen(self, address: tuple[str, int]) -> None:
+        """Start the listener of a device."""
+        self._servers[address] = await asyncio.start_server(
+            lambda r, w: self._handle(address, r, w), *address,
+            reuse_address=True)
+
+    async def _restart(self, address: tuple[str, int]) -> None:
+        """Take a device offline for the restart downtime, then boot it."""
+        self._stats["restarts"] += 1
+        if server := self._servers.pop(address, None):
+            server.close()
+        await asyncio.sleep(self._restart_downtime)
+        self._devices[address].restart()
+        if self._stopped and not self._stopped.is_set():
+            await self._listen(address)
+
+    async def serve(self) -> None:
+        """Serve every device on the running event loop until stopped."""
+        self._stopped = self._stopped or asyncio.Event()
+        try:
+            await asyncio.gather(*map(self._listen, self._devices))
+            await self._stopped.wait()
+        finally:
+            for server in self._servers.values():
+                server.close()
+            self._servers.clear()
+            for task in [*self._restarts]:
+                task.cancel()
+            # NOTE: connections are closed (not cancelled) so each handler
+            # sees EOF and exits cleanly
+            handlers = [*self._connections.values()]
+            for writer in [*self._connections]:
+                writer.close()
+            await asyncio.gather(*self._restarts, *handlers,
+                                 return_exceptions=True)
+            self._stopped = None
+
+    def start(self, timeout: float = 30) -> None:
+        """Serve on a background thread once every device is listening.
+
+        Args:
+            timeout: Seconds to wait for the listeners (default=30).
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._loop = asyncio.new_event_loop()
+        self._stopped = asyncio.Event()
+
+        def _run() -> None:
+            try:
+                self._loop.run_until_complete(self.serve())
+            finally:
+                self._loop.close()
+
+        self._thread = Thread(target=_run, name="axeprof-simulator",
+                              daemon=True)
+        self._thread.start()
+        deadline = monotonic() + timeout
+        while (len(self._servers) < len(self._devices)
+               and self._thread.is_alive() and monotonic() < deadline):
+            self._thread.join(0.01)
+
+    def join(self, timeout: float | None = None) -> None:
+        """Block until the background thread exits (or the timeout passes)."""
+        if self._thread:
+            self._thread.join(timeout)
+
+    def stop(self, timeout: float | None = 5) -> None:
+        """Stop serving and wait for the background thread to exit.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit (default=5).
+        """
+        if self._loop and self._stopped and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,338 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Profile storage backends. Both stores share the same methods so the CLI can
+# use either one; the backend is chosen by the `store` key in `.config`:
+#   "directory" (default): one JSON file per profile in `profile_dir`
+#   "sqlite": every profile in a single database at `profile_db`
+
+import sqlite3
+from os import path, remove
+from threading import Lock
+from typing import Iterable
+
+from axeprofiler import metrics
+from axeprofiler.index import ProfileIndex
+from axeprofiler.profiles import Profile, validate_profile
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    profile_name TEXT PRIMARY KEY,
+    hostname TEXT NOT NULL,
+    frequency INTEGER NOT NULL,
+    coreVoltage INTEGER NOT NULL,
+    fanspeed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_hostname ON profiles (hostname);
+"""
+COLUMNS = ("profile_name", "hostname", "frequency", "coreVoltage", "fanspeed")
+
+
+class DirectoryStore():
+    """
+    Store profiles as one JSON file each in a profile directory.
+
+    Args:
+        profile_dir: The directory where profiles are saved.
+
+    Methods:
+        names: Return a sorted list of the saved profile names.
+        exists: Return True if a profile is saved under the given name.
+        load: Load a saved profile.
+        find_by_hostname: Return all profiles for a device hostname.
+        save: Save a profile.
+        save_many: Save many profiles at once.
+        delete: Delete a saved profile.
+        refresh: Sync and warm the cached profile index.
+    """
+    def __init__(self, profile_dir: str):
+        self._profile_dir = profile_dir
+        self._index = ProfileIndex(profile_dir)  # cached profiles
+
+    def __repr__(self):
+        return f"DirectoryStore({self._profile_dir})"
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def location(self) -> str:
+        """Return where profiles are saved."""
+        return self._profile_dir
+
+    def names(self, offset: int = 0, limit: int | None = None) -> list[str]:
+        """Return a sorted list of the saved profile names.
+
+        Args:
+            offset: The number of names to skip (default=0).
+            limit: The max number of names to return, else all (default=None).
+        """
+        return [filename.removesuffix(".json")
+                for filename in self._index.page(offset, limit)]
+
+    def exists(self, name: str) -> bool:
+        """Return True if a profile is saved under the given name."""
+        return validate_profile(self._profile_dir, name)
+
+    def load(self, name: str) -> Profile:
+        """Load a saved profile.
+
+        Args:
+            name: The name of the profile to load.
+
+        Raises:
+            FileNotFoundError: if no profile is found for the given name.
+        """
+        with metrics.timer("axeprof_profile_io_seconds", backend="directory",
+                           op="load"):
+            return self._index.get(f"{name}.json")
+
+    def find_by_hostname(self, hostname: str) -> list[Profile]:
+        """Return all saved profiles for the given device hostname."""
+        return [profile for profile in map(self.load, self.names())
+                if profile.hostname == hostname]
+
+    def save(self, profile: Profile, replace: str | None = None) -> None:
+        """Save a profile, optionally replacing (renaming) an existing one.
+
+        Args:
+            profile: The profile to save.
+            replace: The name of the profile to replace (default=None).
+        """
+        with metrics.timer("axeprof_profile_io_seconds", backend="directory",
+                           op="save"):
+            profile.save_profile(profile_dir=self._profile_dir,
+                                 replace=replace)
+        self._index.invalidate(f"{profile.name}.json")
+        if replace:
+            self._index.invalidate(f"{replace}.json")
+
+    def save_many(self, profiles: Iterable[Profile]) -> int:
+        """Save many profiles and return the number saved."""
+        count = 0
+        with metrics.timer("axeprof_profile_io_seconds", backend="directory",
+                           op="save_many"):
+            for count, profile in enumerate(profiles, start=1):
+                profile.save_profile(profile_dir=self._profile_dir)
+                self._index.invalidate(f"{profile.name}.json")
+        return count
+
+    def delete(self, name: str) -> None:
+        """Delete a saved profile.
+
+        Raises:
+            FileNotFoundError: if no profile is found for the given name.
+        """
+        remove(f"{self._profile_dir}{name}.json")
+        self._index.invalidate(f"{name}.json")
+
+    def refresh(self) -> None:
+        """Sync the profile index with disk and parse new/changed profiles."""
+        self._index.warm()
+
+
+class SQLiteStore():
+    """
+    Store every profile in a single SQLite database.
+
+    Profiles are indexed by name (primary key) and hostname, and bulk saves are
+    made in a single transaction.
+
+    Args:
+        db_path: The path to the database file.
+
+    Methods:
+        names: Return a sorted list of the saved profile names.
+        exists: Return True if a profile is saved under the given name.
+        load: Load a saved profile.
+        find_by_hostname: Return all profiles for a device hostname.
+        save: Save a profile.
+        save_many: Save many profiles in one transaction.
+        delete: Delete a saved profile.
+        refresh: No-op; the database is always in sync.
+        close: Close the database connection.
+    """
+    def __init__(self, db_path: str):
+        self._db_path = db_path
+        self._lock = Lock()  # NOTE connection is shared with worker threads
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def __repr__(self):
+        return f"SQLiteStore({self._db_path})"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    @property
+    def location(self) -> str:
+        """Return where profiles are saved."""
+        return self._db_path
+
+    def names(self, offset: int = 0, limit: int | None = None) -> list[str]:
+        """Return a sorted list of the saved profile names.
+
+        Args:
+            offset: The number of names to skip (default=0).
+            limit: The max number of names to return, else all (default=None).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT profile_name FROM profiles ORDER BY profile_name "
+                + "LIMIT ? OFFSET ?", (-1 if limit is None else limit, offset))
+            return [row[0] for row in rows]
+
+    def exists(self, name: str) -> bool:
+        """Return True if a profile is saved under the given name."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM profiles WHERE profile_name = ?", (name,)
+            ).fetchone() is not None
+
+    def load(self, name: str) -> Profile:
+        """Load a saved profile.
+
+        Args:
+            name: The name of the profile to load.
+
+        Raises:
+            FileNotFoundError: if no profile is found for the given name.
+        """
+        with metrics.timer("axeprof_profile_io_seconds", backend="sqlite",
+                           op="load"), self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM profiles "
+                + "WHERE profile_name = ?", (name,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"No profile named: {name}")
+        return Profile(*row)
+
+    def find_by_hostname(self, hostname: str) -> list[Profile]:
+        """Return all saved profiles for the given device hostname."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM profiles "
+                + "WHERE hostname = ? ORDER BY profile_name", (hostname,))
+            return [Profile(*row) for row in rows]
+
+    def save(self, profile: Profile, replace: str | None = None) -> None:
+        """Save a profile, optionally replacing (renaming) an existing one.
+
+        Args:
+            profile: The profile to save.
+            replace: The name of the profile to replace (default=None).
+        """
+        with metrics.timer("axeprof_profile_io_seconds", backend="sqlite",
+                           op="save"), self._lock, self._conn:
+            if replace and replace != profile.name:
+                self._conn.execute(
+                    "DELETE FROM profiles WHERE profile_name = ?", (replace,))
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO profiles ({', '.join(COLUMNS)}) "
+                + "VALUES (?, ?, ?, ?, ?)",
+                tuple(profile.data[col] for col in COLUMNS))
+
+    def save_many(self, profiles: Iterable[Profile]) -> int:
+        """Save many profiles in one transaction and return the number saved."""
+        rows = [tuple(profile.data[col] for col in COLUMNS)
+                for profile in profiles]
+        with metrics.timer("axeprof_profile_io_seconds", backend="sqlite",
+                           op="save_many"), self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO profiles ({', '.join(COLUMNS)}) "
+                + "VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def delete(self, name: str) -> None:
+        """Delete a saved profile.
+
+        Raises:
+            FileNotFoundError: if no profile is found for the given name.
+        """
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM profiles WHERE profile_name = ?", (name,)
+            ).rowcount
+        if not deleted:
+            raise FileNotFoundError(f"No profile named: {name}")
+
+    def refresh(self) -> None:
+        """No-op; the database is always in sync."""
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_directory(profile_dir: str, store: SQLiteStore) -> int:
+    """Copy every profile in a profile directory into a `SQLiteStore`.
+
+    Files that don't contain a valid profile are skipped.
+
+    Args:
+        profile_dir: The directory where profiles are saved.
+        store: The store to copy the profiles into.
+
+    Returns:
+        The number of profiles migrated.
+    """
+    index = ProfileIndex(profile_dir)
+    profiles = []
+    for filename in index.names:
+        try:
+            profiles.append(index.get(filename))
+        except (AttributeError, ValueError):  # invalid profile data
+            continue
+    return store.save_many(profiles)
+
+
+def open_store(config: dict[str, str]) -> DirectoryStore | SQLiteStore:
+    """Return the profile store selected by the program config.
+
+    When the SQLite store is used for the first time, the profiles already
+    saved in `profile_dir` are migrated into the new database.
+
+    Args:
+        config: The program config (see `Cli`).
+
+    Returns:
+        The configured store.
+
+    Raises:
+        ValueError: if an unknown store is configured.
+    """
+    profile_dir = config["profile_dir"]
+    match config.get("store", "directory"):
+        case "directory":
+            return DirectoryStore(profile_dir)
+        case "sqlite":
+            db_path = config.get("profile_db") or (
+                f"{profile_dir.rstrip('/')}.db")
+            new_db = not path.exists(db_path)
+            store = SQLiteStore(db_path)
+            if new_db and path.isdir(profile_dir):
+                migrate_directory(profile_dir, store)
+            return store
+        case store:
+            raise ValueError(f"Unknown profile store: {store}")
@@ -0,0 +1,308 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+
+import heapq
+import random
+import asyncio
+from threading import Thread
+from typing import Callable
+from time import monotonic, process_time, time
+
+from axeprofiler.aio import AsyncClient
+from axeprofiler.timeseries import SAMPLE, SeriesStore
+
+
+# NOTE: the `dashboard` route sends its rows without `labels`, in this order
+DASHBOARD_COLUMNS = ("hashrate", "asicTemp", "power", "timestamp")
+
+
+def parse_statistics(payload: dict) -> SAMPLE:
+    """Return the latest sample from a `statistics` (or `dashboard`) payload.
+
+    AxeOS returns statistics as rows of `statistics`, the last row being the
+    most recent, with their column `labels` (the `dashboard` route omits
+    these, so its columns are mapped by `DASHBOARD_COLUMNS`). Flat payloads of
+    numeric values are also accepted as-is.
+
+    Args:
+        payload: The parsed JSON response body.
+
+    Returns:
+        A dict of metric name -> value.
+    """
+    labels, rows = payload.get("labels"), payload.get("statistics")
+    if rows and isinstance(rows, list) and isinstance(rows[-1], list):
+        labels = labels or DASHBOARD_COLUMNS
+        return {label: float(value) for label, value in zip(labels, rows[-1])
+                if isinstance(value, (int, float))}
+    return {key: float(value) for key, value in payload.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)}
+
+
+class SampleStore(SeriesStore):
+    """
+    Store of the most recent samples per device.
+
+    Kept for compatibility: this is a `timeseries.SeriesStore` with only a raw
+    tier, so samples are normalized to `timeseries.METRICS`.
+
+    Args:
+        maxlen: The max number of samples kept per device (default=360).
+    """
+    def __init__(self, maxlen: int = 360):
+        super().__init__(tiers={"raw": (maxlen, 0)})
+        self._maxlen = maxlen
+
+    def __repr__(self):
+        return f"SampleStore({self._maxlen})"
+
+
+class Poller():
+    """
+    Background poller that samples the statistics of every device.
+
+    Polling is tiered to keep bytes on the wire (and load on the ESP32) low:
+    every poll hits the lightweight `dashboard` route, while the full `info`
+    document is only fetched the first time a device is seen, every
+    `info_interval` seconds, or when a change is detected (the device comes
+    back after failing or its hashrate moves by more than `change_threshold`).
+
+    Each device is polled once per `interval` on its own jittered schedule, so
+    requests are spread out rather than fired all at once. The poller stays
+    within a fixed budget: at most `max_sockets` requests are in flight, and
+    polling pauses for the rest of an interval once the process has used
+    `cpu_budget` of a CPU during it. Polls that can't be made on time (device
+    still in flight, over budget, or the loop fell behind) are skipped and
+    counted rather than queued.
+
+    Args:
+        ips: The IP addrs of the devices to poll.
+        interval: Seconds between polls of each device (default=10).
+        jitter: Fraction of `interval` each poll may drift (default=0.1).
+        max_sockets: The max number of requests in flight (default=64).
+        cpu_budget: The max fraction of a CPU to use (default=0.25).
+        store: Where samples are stored (default=new `SeriesStore`).
+        on_sample: Optional callback for each sample (default=None).
+        endpoint: The route to poll (default="dashboard").
+        info_interval: Seconds between `info` fetches per device, else only on
+            change (default=300).
+        change_threshold: Relative hashrate change that triggers an `info`
+            fetch (default=0.25).
+        on_info: Optional callback for each `info` document (default=None).
+        on_error: Optional callback for each failed poll (default=None).
+
+    Methods:
+        start: Start polling on a background thread.
+        stop: Stop polling.
+        join: Block until the background thread exits.
+        run: Poll on the running event loop until stopped.
+        info: Return the last `info` document fetched for a device.
+    """
+    def __init__(self, ips: list[str], interval: float = 10,
+                 jitter: float = 0.1, max_sockets: int = 64,
+                 cpu_budget: float = 0.25, store: SeriesStore | None = None,
+                 on_sample: Callable[[str, float, SAMPLE], None] | None = None,
+                 endpoint: str = "dashboard",
+                 info_interval: float | None = 300,
+                 change_threshold: float = 0.25,
+                 on_info: Callable[[str, dict], None] | None = None,
+                 on_error: Callable[[str, Exception], None] | None = None):
+        self._ips = [*ips]
+        self._interval = interval
+        self._jitter = jitter
+        self._max_sockets = max_sockets
+        self._cpu_budget = cpu_budget
+        self._store = store if store is not None else SeriesStore()
+        self._on_sample = on_sample
+        self._endpoint = endpoint
+        self._info_interval = info_interval
+        self._change_threshold = change_threshold
+        self._on_info = on_info
+        self._on_error = on_error
+        self._client = AsyncClient(limit=max_sockets,
+                                   connect_timeout=min(3.05, interval / 2),
+                                   read_timeout=min(5, interval))
+        self._stats = {"polls": 0, "errors": 0, "skipped": 0,
+                       "info_polls": 0, "bytes": 0}
+        self._errors: dict[str, str] = {}  # last error per device
+        self._info: dict[str, dict] = {}  # last info document per device
+        self._info_due: dict[str, float] = {}  # next info fetch (monotonic)
+        self._hashrates: dict[str, float] = {}  # last hashrate per device
+        self._in_flight: set[str] = set()
+        self._stopped: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: Thread | None = None
+
+    def __repr__(self):
+        return f"Poller({len(self._ips)} devices, {self._interval})"
+
+    @property
+    def store(self) -> SeriesStore:
+        """Return the sample store."""
+        return self._store
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        Return counts of polls made, errors, skipped polls, `info` fetches
+        and response bytes received.
+        """
+        return dict(self._stats)
+
+    def info(self, ip: str) -> dict | None:
+        """Return the last `info` document fetched for a device."""
+        return self._info.get(ip)
+
+    @property
+    def errors(self) -> dict[str, str]:
+        """Return the last error for each device whose last poll failed."""
+        return dict(self._errors)
+
+    def _next_due(self, due: float) -> float:
+        """Return when a device is next due after the given due time."""
+        return due + self._interval * (
+            1 + random.uniform(-self._jitter, self._jitter))
+
+    def _changed(self, ip: str, sample: SAMPLE) -> bool:
+        """Return True if a device needs its `info` re-fetched."""
+        hashrate = sample.get("hashrate", sample.get("hashRate"))
+        last = self._hashrates.get(ip)
+        if hashrate is not None:
+            self._hashrates[ip] = hashrate
+
+        if ip not in self._info or ip in self._errors:  # new or recovered
+            return True
+        if self._info_interval and monotonic() >= self._info_due[ip]:
+            return True
+        if hashrate is None or not last:
+            return False
+        return abs(hashrate - last) / last > self._change_threshold
+
+    async def _poll_info(self, ip: str) -> None:
+        """Fetch and keep the full `info` document for a device."""
+        res = await self._client.request(ip, "info")
+        self._stats["info_polls"] += 1
+        self._stats["bytes"] += len(res.content)
+        self._info[ip] = info = res.json()
+        self._info_due[ip] = monotonic() + (self._info_interval or 0)
+        if self._on_info:
+            self._on_info(ip, info)
+
+    async def _poll(self, ip: str) -> None:
+        """Poll a single device and store its sample."""
+        try:
+            res = await self._client.request(ip, self._endpoint)
+            self._stats["bytes"] += len(res.content)
+            sample = parse_statistics(res.json())
+            timestamp = time()
+            self._store.add(ip, timestamp, sample)
+            if self._changed(ip, sample):
+                await self._poll_info(ip)
+            self._errors.pop(ip, None)
+            if self._on_sample:
+                self._on_sample(ip, timestamp, sample)
+        except Exception as e:
+            self._stats["errors"] += 1
+            self._errors[ip] = str(e) or type(e).__name__
+            if self._on_error:
+                self._on_error(ip, e)
+        finally:
+            self._stats["polls"] += 1
+            self._in_flight.discard(ip)
+
+    async def run(self) -> None:
+        """Poll every device on the running event loop until stopped."""
+        self._stopped = self._stopped or asyncio.Event()
+        now = monotonic()
+        # Spread the first polls over one interval
+        schedule = [(now + random.uniform(0, self._interval), ip)
+                    for ip in self._ips]
+        heapq.heapify(schedule)
+        window, cpu_start = now, process_time()
+        tasks: set[asyncio.Task] = set()
+
+        while schedule and not self._stopped.is_set():
+            due, ip = schedule[0]
+            if (wait := due - monotonic()) > 0:
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), wait)
+                    break  # stopped
+                except TimeoutError:
+                    pass
+
+            now = monotonic()
+            if now - window >= self._interval:  # start a new budget window
+                window, cpu_start = now, process_time()
+            over_budget = (process_time() - cpu_start
+                           > self._cpu_budget * self._interval)
+
+            heapq.heappop(schedule)
+            if now - due >= self._interval:  # fell behind; drop missed polls
+                missed = int((now - due) // self._interval)
+                self._stats["skipped"] += missed
+                due += missed * self._interval
+            if (over_budget or ip in self._in_flight
+                    or len(self._in_flight) >= self._max_sockets):
+                self._stats["skipped"] += 1
+            else:
+                self._in_flight.add(ip)
+                task = asyncio.create_task(self._poll(ip))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            heapq.heappush(schedule, (self._next_due(due), ip))
+
+        for task in [*tasks]:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._stopped = None
+
+    def start(self) -> None:
+        """Start polling on a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        # NOTE: created here so `stop()` works even before the thread runs
+        self._loop = asyncio.new_event_loop()
+        self._stopped = asyncio.Event()
+
+        def _run() -> None:
+            try:
+                self._loop.run_until_complete(self.run())
+            finally:
+                self._loop.close()
+
+        self._thread = Thread(target=_run, name="axeprof-poller", daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        """Block until the background thread exits (or the timeout passes)."""
+        if self._thread:
+            self._thread.join(timeout)
+
+    def stop(self, timeout: float | None = 5) -> None:
+        """Stop polling and wait for the background thread to exit.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit (default=5).
+        """
+        if self._loop and self._stopped and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,386 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Compact time series storage for device telemetry. Each device keeps three
+# fixed-capacity ring buffer tiers (raw samples, 1 minute and 1 hour means) made
+# of `array` columns: a float64 column of timestamps plus a float32 column per
+# metric. With the default capacities that's ~100KB per device for 1 hour of
+# raw 10s samples, 1 day of minutes and 8 weeks of hours.
+#
+# File format (see `SeriesStore.save()`):
+#   MAGIC | header length (uint32 LE) | JSON header | columns...
+# Columns are written back to back in header order so the file can be memory
+# mapped and each column copied straight into its array on load.
+
+import json
+import mmap
+import struct
+from array import array
+from math import floor, isnan, nan
+from os import fsync, path, replace
+from threading import Lock
+from typing import TypeAlias
+
+
+SAMPLE: TypeAlias = dict[str, float]  # metric name: value
+MAGIC = b"AXTS1\n"
+METRICS = ("hashrate", "asicTemp", "vrTemp", "power", "voltage", "fanrpm")
+ALIASES = {  # alternate names used by other routes/firmware versions
+    "hashRate": "hashrate",
+    "temp": "asicTemp",
+    "fanRPM": "fanrpm",
+    "fanSpeedRpm": "fanrpm"
+}
+TIERS = {  # tier: (capacity, step seconds); raw keeps every sample
+    "raw": (360, 0),
+    "minute": (1440, 60),
+    "hour": (1344, 3600)
+}
+
+
+class Tier():
+    """
+    A fixed-capacity ring buffer of rows, stored column by column.
+
+    Args:
+        capacity: The max number of rows retained.
+        metrics: The metric columns to store.
+
+    Methods:
+        append: Append a row, overwriting the oldest once full.
+        rows: Return the retained rows, oldest first.
+        series: Return the retained (timestamp, value) pairs for a metric.
+    """
+    def __init__(self, capacity: int, metrics: tuple[str, ...]):
+        self._capacity = capacity
+        self._metrics = metrics
+        self.times = array('d', [nan]) * capacity
+        self.columns = {metric: array('f', [nan]) * capacity
+                        for metric in metrics}
+        self.head = 0  # next write position
+        self.count = 0
+
+    def __repr__(self):
+        return f"Tier({self._capacity}, {self.count} rows)"
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def capacity(self) -> int:
+        """Return the max number of rows retained."""
+        return self._capacity
+
+    def append(self, timestamp: float, sample: SAMPLE) -> None:
+        """Append a row, overwriting the oldest once full.
+
+        Args:
+            timestamp: The (unix) time of the row.
+            sample: The metric values; missing metrics are stored as NaN.
+        """
+        i = self.head
+        self.times[i] = timestamp
+        for metric, column in self.columns.items():
+            column[i] = sample.get(metric, nan)
+        self.head = (i + 1) % self._capacity
+        self.count = min(self.count + 1, self._capacity)
+
+    def _positions(self) -> range | list[int]:
+        """Return the column positions of the retained rows, oldest first."""
+        if self.count < self._capacity:
+            return range(self.count)
+        return [*range(self.head, self._capacity), *range(self.head)]
+
+    def rows(self, since: float | None = None) -> list[tuple[float, SAMPLE]]:
+        """Return the retained (timestamp, sample) rows, oldest first.
+
+        Args:
+            since: Only return rows at or after this time (default=None).
+        """
+        rows = []
+        for i in self._positions():
+            if since is not None and self.times[i] < since:
+                continue
+            rows.append((self.times[i], {
+                metric: column[i] for metric, column in self.columns.items()
+                if not isnan(column[i])
+            }))
+        return rows
+
+    def series(self, metric: str) -> list[tuple[float, float]]:
+        """Return the retained (timestamp, value) pairs for a metric."""
+        column = self.columns[metric]
+        return [(self.times[i], column[i]) for i in self._positions()
+                if not isnan(column[i])]
+
+
+class DeviceSeries():
+    """
+    The raw and downsampled tiers for a single device.
+
+    Each sample is written to the raw tier and added to the running mean of
+    the current minute/hour bucket; when a sample falls in a new bucket, the
+    previous bucket's means are appended to its tier.
+
+    Args:
+        metrics: The metric columns to store.
+        tiers: The tier capacities and steps (default=TIERS).
+    """
+    def __init__(self, metrics: tuple[str, ...],
+                 tiers: dict[str, tuple[int, int]] = TIERS):
+        self._metrics = metrics
+        self._steps = {name: step for name, (_, step) in tiers.items()}
+        self.tiers = {name: Tier(capacity, metrics)
+                      for name, (capacity, _) in tiers.items()}
+        # tier: [bucket start, per-metric sums, per-metric counts]
+        self._buckets: dict[str, list] = {}
+
+    def __repr__(self):
+        return f"DeviceSeries({', '.join(map(repr, self.tiers.values()))})"
+
+    def add(self, timestamp: float, sample: SAMPLE) -> None:
+        """Add a sample to every tier."""
+        for name, tier in self.tiers.items():
+            if not (step := self._steps[name]):
+                tier.append(timestamp, sample)
+                continue
+
+            start = floor(timestamp / step) * step
+            bucket = self._buckets.get(name)
+            if bucket and bucket[0] != start:
+                self._flush(name)
+                bucket = None
+            if bucket is None:
+                bucket = self._buckets[name] = [
+                    start, dict.fromkeys(self._metrics, 0.0),
+                    dict.fromkeys(self._metrics, 0)]
+            for metric in self._metrics:
+                if (value := sample.get(metric)) is not None:
+                    bucket[1][metric] += value
+                    bucket[2][metric] += 1
+
+    def _flush(self, name: str) -> None:
+        """Append the mean of the current bucket to its tier."""
+        start, sums, counts = self._buckets.pop(name)
+        self.tiers[name].append(start, {
+            metric: sums[metric] / counts[metric]
+            for metric in self._metrics if counts[metric]
+        })
+
+
+class SeriesStore():
+    """
+    Thread-safe, columnar time series store for device telemetry.
+
+    Drop-in store for `telemetry.Poller`: samples are normalized to `metrics`
+    (see `ALIASES`), and everything else is dropped.
+
+    Args:
+        metrics: The metrics to store (default=METRICS).
+        tiers: The tier capacities and steps (default=TIERS).
+
+    Methods:
+        add: Add a sample for a device.
+        latest: Return the most recent sample for a device.
+        samples: Return the raw samples for a device.
+        series: Return a single metric from any tier for a device.
+        save: Write the store to a file.
+        load: Read a store from a file.
+    """
+    def __init__(self, metrics: tuple[str, ...] = METRICS,
+                 tiers: dict[str, tuple[int, int]] = TIERS):
+        self._metrics = tuple(metrics)
+        self._tiers = dict(tiers)
+        self._devices: dict[str, DeviceSeries] = {}
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f"SeriesStore({len(self._devices)} devices)"
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    @property
+    def metrics(self) -> tuple[str, ...]:
+        """Return the stored metrics."""
+        return self._metrics
+
+    @property
+    def devices(self) -> list[str]:
+        """Return the devices with samples."""
+        return [*self._devices]
+
+    @property
+    def nbytes(self) -> int:
+        """Return the bytes used by all columns."""
+        return sum(
+            len(tier.times) * tier.times.itemsize
+            + sum(len(col) * col.itemsize for col in tier.columns.values())
+            for device in self._devices.values()
+            for tier in device.tiers.values()
+        )
+
+    def _device(self, ip: str) -> DeviceSeries:
+        """Return the series for a device, creating it if needed."""
+        if (device := self._devices.get(ip)) is None:
+            device = self._devices[ip] = DeviceSeries(self._metrics,
+                                                      self._tiers)
+        return device
+
+    def add(self, ip: str, timestamp: float, sample: SAMPLE) -> None:
+        """Add a sample for a device.
+
+        Args:
+            ip: The IP of the device.
+            timestamp: The (unix) time of the sample.
+            sample: The metrics sampled.
+        """
+        normalized = {ALIASES.get(key, key): value
+                      for key, value in sample.items()}
+        with self._lock:
+            self._device(ip).add(timestamp, normalized)
+
+    def latest(self, ip: str) -> tuple[float, SAMPLE] | None:
+        """Return the most recent (timestamp, sample) for a device."""
+        with self._lock:
+            if (device := self._devices.get(ip)) is None:
+                return None
+            raw = device.tiers["raw"]
+            if not raw.count:
+                return None
+            i = (raw.head - 1) % raw.capacity
+            return raw.times[i], {
+                metric: column[i] for metric, column in raw.columns.items()
+                if not isnan(column[i])
+            }
+
+    def samples(self, ip: str, tier: str = "raw",
+                since: float | None = None) -> list[tuple[float, SAMPLE]]:
+        """Return the retained (timestamp, sample) rows for a device.
+
+        Args:
+            ip: The IP of the device.
+            tier: The tier to read (default="raw").
+            since: Only return rows at or after this time (default=None).
+        """
+        with self._lock:
+            if (device := self._devices.get(ip)) is None:
+                return []
+            return device.tiers[tier].rows(since)
+
+    def series(self, ip: str, metric: str,
+               tier: str = "raw") -> list[tuple[float, float]]:
+        """Return the (timestamp, value) pairs of a metric for a device.
+
+        Args:
+            ip: The IP of the device.
+            metric: The metric to read.
+            tier: The tier to read (default="raw").
+        """
+        with self._lock:
+            if (device := self._devices.get(ip)) is None:
+                return []
+            return device.tiers[tier].series(metric)
+
+    def save(self, filepath: str) -> None:
+        """Write the store to a file (atomically).
+
+        NOTE: samples still being averaged into a minute/hour bucket are not
+        written.
+
+        Args:
+            filepath: The file to write.
+        """
+        with self._lock:
+            header = {
+                "metrics": self._metrics,
+                "tiers": self._tiers,
+                "devices": {
+                    ip: {name: [tier.head, tier.count]
+                         for name, tier in device.tiers.items()}
+                    for ip, device in self._devices.items()
+                }
+            }
+            encoded = json.dumps(header).encode()
+            with open(f"{filepath}.tmp", "wb") as f:
+                f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+                for device in self._devices.values():
+                    for tier in device.tiers.values():
+                        tier.times.tofile(f)
+                        for column in tier.columns.values():
+                            column.tofile(f)
+                # NOTE: on disk before the rename, so a crash can't leave a
+                # truncated store in place of the old one
+                f.flush()
+                fsync(f.fileno())
+            replace(f"{filepath}.tmp", filepath)
+
+    @classmethod
+    def load(cls, filepath: str) -> "SeriesStore":
+        """Read a store from a file written by `save()`.
+
+        Args:
+            filepath: The file to read.
+
+        Returns:
+            A new `SeriesStore`, or an empty one if the file doesn't exist.
+
+        Raises:
+            ValueError: if the file is not a valid series store (or it's
+                truncated).
+        """
+        if not path.exists(filepath):
+            return cls()
+
+        with open(filepath, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not a series store: {filepath}")
+            offset = len(MAGIC) + 4
+            (size,) = struct.unpack("<I", mm[len(MAGIC):offset])
+            header = json.loads(mm[offset:offset + size])
+            offset += size
+
+            store = cls(tuple(header["metrics"]),
+                        {name: tuple(tier)
+                         for name, tier in header["tiers"].items()})
+            # Every device holds the same (fixed-capacity) columns
+            template = DeviceSeries(store._metrics, store._tiers)
+            device_size = sum(
+                len(column) * column.itemsize
+                for tier in template.tiers.values()
+                for column in (tier.times, *tier.columns.values()))
+            expected = offset + device_size * len(header["devices"])
+            if len(mm) != expected:
+                raise ValueError(f"Corrupt series store: {filepath} is "
+                                 + f"{len(mm)} bytes, expected {expected}")
+            view = memoryview(mm)
+            try:
+                for ip, positions in header["devices"].items():
+                    device = store._device(ip)
+                    for name, tier in device.tiers.items():
+                        tier.head, tier.count = positions[name]
+                        for column in (tier.times, *tier.columns.values()):
+                            nbytes = len(column) * column.itemsize
+                            del column[:]
+                            column.frombytes(view[offset:offset + nbytes])
+                            offset += nbytes
+            finally:
+                view.release()
+        return store
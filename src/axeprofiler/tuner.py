@@ -0,0 +1,314 @@
+# AxeProfiler is a program designed to make saving/switching configurations for
+# bitcoin miner devices simpler and more efficient.
+
+# Copyright (C) 2025 [DC] Celshade <ggcelshade@gmail.com>
+
+# This file is part of AxeProfiler.
+
+# AxeProfiler is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+
+# AxeProfiler is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License along with
+# AxeProfiler. If not, see <https://www.gnu.org/licenses/>.
+# ---
+# Automated frequency/coreVoltage tuning. Each trial applies a setting with
+# `Profile.run_profile()`, waits for the device to settle, then averages a few
+# statistics samples. The best trial is the lowest J/TH (W / TH/s) that stays
+# under the temperature limit (and above an optional hashrate floor).
+
+from time import sleep
+from typing import Callable, TypeAlias
+from concurrent.futures import ThreadPoolExecutor
+
+from axeprofiler.api import request
+from axeprofiler.infocache import get_cache
+from axeprofiler.profiles import (RESTART_SETTINGS, SETTINGS, Profile,
+                                  active_settings)
+from axeprofiler.telemetry import parse_statistics
+from axeprofiler.timeseries import ALIASES
+
+
+TRIAL: TypeAlias = dict[str, int | float | str | None]  # trial result format
+RESTORE_KEYS = (*SETTINGS, "autofanspeed")  # raw `info` settings restored
+
+
+def parse_range(spec: str) -> list[int]:
+    """Return the values for a `start:stop:step` (inclusive) or `a,b,c` spec.
+
+    Raises:
+        ValueError: if the spec is malformed.
+    """
+    if ':' in spec:
+        start, stop, step = map(int, spec.split(':'))
+        if step <= 0 or stop < start:
+            raise ValueError(f"Invalid range: {spec}")
+        return [*range(start, stop + 1, step)]
+    return [int(value) for value in spec.split(',')]
+
+
+def measure(ip: str, samples: int = 3, interval: float = 10) -> TRIAL:
+    """Return the average hashrate, power and temp of a device.
+
+    Args:
+        ip: The IP of the device.
+        samples: The number of samples to average (default=3).
+        interval: Seconds between samples (default=10).
+
+    Returns:
+        A dict of `hashrate` (GH/s), `power` (W), `temp` (C) and `efficiency`
+        (J/TH, else `None` if there is no hashrate).
+
+    Raises:
+        ValueError: if `samples` is less than 1.
+    """
+    if samples < 1:
+        raise ValueError("`samples` must be at least 1")
+    totals = {"hashrate": 0.0, "power": 0.0, "asicTemp": 0.0}
+    for i in range(samples):
+        if i:
+            sleep(interval)
+        sample = parse_statistics(request(ip, "statistics").json())
+        sample = {ALIASES.get(key, key): value for key, value in sample.items()}
+        for key in totals:
+            totals[key] += sample.get(key, 0.0)
+
+    hashrate, power, temp = (totals[key] / samples for key in totals)
+    return {
+        "hashrate": round(hashrate, 2),
+        "power": round(power, 2),
+        "temp": round(temp, 1),
+        "efficiency": round(power / (hashrate / 1000), 2) if hashrate else None
+    }
+
+
+class AutoTuner():
+    """
+    Tune the frequency and coreVoltage of a single device for efficiency.
+
+    Two search strategies are supported:
+        grid: try every frequency x coreVoltage pair (lowest first).
+        hill: start at the lowest pair and keep moving to the best neighbouring
+            pair in the grid until no neighbour improves J/TH.
+
+    A trial that runs hotter than `max_temp` is recorded but never chosen, and
+    in grid mode higher voltages at that frequency are skipped. When tuning
+    ends, the best setting found is applied to the device (or the original
+    config is restored if no trial qualified).
+
+    Args:
+        ip: The IP of the device.
+        frequencies: The frequencies to search.
+        voltages: The coreVoltages to search.
+        strategy: `grid` or `hill` (default="grid").
+        settle: Seconds to wait after applying a trial (default=120).
+        samples: The number of samples to average per trial (default=3).
+        sample_interval: Seconds between samples (default=10).
+        max_temp: The max ASIC temp allowed (default=65).
+        min_hashrate: The min hashrate (GH/s) allowed (default=0).
+        fanspeed: The fan speed used while tuning, else the active fan speed
+            (default=None).
+        on_trial: Optional callback for each trial (default=None).
+
+    Methods:
+        trial: Apply and measure a single frequency/coreVoltage pair.
+        run: Run the search and return the best profile.
+    """
+    def __init__(self, ip: str, frequencies: list[int], voltages: list[int],
+                 strategy: str = "grid", settle: float = 120,
+                 samples: int = 3, sample_interval: float = 10,
+                 max_temp: float = 65, min_hashrate: float = 0,
+                 fanspeed: int | None = None,
+                 on_trial: Callable[[TRIAL], None] | None = None):
+        if strategy not in ("grid", "hill"):
+            raise ValueError(f"Unknown strategy: {strategy}")
+        if samples < 1:
+            raise ValueError("`samples` must be at least 1")
+        self._ip = ip
+        self._frequencies = sorted(frequencies)
+        self._voltages = sorted(voltages)
+        self._strategy = strategy
+        self._settle = settle
+        self._samples = samples
+        self._sample_interval = sample_interval
+        self._max_temp = max_temp
+        self._min_hashrate = min_hashrate
+        self._fanspeed = fanspeed
+        self._on_trial = on_trial
+        self._trials: dict[tuple[int, int], TRIAL] = {}
+        self._active: dict = {}  # raw `info` of the device before tuning
+
+    def __repr__(self):
+        return ' '.join((
+            f"AutoTuner({self._ip},",
+            f"{len(self._frequencies)}x{len(self._voltages)},",
+            f"{self._strategy})"
+        ))
+
+    @property
+    def trials(self) -> list[TRIAL]:
+        """Return every trial run so far."""
+        return [*self._trials.values()]
+
+    def _eligible(self, trial: TRIAL) -> bool:
+        """Return True if a trial may be chosen as the best."""
+        return (trial["efficiency"] is not None
+                and trial["temp"] <= self._max_temp
+                and trial["hashrate"] >= self._min_hashrate)
+
+    def trial(self, frequency: int, voltage: int) -> TRIAL:
+        """Apply a frequency/coreVoltage pair and measure the device.
+
+        Results are cached, so repeat pairs aren't re-run.
+        """
+        if (key := (frequency, voltage)) in self._trials:
+            return self._trials[key]
+
+        profile = self._profile(f"tune-{frequency}-{voltage}", frequency,
+                                voltage)
+        result: TRIAL = {"ip": self._ip, "frequency": frequency,
+                         "coreVoltage": voltage}
+        try:
+            profile.run_profile(self._ip)
+            sleep(self._settle)
+            result.update(measure(self._ip, self._samples,
+                                  self._sample_interval))
+            result["error"] = None
+        except Exception as e:
+            result.update({"hashrate": 0, "power": 0, "temp": 0,
+                           "efficiency": None, "error": str(e)})
+        self._trials[key] = result
+        if self._on_trial:
+            self._on_trial(result)
+        return result
+
+    def _grid(self) -> None:
+        """Try every pair, skipping hotter voltages once a pair overheats."""
+        for frequency in self._frequencies:
+            for voltage in self._voltages:
+                if self.trial(frequency, voltage)["temp"] > self._max_temp:
+                    break
+
+    def _hill(self) -> None:
+        """Hill-climb over the grid toward the lowest eligible J/TH."""
+        def score(i: int, j: int) -> float:
+            trial = self.trial(self._frequencies[i], self._voltages[j])
+            if not self._eligible(trial):
+                return float("inf")
+            return trial["efficiency"]
+
+        i = j = 0
+        best = score(i, j)
+        while True:
+            neighbours = [(i + di, j + dj) for di, dj in
+                          ((1, 0), (0, 1), (1, 1), (-1, 0), (0, -1))
+                          if 0 <= i + di < len(self._frequencies)
+                          and 0 <= j + dj < len(self._voltages)]
+            scores = {pos: score(*pos) for pos in neighbours}
+            if not scores or min(scores.values()) >= best:
+                return
+            (i, j), best = min(scores.items(), key=lambda item: item[1])
+
+    def _profile(self, name: str, frequency: int, voltage: int) -> Profile:
+        """Return a `Profile` of a frequency/coreVoltage pair for the device.
+
+        The tuning fan speed is used, else the active one (see
+        `profiles.active_settings()`).
+        """
+        return Profile(name, self._active.get("hostname") or self._ip,
+                       frequency, voltage, self._fanspeed
+                       or active_settings(self._active)["fanspeed"])
+
+    def _restore(self) -> None:
+        """Restore the raw settings the device had before tuning.
+
+        NOTE: these are sent as-is rather than through a `Profile`, so
+        settings a `Profile` can't hold (e.g. auto fan) are restored too.
+        """
+        cache = get_cache()
+        cache.invalidate(self._ip)
+        current = cache.get(self._ip, max_age=0)
+        push_data = {key: self._active[key] for key in RESTORE_KEYS
+                     if key in self._active
+                     and current.get(key) != self._active[key]}
+        try:
+            if push_data:
+                request(ip=self._ip, endpoint="system", body=push_data)
+            if push_data.keys() & RESTART_SETTINGS:
+                request(ip=self._ip, endpoint="restart")
+        finally:
+            if push_data:
+                cache.invalidate(self._ip)
+
+    def _finish(self) -> Profile | None:
+        """Apply the best setting found (else restore the original settings).
+
+        Returns:
+            A `Profile` for the best setting, else `None`.
+        """
+        eligible = [trial for trial in self._trials.values()
+                    if self._eligible(trial)]
+        best = min(eligible, key=lambda trial: trial["efficiency"],
+                   default=None)
+        if not best:
+            self._restore()
+            return None
+        profile = self._profile(
+            f"{self._active.get('hostname') or self._ip}-autotune",
+            best["frequency"], best["coreVoltage"])
+        profile.run_profile(self._ip)
+        return profile
+
+    def run(self) -> Profile | None:
+        """Run the search and apply the best setting found.
+
+        If the search fails, the best setting so far (else the original
+        settings) are still applied before the error is re-raised.
+
+        Returns:
+            A `Profile` (named `{hostname}-autotune`) for the best setting,
+            else `None` if no trial qualified.
+        """
+        self._active = dict(get_cache().get(self._ip, max_age=0))
+        try:
+            self._grid() if self._strategy == "grid" else self._hill()
+        except BaseException as e:
+            # NOTE: a failed restore mustn't hide why the search failed
+            try:
+                self._finish()
+            except Exception as restore_error:
+                e.add_note(f"Restoring {self._ip} also failed: "
+                           + f"{restore_error}")
+            raise
+        return self._finish()
+
+
+def tune_fleet(ips: list[str], max_workers: int = 16,
+               **kwargs) -> dict[str, tuple[Profile | None, list[TRIAL]]]:
+    """Tune many devices in parallel.
+
+    Args:
+        ips: The IP addrs of the devices to tune.
+        max_workers: The max number of devices tuned at once (default=16).
+        **kwargs: Passed to each `AutoTuner`.
+
+    Returns:
+        A dict of IP -> (best profile else `None`, trials).
+    """
+    def _tune(ip: str) -> tuple[Profile | None, list[TRIAL]]:
+        tuner = AutoTuner(ip, **kwargs)
+        try:
+            return tuner.run(), tuner.trials
+        except Exception as e:
+            error = '; '.join([str(e), *getattr(e, "__notes__", ())])
+            return None, [*tuner.trials, {"ip": ip, "error": error}]
+
+    if not ips:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ips))) as pool:
+        return dict(zip(ips, pool.map(_tune, ips)))